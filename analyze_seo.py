@@ -1,57 +1,122 @@
-import csv
+import argparse
+import hashlib
+import heapq
 import json
-from collections import defaultdict, Counter
-from urllib.parse import urlparse
-import re
-
-# Read the CSV file
-csv_file = r"C:\Users\conno\Documents\AAA- AstroWebsites\Dirtworks\internal_all_dworks.csv"
-
-# Data structures
-pages = []
-html_pages = []
-redirects = []
-images = []
-css_js = []
-
-# Read and parse CSV
-with open(csv_file, 'r', encoding='utf-8') as f:
-    reader = csv.DictReader(f)
-    for row in reader:
-        pages.append(row)
-        content_type = row.get('Content Type', '')
-        status_code = row.get('Status Code', '')
-        
-        # Filter HTML pages (excluding images, CSS, JS)
-        if 'text/html' in content_type:
-            html_pages.append(row)
-        elif status_code == '301' or status_code == '302':
-            redirects.append(row)
-        elif 'image' in content_type:
-            images.append(row)
-        elif 'css' in content_type or 'javascript' in content_type:
-            css_js.append(row)
-
-print(f"Total URLs: {len(pages)}")
-print(f"HTML Pages: {len(html_pages)}")
-print(f"Redirects: {len(redirects)}")
-print(f"Images: {len(images)}")
-print(f"CSS/JS: {len(css_js)}")
-
-# Analysis functions
-def analyze_thin_content():
-    thin_pages = []
-    for page in html_pages:
+import os
+import sys
+from array import array
+from collections import Counter
+from urllib.parse import unquote, urlparse
+
+import audit_profile
+import crawl_cache
+import keyword_index
+import lazy_csv
+import near_duplicates
+import redirect_resolver
+import report_writer
+import sitemap_check
+
+
+REDIRECT_CODES = ('301', '302', '307', '308')
+TEMPORARY_CODES = ('302', '307')
+
+
+# Row classification
+def classify(row):
+    """Return the bucket a crawl row belongs to: html, redirect, image or css_js."""
+    content_type = row.get('Content Type', '')
+    status_code = str(row.get('Status Code', ''))
+
+    # Redirects first: Screaming Frog reports them as text/html too
+    if status_code in REDIRECT_CODES:
+        return 'redirect'
+    # Filter HTML pages (excluding images, CSS, JS)
+    elif 'text/html' in content_type:
+        return 'html'
+    elif 'image' in content_type:
+        return 'image'
+    elif 'css' in content_type or 'javascript' in content_type:
+        return 'css_js'
+    return None
+
+
+def _digest(value):
+    # 16 bytes per distinct value instead of the full string
+    return hashlib.blake2b(value.encode('utf-8'), digest_size=16).digest()
+
+
+# Checks
+#
+# Each check is an accumulator: the engine calls feed() once per row of the
+# kinds it declares, then result() once the crawl is exhausted.  Checks keep
+# only the fields they report on, never whole rows, so memory is bounded by
+# the size of the report rather than the size of the export.
+#
+# ``columns`` names the row fields a check reads, so the engine can decode
+# just those (None means it needs the whole row).
+#
+# Cacheable checks split feed() into evaluate(row), a pure per-row step whose
+# JSON-serialisable output can be saved, and add(value), which accumulates
+# it.  Incremental runs replay saved values for URLs that did not change.
+#
+# ``streamed`` maps the attributes holding per-row findings to the field of
+# the result they end up in (None for the result itself).  When the report
+# is streamed (see report_writer), those lists are swapped for ones that
+# write each finding out as it is appended.
+
+class Check:
+    key = None
+    kinds = ('html',)  # None means every row
+    options = ()  # keyword arguments make_checks() may pass to __init__
+    columns = None
+    cacheable = False
+    streamed = {}
+
+    def feed(self, row):
+        self.add(self.evaluate(row))
+
+    def evaluate(self, row):
+        raise NotImplementedError
+
+    def add(self, value):
+        raise NotImplementedError
+
+    def result(self):
+        raise NotImplementedError
+
+    def summary(self, result):
+        return {}
+
+    def issues(self, result):
+        """(url, issue) pairs, used to diff one audit against the previous one."""
+        return ()
+
+
+def _label(issue):
+    # "Low word count: 120" -> "Low word count", so a changed count isn't a new issue
+    return issue.split(':', 1)[0]
+
+
+class ThinContentCheck(Check):
+    key = 'thin_content'
+    columns = ('Address', 'Word Count', 'Text Ratio', 'H1-1', 'H2-1', 'H2-2',
+               'Meta Description 1 Length', 'Title 1 Length')
+    cacheable = True
+    streamed = {'thin_pages': None}
+
+    def __init__(self):
+        self.thin_pages = []
+
+    def evaluate(self, page):
         word_count = int(page.get('Word Count', 0) or 0)
         text_ratio = float(page.get('Text Ratio', 0) or 0)
         h1 = page.get('H1-1', '')
         h2_1 = page.get('H2-1', '')
         h2_2 = page.get('H2-2', '')
-        meta_desc = page.get('Meta Description 1', '')
         meta_desc_len = int(page.get('Meta Description 1 Length', 0) or 0)
-        title = page.get('Title 1', '')
         title_len = int(page.get('Title 1 Length', 0) or 0)
-        
+
         issues = []
         if word_count < 300:
             issues.append(f"Low word count: {word_count}")
@@ -69,9 +134,9 @@ def analyze_thin_content():
             issues.append(f"Short title: {title_len} chars")
         if title_len > 60:
             issues.append(f"Long title: {title_len} chars")
-        
+
         if issues:
-            thin_pages.append({
+            return {
                 'url': page.get('Address', ''),
                 'word_count': word_count,
                 'text_ratio': text_ratio,
@@ -80,68 +145,121 @@ def analyze_thin_content():
                 'meta_desc_len': meta_desc_len,
                 'title_len': title_len,
                 'issues': issues
-            })
-    
-    return thin_pages
-
-def analyze_duplicate_content():
-    # Duplicate titles
-    title_counter = Counter()
-    title_to_urls = defaultdict(list)
-    
-    for page in html_pages:
+            }
+        return None
+
+    def add(self, thin_page):
+        if thin_page:
+            self.thin_pages.append(thin_page)
+
+    def result(self):
+        return self.thin_pages
+
+    def summary(self, result):
+        return {'thin_content_pages': len(result)}
+
+    def issues(self, result):
+        for page in result:
+            for issue in page['issues']:
+                yield page['url'], _label(issue)
+
+
+class _DuplicateIndex:
+    """Groups URLs by value, holding a digest rather than the text for values seen once."""
+
+    def __init__(self):
+        self.first_url = {}
+        self.groups = {}
+
+    def add(self, value, url):
+        if value in self.groups:
+            self.groups[value].append(url)
+            return
+        digest = _digest(value)
+        first = self.first_url.get(digest)
+        if first is None:
+            self.first_url[digest] = url
+        else:
+            self.groups[value] = [first, url]
+
+    def duplicates(self):
+        return self.groups
+
+
+class DuplicateContentCheck(Check):
+    key = 'duplicates'
+    columns = ('Address', 'Title 1', 'Meta Description 1', 'Canonical Link Element 1')
+    streamed = {'canonical_issues': 'canonical_issues'}
+
+    def __init__(self):
+        self.titles = _DuplicateIndex()
+        self.metas = _DuplicateIndex()
+        self.canonical_issues = []
+
+    def feed(self, page):
+        url = page.get('Address', '')
+
         title = page.get('Title 1', '').strip()
         if title:
-            title_counter[title] += 1
-            title_to_urls[title].append(page.get('Address', ''))
-    
-    duplicate_titles = {title: urls for title, count in title_counter.items() 
-                       if count > 1 for urls in [title_to_urls[title]]}
-    
-    # Duplicate meta descriptions
-    meta_counter = Counter()
-    meta_to_urls = defaultdict(list)
-    
-    for page in html_pages:
+            self.titles.add(title, url)
+
         meta = page.get('Meta Description 1', '').strip()
         if meta:
-            meta_counter[meta] += 1
-            meta_to_urls[meta].append(page.get('Address', ''))
-    
-    duplicate_metas = {meta: urls for meta, count in meta_counter.items() 
-                      if count > 1 for urls in [meta_to_urls[meta]]}
-    
-    # Canonical issues
-    canonical_issues = []
-    for page in html_pages:
+            self.metas.add(meta, url)
+
+        # Canonical issues
         canonical = page.get('Canonical Link Element 1', '').strip()
-        url = page.get('Address', '').strip()
+        url = url.strip()
         if canonical and canonical != url:
             # Check if canonical points to a different URL
-            canonical_issues.append({
+            self.canonical_issues.append({
                 'url': url,
                 'canonical': canonical,
                 'status': 'Different canonical'
             })
-    
-    return {
-        'duplicate_titles': duplicate_titles,
-        'duplicate_metas': duplicate_metas,
-        'canonical_issues': canonical_issues
-    }
 
-def analyze_internal_links():
-    link_analysis = []
-    inlink_count = defaultdict(int)
-    
-    for page in html_pages:
+    def result(self):
+        return {
+            'duplicate_titles': self.titles.duplicates(),
+            'duplicate_metas': self.metas.duplicates(),
+            'canonical_issues': self.canonical_issues
+        }
+
+    def summary(self, result):
+        return {
+            'duplicate_titles': len(result['duplicate_titles']),
+            'duplicate_metas': len(result['duplicate_metas'])
+        }
+
+    def issues(self, result):
+        for urls in result['duplicate_titles'].values():
+            for url in urls:
+                yield url, 'Duplicate title'
+        for urls in result['duplicate_metas'].values():
+            for url in urls:
+                yield url, 'Duplicate meta description'
+        for issue in result['canonical_issues']:
+            yield issue['url'], issue['status']
+
+
+class InternalLinksCheck(Check):
+    key = 'links'
+    columns = ('Address', 'Outlinks', 'Unique Outlinks', 'Inlinks', 'Unique Inlinks', 'Crawl Depth')
+    cacheable = True
+    streamed = {'link_analysis': 'link_issues'}
+
+    def __init__(self):
+        self.link_analysis = []
+        self.orphan_flags = {}
+
+    def evaluate(self, page):
         outlinks = int(page.get('Outlinks', 0) or 0)
         unique_outlinks = int(page.get('Unique Outlinks', 0) or 0)
         inlinks = int(page.get('Inlinks', 0) or 0)
         unique_inlinks = int(page.get('Unique Inlinks', 0) or 0)
         crawl_depth = int(page.get('Crawl Depth', 0) or 0)
         url = page.get('Address', '')
-        
+
         issues = []
         if outlinks > 100:
             issues.append(f"Excessive outlinks: {outlinks}")
@@ -151,9 +269,10 @@ def analyze_internal_links():
             issues.append(f"Very few inlinks: {inlinks}")
         if crawl_depth > 3:
             issues.append(f"Deep crawl depth: {crawl_depth}")
-        
+
+        link_issue = None
         if issues:
-            link_analysis.append({
+            link_issue = {
                 'url': url,
                 'outlinks': outlinks,
                 'unique_outlinks': unique_outlinks,
@@ -161,180 +280,1024 @@ def analyze_internal_links():
                 'unique_inlinks': unique_inlinks,
                 'crawl_depth': crawl_depth,
                 'issues': issues
-            })
-        
-        # Count inlinks for orphan detection
-        inlink_count[url] = inlinks
-    
-    orphaned = [url for url, count in inlink_count.items() if count == 0]
-    
-    return {
-        'link_issues': link_analysis,
-        'orphaned_pages': orphaned
-    }
+            }
+        return [url, inlinks == 0, link_issue]
+
+    def add(self, value):
+        url, orphaned, link_issue = value
+        if link_issue:
+            self.link_analysis.append(link_issue)
+        # Flag for orphan detection
+        self.orphan_flags[url] = orphaned
+
+    def result(self):
+        return {
+            'link_issues': self.link_analysis,
+            'orphaned_pages': [url for url, orphaned in self.orphan_flags.items() if orphaned]
+        }
 
-def analyze_redirects():
-    redirect_chains = []
-    redirect_loops = []
-    temp_redirects = []
-    slow_redirects = []
-    
-    redirect_map = {}
-    for redirect in redirects:
+    def summary(self, result):
+        return {
+            'link_issues': len(result['link_issues']),
+            'orphaned_pages': len(result['orphaned_pages'])
+        }
+
+    def issues(self, result):
+        for page in result['link_issues']:
+            for issue in page['issues']:
+                yield page['url'], _label(issue)
+
+
+class RedirectCheck(Check):
+    key = 'redirects'
+    kinds = ('redirect',)
+    columns = ('Address', 'Redirect URL', 'Redirect Type', 'Status Code', 'Response Time')
+
+    def __init__(self):
+        self.redirect_map = {}
+        self.temporary = set()
+        self.temp_redirects = []
+        self.slow_redirects = []
+
+    def feed(self, redirect):
         url = redirect.get('Address', '')
         redirect_url = redirect.get('Redirect URL', '')
         redirect_type = redirect.get('Redirect Type', '')
-        status_code = redirect.get('Status Code', '')
+        status_code = str(redirect.get('Status Code', ''))
         response_time = float(redirect.get('Response Time', 0) or 0)
-        
-        redirect_map[url] = redirect_url
-        
+
+        self.redirect_map[url] = redirect_url
+
+        if status_code in TEMPORARY_CODES:
+            self.temporary.add(url)
         if status_code == '302':
-            temp_redirects.append({
+            self.temp_redirects.append({
                 'url': url,
                 'redirect_to': redirect_url,
                 'type': redirect_type
             })
-        
+
         if response_time > 1.0:
-            slow_redirects.append({
+            self.slow_redirects.append({
                 'url': url,
                 'redirect_to': redirect_url,
                 'response_time': response_time
             })
-    
-    # Check for chains (simplified - would need full crawl to detect all chains)
-    for url, redirect_url in redirect_map.items():
-        chain = [url]
-        current = redirect_url
-        hops = 1
-        while current in redirect_map and hops < 10:
-            chain.append(current)
-            current = redirect_map[current]
-            hops += 1
-            if current in chain:  # Loop detected
-                redirect_loops.append({
-                    'url': url,
-                    'chain': chain + [current]
-                })
-                break
-        
-        if hops > 3:
-            redirect_chains.append({
+
+    def result(self):
+        resolved = redirect_resolver.resolve(self.redirect_map)
+
+        redirect_chains = [
+            {
                 'url': url,
-                'hops': hops,
-                'chain': chain
-            })
-    
-    return {
-        'redirect_chains': redirect_chains,
-        'redirect_loops': redirect_loops,
-        'temp_redirects': temp_redirects,
-        'slow_redirects': slow_redirects
-    }
+                'hops': resolution.hops,
+                'chain': redirect_resolver.chain(url, resolved),
+                'final': resolution.final
+            }
+            for url, resolution in resolved.items()
+            if resolution.hops > 3 and not resolution.loop
+        ]
+        redirect_loops = [
+            {'url': cycle[0], 'chain': cycle}
+            for cycle in redirect_resolver.cycles(resolved)
+        ]
+
+        # A flattened redirect is only permanent if every hop on the way is
+        temporary = {}
+        for url, resolution in sorted(resolved.items(), key=lambda item: item[1].hops):
+            temporary[url] = url in self.temporary or temporary.get(resolution.next, False)
+        flattened_map = [
+            {
+                'from': url,
+                'to': resolution.final,
+                'hops': resolution.hops,
+                'status': 302 if temporary[url] else 301
+            }
+            for url, resolution in resolved.items()
+            if not resolution.loop and resolution.final and resolution.final != url
+        ]
+
+        return {
+            'redirect_chains': redirect_chains,
+            'redirect_loops': redirect_loops,
+            'temp_redirects': self.temp_redirects,
+            'slow_redirects': self.slow_redirects,
+            'flattened_map': flattened_map
+        }
+
+    def summary(self, result):
+        return {
+            'redirect_chains': len(result['redirect_chains']),
+            'redirect_loops': len(result['redirect_loops']),
+            'temp_redirects': len(result['temp_redirects'])
+        }
+
+    def issues(self, result):
+        for chain in result['redirect_chains']:
+            yield chain['url'], 'Redirect chain'
+        for loop in result['redirect_loops']:
+            for url in loop['chain'][:-1]:
+                yield url, 'Redirect loop'
+        for redirect in result['temp_redirects']:
+            yield redirect['url'], 'Temporary redirect'
+
+
+class NotFoundCheck(Check):
+    key = '404s'
+    kinds = None
+    columns = ('Address', 'Status Code', 'Status')
+    streamed = {'four_oh_fours': None}
+
+    def __init__(self):
+        self.four_oh_fours = []
 
-def analyze_404s():
-    four_oh_fours = []
-    for page in pages:
-        status_code = page.get('Status Code', '')
-        if status_code == '404':
-            four_oh_fours.append({
+    def feed(self, page):
+        if str(page.get('Status Code', '')) == '404':
+            self.four_oh_fours.append({
                 'url': page.get('Address', ''),
                 'status': page.get('Status', '')
             })
-    return four_oh_fours
-
-def analyze_meta_descriptions():
-    missing_meta = []
-    short_meta = []
-    long_meta = []
-    
-    for page in html_pages:
+
+    def result(self):
+        return self.four_oh_fours
+
+    def summary(self, result):
+        return {'404_errors': len(result)}
+
+    def issues(self, result):
+        for page in result:
+            yield page['url'], '404'
+
+
+class MetaDescriptionCheck(Check):
+    key = 'meta_descriptions'
+    columns = ('Address', 'Meta Description 1', 'Meta Description 1 Length')
+    cacheable = True
+    streamed = {'missing_meta': 'missing', 'short_meta': 'short', 'long_meta': 'long'}
+
+    def __init__(self):
+        self.missing_meta = []
+        self.short_meta = []
+        self.long_meta = []
+
+    def evaluate(self, page):
         meta = page.get('Meta Description 1', '').strip()
         meta_len = int(page.get('Meta Description 1 Length', 0) or 0)
         url = page.get('Address', '')
-        
+
         if not meta or meta_len == 0:
-            missing_meta.append(url)
+            return ['missing', url]
         elif meta_len < 120:
-            short_meta.append({
+            return ['short', {
                 'url': url,
                 'length': meta_len,
                 'meta': meta[:100] + '...' if len(meta) > 100 else meta
-            })
+            }]
         elif meta_len > 160:
-            long_meta.append({
+            return ['long', {
                 'url': url,
                 'length': meta_len,
                 'meta': meta[:100] + '...' if len(meta) > 100 else meta
-            })
-    
-    return {
-        'missing': missing_meta,
-        'short': short_meta,
-        'long': long_meta
+            }]
+        return None
+
+    def add(self, value):
+        if value:
+            bucket, item = value
+            {'missing': self.missing_meta, 'short': self.short_meta, 'long': self.long_meta}[bucket].append(item)
+
+    def result(self):
+        return {
+            'missing': self.missing_meta,
+            'short': self.short_meta,
+            'long': self.long_meta
+        }
+
+    def summary(self, result):
+        return {
+            'missing_meta': len(result['missing']),
+            'short_meta': len(result['short']),
+            'long_meta': len(result['long'])
+        }
+
+    def issues(self, result):
+        for url in result['missing']:
+            yield url, 'Missing meta description'
+        for item in result['short']:
+            yield item['url'], 'Short meta description'
+        for item in result['long']:
+            yield item['url'], 'Long meta description'
+
+
+class NearDuplicateCheck(Check):
+    """Clusters pages whose on-page text is similar but not identical (MinHash + LSH)."""
+    key = 'near_duplicates'
+    options = ('near_duplicate_threshold', 'near_duplicate_max_bucket')
+
+    # Page text isn't in the export, so compare the fields that are
+    TEXT_FIELDS = ('Title 1', 'Meta Description 1', 'H1-1', 'H2-1', 'H2-2')
+    columns = ('Address',) + TEXT_FIELDS
+
+    cacheable = True
+
+    def __init__(self, near_duplicate_threshold=0.8, near_duplicate_max_bucket=200):
+        self.index = near_duplicates.NearDuplicateIndex(threshold=near_duplicate_threshold,
+                                                        max_bucket=near_duplicate_max_bucket)
+
+    def evaluate(self, page):
+        text = ' '.join(str(page.get(field, '')) for field in self.TEXT_FIELDS)
+        signature = self.index.signature(text)
+        return [page.get('Address', ''), signature.tobytes().hex() if signature is not None else None]
+
+    def add(self, value):
+        url, signature = value
+        if signature is not None:
+            self.index.add_signature(url, array('Q', bytes.fromhex(signature)))
+
+    def result(self):
+        return {
+            'threshold': self.index.threshold,
+            'clusters': self.index.clusters(),
+            'oversized_buckets': self.index.oversized_buckets()
+        }
+
+    def summary(self, result):
+        return {'near_duplicate_clusters': len(result['clusters']),
+                'near_duplicate_oversized_buckets': len(result['oversized_buckets'])}
+
+    def issues(self, result):
+        for cluster in result['clusters']:
+            for url in cluster['urls']:
+                yield url, 'Near-duplicate content'
+
+
+class KeywordCannibalizationCheck(Check):
+    """Pages competing for the same terms in their titles, headings and meta keywords."""
+    key = 'cannibalization'
+    options = ('cannibalization_threshold',)
+    columns = ('Address', keyword_index.KEYWORD_FIELD) + tuple(keyword_index.FIELD_WEIGHTS)
+    cacheable = True
+    CONTESTED = 100
+
+    def __init__(self, cannibalization_threshold=0.5):
+        self.index = keyword_index.KeywordIndex(threshold=cannibalization_threshold)
+
+    def evaluate(self, page):
+        return [page.get('Address', ''), keyword_index.page_terms(page)]
+
+    def add(self, value):
+        url, terms = value
+        if terms:
+            self.index.add(url, terms)
+
+    def result(self):
+        contested = self.index.contested_terms()
+        return {
+            'threshold': self.index.threshold,
+            'clusters': self.index.clusters(),
+            'contested_terms': contested[:self.CONTESTED],
+            'contested_term_count': len(contested),
+            'sitewide_terms': [{'term': term, 'pages': pages} for term, pages in self.index.sitewide_terms()]
+        }
+
+    def summary(self, result):
+        return {
+            'cannibalization_clusters': len(result['clusters']),
+            'contested_terms': result['contested_term_count']
+        }
+
+    def issues(self, result):
+        for cluster in result['clusters']:
+            for url in cluster['urls']:
+                yield url, 'Keyword cannibalization'
+
+
+class SitemapCheck(Check):
+    """Diffs crawled, indexable and canonical URLs against the sitemap and robots.txt (see sitemap_check)."""
+    key = 'sitemap'
+    kinds = None
+    options = ('sitemap', 'robots')
+    columns = tuple(sitemap_check.CROSS_CHECK_COLUMNS)
+    FINDINGS = {
+        'sitemap_not_crawled': 'In sitemap, not crawled',
+        'crawled_not_in_sitemap': 'Missing from sitemap',
+        'canonicalised_in_sitemap': 'Canonicalised URL in sitemap',
+        'redirecting_canonical_targets': 'Canonical target redirects',
     }
 
-# Run all analyses
-print("\n=== Running SEO Analysis ===\n")
-
-thin_content = analyze_thin_content()
-duplicates = analyze_duplicate_content()
-links = analyze_internal_links()
-redirect_analysis = analyze_redirects()
-four_oh_fours = analyze_404s()
-meta_analysis = analyze_meta_descriptions()
-
-# Generate report
-report = {
-    'executive_summary': {
-        'total_pages': len(html_pages),
-        'thin_content_pages': len(thin_content),
-        'duplicate_titles': len(duplicates['duplicate_titles']),
-        'duplicate_metas': len(duplicates['duplicate_metas']),
-        'link_issues': len(links['link_issues']),
-        'orphaned_pages': len(links['orphaned_pages']),
-        'redirect_chains': len(redirect_analysis['redirect_chains']),
-        'redirect_loops': len(redirect_analysis['redirect_loops']),
-        'temp_redirects': len(redirect_analysis['temp_redirects']),
-        '404_errors': len(four_oh_fours),
-        'missing_meta': len(meta_analysis['missing']),
-        'short_meta': len(meta_analysis['short']),
-        'long_meta': len(meta_analysis['long'])
-    },
-    'thin_content': thin_content,
-    'duplicates': duplicates,
-    'links': links,
-    'redirects': redirect_analysis,
-    '404s': four_oh_fours,
-    'meta_descriptions': meta_analysis
+    def __init__(self, sitemap=sitemap_check.DEFAULT_SITEMAP, robots=sitemap_check.DEFAULT_ROBOTS):
+        self.sitemap = sitemap if sitemap and os.path.isfile(sitemap) else None
+        self.robots = sitemap_check.Robots.load(robots, 'Googlebot') if robots and os.path.isfile(robots) else None
+        self.index = sitemap_check.URLIndex()
+
+    def feed(self, row):
+        self.index.add_crawl_row(row)
+
+    def result(self):
+        return sitemap_check.diff(self.index, self.sitemap, self.robots)
+
+    def summary(self, result):
+        return {key: len(result[key]) for key in self.FINDINGS}
+
+    def issues(self, result):
+        for key, issue in self.FINDINGS.items():
+            for url in result[key]:
+                yield url, issue
+
+
+# Transfer budgets in bytes ('page_bytes' is an HTML page's Total
+# Transferred), and how many non-WebP raster images may still be served
+PAGE_WEIGHT_BUDGETS = {
+    'image_bytes': 200_000,
+    'css_bytes': 100_000,
+    'js_bytes': 150_000,
+    'page_bytes': 1_600_000,
+    'non_webp_images': 0,
 }
+# What scripts/convert-to-webp.js converts; SVG, WebP, AVIF and icons are left alone
+RASTER_TYPES = ('image/jpeg', 'image/png', 'image/gif', 'image/bmp', 'image/tiff')
+
+
+def load_budgets(path):
+    """PAGE_WEIGHT_BUDGETS overridden by the JSON object in ``path``."""
+    with open(path, 'r', encoding='utf-8') as f:
+        overrides = json.load(f)
+    unknown = set(overrides) - set(PAGE_WEIGHT_BUDGETS)
+    if unknown:
+        raise ValueError(f"Unknown budgets: {', '.join(sorted(unknown))} "
+                         f"(expected {', '.join(PAGE_WEIGHT_BUDGETS)})")
+    return dict(PAGE_WEIGHT_BUDGETS, **overrides)
+
+
+def webp_counterpart(url, public_dir='public'):
+    """(source, webp) files under ``public_dir`` for an image URL, each None if missing.
+
+    scripts/convert-to-webp.js writes <name>.webp next to the original in
+    public-optimized/; a counterpart already in public/ means the page
+    still references the old file.
+    """
+    path = unquote(urlparse(url).path).lstrip('/')
+    source = os.path.join(public_dir, path)
+    stem = os.path.splitext(path)[0] + '.webp'
+    optimized = os.path.join(os.path.dirname(os.path.normpath(public_dir)) or '.', 'public-optimized')
+    webp = next((candidate for candidate in (os.path.join(public_dir, stem), os.path.join(optimized, stem))
+                 if os.path.isfile(candidate)), None)
+    return (source if os.path.isfile(source) else None), webp
+
+
+class PageWeightCheck(Check):
+    """Transfer-size budgets for images, CSS, JS and whole pages, and images still served as non-WebP."""
+    key = 'page_weight'
+    kinds = ('html', 'image', 'css_js')
+    options = ('budgets', 'public_dir')
+    columns = ('Address', 'Content Type', 'Status Code', 'Size (bytes)', 'Transferred (bytes)',
+               'Total Transferred (bytes)', 'CO2 (mg)', 'Response Time')
+    streamed = {'oversized': 'oversized', 'non_webp': 'non_webp'}
+    HEAVIEST = 20
+
+    def __init__(self, budgets=None, public_dir=None):
+        self.budgets = dict(PAGE_WEIGHT_BUDGETS, **(budgets or {}))
+        # The site's built files; without them no image is looked up on disk
+        self.public_dir = public_dir
+        self.totals = {}
+        self.heaviest = []  # min-heap of (transferred, n, page)
+        self.oversized = []
+        self.non_webp = []
+        self.over = Counter()
+
+    def feed(self, row):
+        url = row.get('Address', '')
+        content_type = row.get('Content Type', '')
+        size = int(row.get('Size (bytes)', 0) or 0)
+        # Screaming Frog leaves Transferred empty for some resources; fall back to the size
+        transferred = int(row.get('Transferred (bytes)', 0) or 0) or size
+        co2 = float(row.get('CO2 (mg)', 0) or 0)
+        if 'text/html' in content_type:
+            asset = 'page'
+            transferred = int(row.get('Total Transferred (bytes)', 0) or 0) or transferred
+        elif 'image' in content_type:
+            asset = 'image'
+        elif 'css' in content_type:
+            asset = 'css'
+        else:
+            asset = 'js'
+
+        totals = self.totals.get(asset)
+        if totals is None:
+            totals = self.totals[asset] = {'count': 0, 'size_bytes': 0, 'transferred_bytes': 0, 'co2_mg': 0.0}
+        totals['count'] += 1
+        totals['size_bytes'] += size
+        totals['transferred_bytes'] += transferred
+        totals['co2_mg'] += co2
+
+        budget = self.budgets.get(f"{asset}_bytes")
+        if budget is not None and transferred > budget:
+            self.over[f"{asset}_bytes"] += 1
+            self.oversized.append({
+                'url': url,
+                'type': asset,
+                'size': size,
+                'transferred': transferred,
+                'budget': budget,
+                'over_by': transferred - budget
+            })
+
+        if asset == 'page' and str(row.get('Status Code', '')) == '200':
+            page = {
+                'url': url,
+                'total_transferred': transferred,
+                'size': size,
+                'co2_mg': co2,
+                'response_time': float(row.get('Response Time', 0) or 0)
+            }
+            entry = (transferred, totals['count'], page)
+            if len(self.heaviest) < self.HEAVIEST:
+                heapq.heappush(self.heaviest, entry)
+            elif entry > self.heaviest[0]:
+                heapq.heapreplace(self.heaviest, entry)
+
+        if asset == 'image' and content_type.split(';', 1)[0].strip() in RASTER_TYPES:
+            source, webp = webp_counterpart(url, self.public_dir) if self.public_dir else (None, None)
+            self.non_webp.append({
+                'url': url,
+                'content_type': content_type,
+                'transferred': transferred,
+                'source': source,
+                'webp': webp,
+                # A WebP already exists: only the references need updating
+                'action': 'reference the .webp' if webp else (
+                    'run scripts/convert-to-webp.js' if self.public_dir else 'serve as WebP')
+            })
+
+    def result(self):
+        violations = {name: self.over[name] for name in ('image_bytes', 'css_bytes', 'js_bytes', 'page_bytes')}
+        allowed = self.budgets.get('non_webp_images')
+        violations['non_webp_images'] = (
+            len(self.non_webp) if allowed is not None and len(self.non_webp) > allowed else 0)
+        for totals in self.totals.values():
+            totals['co2_mg'] = round(totals['co2_mg'], 3)
+        return {
+            'budgets': self.budgets,
+            'violations': violations,
+            'totals': self.totals,
+            'heaviest_pages': [page for _, _, page in sorted(self.heaviest, key=lambda entry: entry[:2], reverse=True)],
+            'oversized': self.oversized,
+            'non_webp': self.non_webp
+        }
+
+    def summary(self, result):
+        return {
+            'over_budget': len(result['oversized']),
+            'non_webp_images': len(result['non_webp']),
+            'budget_violations': sum(result['violations'].values())
+        }
+
+    def issues(self, result):
+        for item in result['oversized']:
+            yield item['url'], f"Over {item['type']} budget"
+        for item in result['non_webp']:
+            yield item['url'], 'Not WebP'
+
+
+DEFAULT_CHECKS = (
+    ThinContentCheck,
+    DuplicateContentCheck,
+    InternalLinksCheck,
+    RedirectCheck,
+    NotFoundCheck,
+    MetaDescriptionCheck,
+    SitemapCheck,
+    PageWeightCheck,
+)
+# Too slow for every run on large crawls; select with --checks
+OPTIONAL_CHECKS = (
+    NearDuplicateCheck,
+    KeywordCannibalizationCheck,
+)
+
+
+# Engine
+# classify() and the engine read these on every row
+ROW_COLUMNS = ('Address', 'Content Type', 'Status Code')
+
+
+def required_columns(checks):
+    """Every column ``checks`` read, in order, or None if any check needs whole rows."""
+    columns = dict.fromkeys(ROW_COLUMNS)
+    for check in checks:
+        if check.columns is None:
+            return None
+        columns.update(dict.fromkeys(check.columns))
+    return list(columns)
+
+
+def read_rows(path, cache_dir=None, columns=None):
+    """Stream rows from a Screaming Frog export without materialising the file.
+
+    Rows are decoded lazily from a memory map of the export (see lazy_csv),
+    keeping only ``columns`` when given.  With ``cache_dir`` the rows come
+    from the typed columnar cache instead (built on first use), so numeric
+    columns arrive already converted.
+    """
+    if cache_dir is not None:
+        yield from crawl_cache.load(path, cache_dir).rows(columns)
+        return
+    with lazy_csv.LazyCSV(path) as crawl:
+        yield from crawl.records(columns)
+
+
+def audit_rows(rows, checks, state=None):
+    """Feed every row to the checks interested in its kind in a single pass.
+
+    With an IncrementalState, cacheable checks reuse the previous run's
+    per-row values for URLs whose fingerprint is unchanged.
+    Returns a Counter of rows per kind ('total' counts every row).
+    """
+    routes = {}
+    every_row = [check for check in checks if check.kinds is None]
+    counts = Counter()
+
+    for row in rows:
+        kind = classify(row)
+        counts['total'] += 1
+        counts[kind] += 1
+        targets = routes.get(kind)
+        if targets is None:
+            targets = routes[kind] = every_row + [
+                check for check in checks
+                if check.kinds is not None and kind in check.kinds
+            ]
+        if state is None:
+            for check in targets:
+                check.feed(row)
+            continue
+
+        url = row.get('Address', '')
+        fingerprint = row_fingerprint(row)
+        cached = state.lookup(url, fingerprint) or {}
+        # An unchanged row keeps the values of checks this run skipped
+        values = dict(cached)
+        for check in targets:
+            if not check.cacheable:
+                check.feed(row)
+                continue
+            value = cached[check.key] if check.key in cached else check.evaluate(row)
+            check.add(value)
+            values[check.key] = value
+        state.record(url, fingerprint, values)
+
+    return counts
+
+
+# Incremental audits
+#
+# A state file remembers, per URL, a fingerprint of the row and the values
+# cacheable checks produced for it, plus every issue the audit raised.
+# The next audit replays those values for rows whose fingerprint still
+# matches and diffs the issues to show what regressed and what got fixed.
+
+STATE_VERSION = 2
+# Change on every crawl without the page changing
+VOLATILE_COLUMNS = frozenset(['Crawl Timestamp', 'Response Time'])
+_NUMBER_START = frozenset('0123456789+-.')
+
+
+def _fingerprint_text(value):
+    """``value`` as the same text whether the row came from the CSV or the typed cache."""
+    if isinstance(value, str):
+        if not value or value[0] not in _NUMBER_START:
+            return value
+        try:
+            value = float(value)
+        except ValueError:
+            return value
+    # The cache reads empty numeric cells back as '' and NaN stands for one
+    return '' if value != value else repr(float(value))
+
+
+def row_fingerprint(row):
+    """Digest of every non-volatile column ('Hash', 'Last Modified', counts, ...)."""
+    digest = hashlib.blake2b(digest_size=16)
+    for name, value in row.items():
+        if name not in VOLATILE_COLUMNS:
+            digest.update(f"{name}\x1f{_fingerprint_text(value)}\x1e".encode('utf-8'))
+    return digest.hexdigest()
+
+
+class IncrementalState:
+    def __init__(self, previous=None):
+        previous = previous or {}
+        self.baseline = not previous
+        self.previous_rows = previous.get('rows', {})
+        self.previous_issues = previous.get('issues', [])
+        self.rows = {}
+        self.stats = Counter()
+
+    @classmethod
+    def load(cls, path):
+        """State saved by a previous run, or an empty one if there is none yet."""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                previous = json.load(f)
+        except FileNotFoundError:
+            return cls()
+        if previous.get('version') != STATE_VERSION:
+            return cls()
+        return cls(previous)
+
+    def lookup(self, url, fingerprint):
+        entry = self.previous_rows.get(url)
+        if entry is None:
+            self.stats['added'] += 1
+            return None
+        if entry['fingerprint'] != fingerprint:
+            self.stats['changed'] += 1
+            return None
+        self.stats['unchanged'] += 1
+        return entry['values']
+
+    def record(self, url, fingerprint, values):
+        self.rows[url] = {'fingerprint': fingerprint, 'values': values}
+
+    def _previous_issues(self, checks, ran):
+        """The previous run's issues from the ``checks`` keys if ``ran``, else from every other check."""
+        checks = set(checks)
+        return [issue for issue in self.previous_issues if (issue[0] in checks) == ran]
+
+    def regression(self, issues, checks):
+        """Report section comparing this run's issues with the previous run's.
+
+        Only issues of ``checks`` (the keys of the checks that ran) are
+        compared, so a run with fewer checks resolves nothing it skipped.
+        """
+        removed = sum(1 for url in self.previous_rows if url not in self.rows)
+        section = {
+            'baseline': self.baseline,
+            'urls': {
+                'added': self.stats['added'],
+                'changed': self.stats['changed'],
+                'unchanged': self.stats['unchanged'],
+                'removed': removed
+            },
+            'new_issues': [],
+            'resolved_issues': []
+        }
+        if self.baseline:
+            return section
+        previous_issues = self._previous_issues(checks, True)
+        current = {tuple(issue) for issue in issues}
+        previous = {tuple(issue) for issue in previous_issues}
+        section['new_issues'] = [
+            {'check': check, 'url': url, 'issue': issue}
+            for check, url, issue in issues if (check, url, issue) not in previous
+        ]
+        section['resolved_issues'] = [
+            {'check': check, 'url': url, 'issue': issue}
+            for check, url, issue in previous_issues if (check, url, issue) not in current
+        ]
+        return section
+
+    def save(self, path, issues, checks):
+        """Write the state, keeping the previous issues of checks not in ``checks``."""
+        issues = issues + self._previous_issues(checks, False)
+        tmp = f"{path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'version': STATE_VERSION, 'rows': self.rows, 'issues': issues},
+                      f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+
+class Report:
+    """Result of one audit: row counts per kind plus one section per check."""
+
+    def __init__(self, counts, sections, issues=None, checks=()):
+        self.counts = counts
+        self.sections = sections
+        self.issues = issues or []
+        self.checks = list(checks)  # keys of the checks that ran
+        self.profile = None
+
+    @property
+    def executive_summary(self):
+        return self.sections['executive_summary']
+
+    def to_dict(self):
+        if self.profile is None:
+            return self.sections
+        return dict(self.sections, profile=self.profile.to_dict())
+
+    def write_json(self, path):
+        """Write the report as one JSON document (gzip-compressed if ``path`` ends in .gz)."""
+        with report_writer.open_text(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+
+
+def build_report(counts, checks, state=None):
+    summary = {'total_pages': counts['html']}
+    sections = {}
+    issues = []
+    for check in checks:
+        result = check.result()
+        summary.update(check.summary(result))
+        sections[check.key] = result
+        issues.extend([check.key, url, issue] for url, issue in check.issues(result))
+
+    if state is not None:
+        regression = sections['regression'] = state.regression(issues, [check.key for check in checks])
+        summary['new_issues'] = len(regression['new_issues'])
+        summary['resolved_issues'] = len(regression['resolved_issues'])
+
+    report = {'executive_summary': summary}
+    report.update(sections)
+    return Report(counts, report, issues, [check.key for check in checks])
+
+
+CHECKS = {check_class.key: check_class for check_class in DEFAULT_CHECKS + OPTIONAL_CHECKS}
+
+
+def make_checks(checks=None, options=None):
+    """Instantiate checks from keys, classes or instances (default: DEFAULT_CHECKS).
+
+    ``options`` is a dict of tuning knobs; each check class receives the
+    ones named in its ``options`` attribute.
+    """
+    options = options or {}
+    if checks is None:
+        checks = DEFAULT_CHECKS
+    made = []
+    for check in checks:
+        if isinstance(check, str):
+            if check not in CHECKS:
+                raise ValueError(f"Unknown check: {check!r} (expected one of {', '.join(CHECKS)})")
+            check = CHECKS[check]
+        if isinstance(check, type):
+            check = check(**{name: options[name] for name in check.options if name in options})
+        made.append(check)
+    return made
+
+
+def run_audit(source, checks=None, cache_dir=None, options=None, state=None, profile=None,
+              stream=None):
+    """Audit a crawl export and return a Report.
+
+    ``source`` is a path to a Screaming Frog export or any iterable of row
+    dicts.  ``checks`` selects which checks run, by key, class or instance.
+    ``cache_dir`` reads path sources through crawl_cache, and ``options``
+    tunes individual checks (see make_checks).  Passing an IncrementalState
+    reuses its cached per-URL values and adds a 'regression' section; the
+    caller decides whether to save() it afterwards.  With an
+    audit_profile.AuditProfile, reading, each check and report building are
+    timed and the report gets a 'profile' section.  With a
+    report_writer.NDJSONWriter as ``stream``, per-row findings are written
+    to it as they are found instead of being kept in the report; finish
+    with stream.write_report(report).  Incremental runs need every issue
+    to diff against the previous run, so ``stream`` is ignored with a state.
+    Otherwise nothing is printed or written, so a long-lived process can
+    call this for as many crawls as it likes.
+    """
+    checks = make_checks(checks, options)
+    if stream is not None and state is None:
+        for check in checks:
+            for attribute, field in check.streamed.items():
+                setattr(check, attribute, stream.spill(check.key, field))
+    if isinstance(source, (str, os.PathLike)):
+        # Incremental fingerprints cover the whole row, so only project without state
+        columns = required_columns(checks) if state is None else None
+        rows = read_rows(source, cache_dir, columns)
+    else:
+        rows = source
+    if profile is None:
+        counts = audit_rows(rows, checks, state)
+        return build_report(counts, checks, state)
+
+    checks = [profile.wrap_check(check) for check in checks]
+    with profile.stage('audit_rows'):
+        counts = audit_rows(profile.wrap_rows(rows), checks, state)
+    with profile.stage('build_report'):
+        report = build_report(counts, checks, state)
+    report.profile = profile
+    return report
+
+
+def write_redirect_map(report, path):
+    flattened = report.sections['redirects']['flattened_map']
+    host = urlparse(flattened[0]['from']).netloc if flattened else None
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(redirect_resolver.to_netlify_toml(flattened, host))
+
+
+def print_summary(report):
+    counts = report.counts
+    summary = report.executive_summary
+
+    print(f"Total URLs: {counts['total']}")
+    print(f"HTML Pages: {counts['html']}")
+    print(f"Redirects: {counts['redirect']}")
+    print(f"Images: {counts['image']}")
+    print(f"CSS/JS: {counts['css_js']}")
+
+    print("\n=== EXECUTIVE SUMMARY ===")
+    print(f"Total HTML Pages Analyzed: {summary['total_pages']}")
+    print(f"\nCritical Issues Found:")
+    labels = [
+        ('thin_content_pages', 'Thin Content Pages'),
+        ('duplicate_titles', 'Duplicate Titles'),
+        ('duplicate_metas', 'Duplicate Meta Descriptions'),
+        ('link_issues', 'Link Structure Issues'),
+        ('orphaned_pages', 'Orphaned Pages'),
+        ('redirect_chains', 'Redirect Chains (>3 hops)'),
+        ('redirect_loops', 'Redirect Loops'),
+        ('temp_redirects', 'Temporary Redirects (302)'),
+        ('404_errors', '404 Errors'),
+        ('missing_meta', 'Missing Meta Descriptions'),
+        ('short_meta', 'Short Meta Descriptions (<120)'),
+        ('long_meta', 'Long Meta Descriptions (>160)'),
+        ('near_duplicate_clusters', 'Near-Duplicate Page Clusters'),
+        ('near_duplicate_oversized_buckets', 'Near-Duplicate Buckets Too Large to Score'),
+        ('cannibalization_clusters', 'Keyword Cannibalization Clusters'),
+        ('sitemap_not_crawled', 'Sitemap URLs Not Crawled'),
+        ('crawled_not_in_sitemap', 'Indexable Pages Missing From Sitemap'),
+        ('canonicalised_in_sitemap', 'Canonicalised Pages Listed in Sitemap'),
+        ('redirecting_canonical_targets', 'Canonicals Pointing at Redirects'),
+        ('contested_terms', 'Terms Targeted by Several Pages'),
+        ('over_budget', 'Pages/Assets Over Transfer Budget'),
+        ('non_webp_images', 'Images Not Served as WebP'),
+    ]
+    for key, label in labels:
+        if key in summary:
+            print(f"  - {label}: {summary[key]}")
+    sitemap = report.sections.get('sitemap')
+    if sitemap and sitemap.get('skipped'):
+        print(f"  (sitemap not compared: {sitemap['skipped']})")
+
+    regression = report.sections.get('regression')
+    if regression and not regression['baseline']:
+        urls = regression['urls']
+        print(f"\nSince the previous crawl: {urls['added']} added, {urls['changed']} changed, "
+              f"{urls['unchanged']} unchanged, {urls['removed']} removed URLs")
+        print(f"  - New Issues: {summary['new_issues']}")
+        print(f"  - Resolved Issues: {summary['resolved_issues']}")
+
+
+def print_budget_violations(report, limit=20):
+    section = report.sections['page_weight']
+    budgets = section['budgets']
+    print("\n=== PAGE WEIGHT BUDGET EXCEEDED ===")
+    for name, count in section['violations'].items():
+        if count:
+            print(f"  - {name}: {count} over the budget of {budgets[name]}")
+    # Streamed reports keep only counts; the items are in the report file
+    offenders = [f"{item['type']:<6} {item['transferred']:>10} bytes  {item['url']}"
+                 for item in section['oversized']]
+    if section['violations']['non_webp_images']:
+        offenders.extend(f"{item['content_type'].split(';')[0]:<12} {item['url']}  ({item['action']})"
+                         for item in section['non_webp'])
+    for line in offenders[:limit]:
+        print(f"    {line}")
+    if len(offenders) > limit:
+        print(f"    ... and {len(offenders) - limit} more in the report")
+
+
+def _start_profiler(path):
+    if path.endswith('.html'):
+        from pyinstrument import Profiler
+        profiler = Profiler()
+    else:
+        import cProfile
+        profiler = cProfile.Profile()
+    profiler.enable() if hasattr(profiler, 'enable') else profiler.start()
+    return profiler
+
+
+def _stop_profiler(profiler, path):
+    if path.endswith('.html'):
+        profiler.stop()
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(profiler.output_html())
+    else:
+        profiler.disable()
+        profiler.dump_stats(path)
+
+
+def _write_json(report, path, profile=None):
+    if profile is None:
+        report.write_json(path)
+        return
+    # The report is serialised inside this stage, so its own timing only
+    # reaches the console table printed at the end
+    with profile.stage('write_json'):
+        report.write_json(path)
 
-# Save report
-with open('seo_audit_report.json', 'w', encoding='utf-8') as f:
-    json.dump(report, f, indent=2, ensure_ascii=False)
 
-print("Analysis complete! Report saved to seo_audit_report.json")
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Audit a Screaming Frog crawl export.")
+    parser.add_argument('csv_file', nargs='?', default='internal_all_dworks.csv',
+                        help="crawl export to audit (default: %(default)s)")
+    parser.add_argument('-o', '--output', default='seo_audit_report.json',
+                        help="where to write the report (default: %(default)s); a .ndjson or "
+                             ".jsonl name streams it one record per line, and .gz compresses it")
+    parser.add_argument('--checks', nargs='+', choices=list(CHECKS), metavar='CHECK',
+                        help=f"checks to run (default: {', '.join(check.key for check in DEFAULT_CHECKS)}; "
+                             f"also available: {', '.join(check.key for check in OPTIONAL_CHECKS)})")
+    parser.add_argument('--redirect-map', metavar='PATH',
+                        help="also write every redirect flattened to its final target as "
+                             "netlify.toml [[redirects]] blocks")
+    parser.add_argument('--near-duplicate-threshold', type=float, default=0.8,
+                        help="estimated Jaccard similarity at which pages count as near-duplicates "
+                             "(default: %(default)s)")
+    parser.add_argument('--near-duplicate-max-bucket', type=int, default=200,
+                        help="LSH buckets with more distinct pages than this are reported rather "
+                             "than compared pairwise (default: %(default)s)")
+    parser.add_argument('--cannibalization-threshold', type=float, default=0.5,
+                        help="cosine similarity of weighted title/heading/keyword terms at which "
+                             "pages count as competing (default: %(default)s)")
+    parser.add_argument('--sitemap', default=sitemap_check.DEFAULT_SITEMAP,
+                        help="sitemap or sitemap index to diff the crawl against (default: %(default)s)")
+    parser.add_argument('--robots', default=sitemap_check.DEFAULT_ROBOTS,
+                        help="robots.txt whose Googlebot rules the sitemap is checked against "
+                             "(default: %(default)s)")
+    parser.add_argument('--budgets', metavar='PATH',
+                        help="JSON object overriding the page-weight budgets "
+                             f"({', '.join(PAGE_WEIGHT_BUDGETS)})")
+    parser.add_argument('--public-dir', metavar='DIR',
+                        help="the crawled site's built files (e.g. public), where the originals and "
+                             ".webp versions of non-WebP images are looked up (default: no lookup)")
+    parser.add_argument('--fail-on-budget', action='store_true',
+                        help="exit with status 1 if any page-weight budget is exceeded (for CI)")
+    parser.add_argument('--state', metavar='PATH',
+                        help="incremental mode: reuse results for unchanged URLs from the state "
+                             "saved here by the previous run, report new/resolved issues, then "
+                             "update it")
+    parser.add_argument('--cache-dir', default=crawl_cache.DEFAULT_CACHE_DIR,
+                        help="columnar cache of parsed exports (default: %(default)s)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="parse the CSV directly instead of using the cache")
+    parser.add_argument('--profile', action='store_true',
+                        help="record wall/CPU time, rows and memory per stage and per check "
+                             "in a 'profile' section of the report (writing the report is "
+                             "only in the printed table)")
+    parser.add_argument('--profile-memory', action='store_true',
+                        help="with --profile, also trace allocations for per-stage and per-check "
+                             "memory (several times slower)")
+    parser.add_argument('--profile-dump', metavar='PATH',
+                        help="also profile the run with cProfile and save the stats here "
+                             "(or a pyinstrument HTML page if PATH ends in .html)")
+    parser.add_argument('--store', metavar='DIR',
+                        help="also append the crawl and this audit's executive summary to the "
+                             "crawl_store.py store in DIR, for cross-site and historical queries")
+    args = parser.parse_args(argv)
 
-# Print summary
-print("\n=== EXECUTIVE SUMMARY ===")
-print(f"Total HTML Pages Analyzed: {report['executive_summary']['total_pages']}")
-print(f"\nCritical Issues Found:")
-print(f"  - Thin Content Pages: {report['executive_summary']['thin_content_pages']}")
-print(f"  - Duplicate Titles: {report['executive_summary']['duplicate_titles']}")
-print(f"  - Duplicate Meta Descriptions: {report['executive_summary']['duplicate_metas']}")
-print(f"  - Link Structure Issues: {report['executive_summary']['link_issues']}")
-print(f"  - Orphaned Pages: {report['executive_summary']['orphaned_pages']}")
-print(f"  - Redirect Chains (>3 hops): {report['executive_summary']['redirect_chains']}")
-print(f"  - Redirect Loops: {report['executive_summary']['redirect_loops']}")
-print(f"  - Temporary Redirects (302): {report['executive_summary']['temp_redirects']}")
-print(f"  - 404 Errors: {report['executive_summary']['404_errors']}")
-print(f"  - Missing Meta Descriptions: {report['executive_summary']['missing_meta']}")
-print(f"  - Short Meta Descriptions (<120): {report['executive_summary']['short_meta']}")
-print(f"  - Long Meta Descriptions (>160): {report['executive_summary']['long_meta']}")
+    print("\n=== Running SEO Analysis ===\n")
 
+    cache_dir = None if args.no_cache else args.cache_dir
+    options = {'near_duplicate_threshold': args.near_duplicate_threshold,
+               'near_duplicate_max_bucket': args.near_duplicate_max_bucket,
+               'cannibalization_threshold': args.cannibalization_threshold,
+               'sitemap': args.sitemap, 'robots': args.robots,
+               'public_dir': args.public_dir}
+    if args.budgets:
+        try:
+            options['budgets'] = load_budgets(args.budgets)
+        except ValueError as e:
+            parser.error(str(e))
+    state = IncrementalState.load(args.state) if args.state else None
+    profile = audit_profile.AuditProfile(args.profile_memory) if args.profile or args.profile_memory else None
+    profiler = _start_profiler(args.profile_dump) if args.profile_dump else None
 
+    if report_writer.is_ndjson(args.output):
+        with report_writer.NDJSONWriter(args.output, source=args.csv_file) as writer:
+            report = run_audit(args.csv_file, checks=args.checks, cache_dir=cache_dir,
+                               options=options, state=state, profile=profile, stream=writer)
+            writer.write_report(report)
+    else:
+        report = run_audit(args.csv_file, checks=args.checks, cache_dir=cache_dir,
+                           options=options, state=state, profile=profile)
+        _write_json(report, args.output, profile)
+    if state is not None:
+        state.save(args.state, report.issues, report.checks)
+    if profiler is not None:
+        _stop_profiler(profiler, args.profile_dump)
+        print(f"Profiler output saved to {args.profile_dump}")
 
+    print(f"Analysis complete! Report saved to {args.output}")
+    if args.store:
+        import crawl_store
+        crawl = crawl_store.CrawlStore(args.store).append_csv(
+            args.csv_file, tool='analyze_seo', summary=report.executive_summary)
+        print(f"Stored as crawl {crawl.id} of {crawl.site} in {args.store}")
 
+    if args.redirect_map and 'redirects' in report.sections:
+        write_redirect_map(report, args.redirect_map)
+        print(f"Flattened redirect map saved to {args.redirect_map}")
+    print_summary(report)
+    if profile is not None:
+        print("\n=== PROFILE ===")
+        print(profile.format())
+    if args.fail_on_budget and report.executive_summary.get('budget_violations'):
+        print_budget_violations(report)
+        return 1
+    return 0
 
 
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,213 @@
+"""
+Where an audit spends its time and memory, per stage and per check.
+
+analyze_seo.run_audit(..., profile=AuditProfile()) wraps the row stream and
+every check.  Reading rows and feeding checks are interleaved, so each is
+timed around its own calls: 'read_rows' is the time spent pulling rows out
+of the reader, each check's 'feed' is the time spent inside that check.
+Stages record wall and CPU seconds and the process's peak RSS so far.
+
+With trace_memory, tracemalloc also gives each stage its own allocation
+peak and each check the memory it kept hold of while being fed (what grows
+with the size of the crawl) and its result() peak.  Tracing every
+allocation makes an audit several times slower, so it is off by default
+and its timings are only good for comparing checks with each other.
+"""
+
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def _or_dash(value):
+    return '-' if value is None else value
+
+
+def _mb(size):
+    return round(size / (1 << 20), 3)
+
+
+def peak_rss_mb():
+    """The process's peak RSS so far in MB, or None where the platform can't say."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (1 << 20) if sys.platform == 'darwin' else peak / 1024, 1)
+
+
+class _Timing:
+    __slots__ = ('wall', 'cpu', 'calls')
+
+    def __init__(self):
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.calls = 0
+
+    def to_dict(self):
+        return {'wall_seconds': round(self.wall, 6), 'cpu_seconds': round(self.cpu, 6), 'calls': self.calls}
+
+
+class _CheckStats:
+    def __init__(self):
+        self.feed = _Timing()
+        self.result = _Timing()
+        self.rows = 0
+        self.retained = 0
+        self.result_peak = 0
+
+    def to_dict(self, trace):
+        entry = {'rows': self.rows, 'feed': self.feed.to_dict(), 'result': self.result.to_dict()}
+        if trace:
+            entry['retained_mb'] = _mb(self.retained)
+            entry['result_peak_mb'] = _mb(self.result_peak)
+        return entry
+
+
+class _ProfiledCheck:
+    """Times a check's per-row calls and result(); everything else passes straight through."""
+
+    def __init__(self, check, stats, profile):
+        self._check = check
+        self._stats = stats
+        self._profile = profile
+        self._trace = profile.trace
+
+    def __getattr__(self, name):
+        return getattr(self._check, name)
+
+    def _timed(self, method, *args):
+        stats = self._stats
+        before = tracemalloc.get_traced_memory()[0] if self._trace else 0
+        wall, cpu = time.perf_counter(), time.process_time()
+        value = method(*args)
+        stats.feed.wall += time.perf_counter() - wall
+        stats.feed.cpu += time.process_time() - cpu
+        stats.feed.calls += 1
+        if self._trace:
+            stats.retained += tracemalloc.get_traced_memory()[0] - before
+        return value
+
+    def feed(self, row):
+        self._stats.rows += 1
+        return self._timed(self._check.feed, row)
+
+    def evaluate(self, row):
+        return self._timed(self._check.evaluate, row)
+
+    def add(self, value):
+        # Incremental runs call evaluate()/add() instead of feed(); add() runs once per row
+        self._stats.rows += 1
+        return self._timed(self._check.add, value)
+
+    def result(self):
+        stats = self._stats
+        if self._trace:
+            self._profile._carry_peak()
+            before = tracemalloc.get_traced_memory()[0]
+        wall, cpu = time.perf_counter(), time.process_time()
+        value = self._check.result()
+        stats.result.wall += time.perf_counter() - wall
+        stats.result.cpu += time.process_time() - cpu
+        stats.result.calls += 1
+        if self._trace:
+            stats.result_peak = tracemalloc.get_traced_memory()[1] - before
+            self._profile._carry_peak()
+        return value
+
+
+class AuditProfile:
+    def __init__(self, trace_memory=False):
+        self.trace = trace_memory
+        self.stages = {}
+        self.checks = {}
+        self.read = _Timing()
+        self._peak = 0
+        self._started = time.perf_counter()
+        if self.trace and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def _carry_peak(self):
+        # Checks reset the tracemalloc peak to measure result(); keep the
+        # highest peak seen so the enclosing stage still reports it
+        self._peak = max(self._peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+
+    @contextmanager
+    def stage(self, name, rows=None):
+        """Time the enclosed block as stage ``name``."""
+        if self.trace:
+            tracemalloc.reset_peak()
+            self._peak = 0
+            before = tracemalloc.get_traced_memory()[0]
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            entry = {
+                'wall_seconds': round(time.perf_counter() - wall, 6),
+                'cpu_seconds': round(time.process_time() - cpu, 6),
+            }
+            if rows is not None:
+                entry['rows'] = rows
+            entry['peak_rss_mb'] = peak_rss_mb()
+            if self.trace:
+                peak = max(self._peak, tracemalloc.get_traced_memory()[1])
+                entry['peak_mb'] = _mb(peak - before)
+            self.stages[name] = entry
+
+    def wrap_rows(self, rows):
+        """Yield ``rows`` unchanged, timing how long each one takes to produce."""
+        read = self.read
+        iterator = iter(rows)
+        while True:
+            wall, cpu = time.perf_counter(), time.process_time()
+            try:
+                row = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                read.wall += time.perf_counter() - wall
+                read.cpu += time.process_time() - cpu
+            read.calls += 1
+            yield row
+
+    def wrap_check(self, check):
+        stats = self.checks[check.key] = _CheckStats()
+        return _ProfiledCheck(check, stats, self)
+
+    def to_dict(self):
+        stages = {'read_rows': dict(self.read.to_dict(), rows=self.read.calls)}
+        stages.update(self.stages)
+        return {
+            'total_wall_seconds': round(time.perf_counter() - self._started, 6),
+            'peak_rss_mb': peak_rss_mb(),
+            'memory_traced': self.trace,
+            'stages': stages,
+            'checks': {key: stats.to_dict(self.trace) for key, stats in self.checks.items()},
+        }
+
+    def format(self):
+        """Plain-text table of the slowest stages and checks, for the console."""
+        data = self.to_dict()
+        lines = [f"{'stage':<28} {'wall s':>9} {'cpu s':>9} {'RSS MB':>9}"]
+        for name, entry in data['stages'].items():
+            lines.append(f"{name:<28} {entry['wall_seconds']:>9.3f} {entry['cpu_seconds']:>9.3f} "
+                         f"{_or_dash(entry.get('peak_rss_mb')):>9}")
+        lines.append(f"\n{'check':<28} {'feed s':>9} {'result s':>9} {'rows':>9} {'kept MB':>9}")
+        ranked = sorted(data['checks'].items(),
+                        key=lambda item: item[1]['feed']['wall_seconds'] + item[1]['result']['wall_seconds'],
+                        reverse=True)
+        for key, entry in ranked:
+            lines.append(f"{key:<28} {entry['feed']['wall_seconds']:>9.3f} "
+                         f"{entry['result']['wall_seconds']:>9.3f} {entry['rows']:>9} "
+                         f"{entry.get('retained_mb', '-'):>9}")
+        lines.append(f"\nPeak RSS: {data['peak_rss_mb']} MB" if data['peak_rss_mb'] is not None
+                     else "\nPeak RSS: unavailable on this platform (--profile-memory gives tracemalloc peaks)")
+        return '\n'.join(lines)
@@ -0,0 +1,197 @@
+"""
+Audit many Screaming Frog exports in parallel.
+
+Each export is audited with analyze_seo.run_audit() in a worker process and
+written to <output_dir>/<site>.json (or .ndjson, .json.gz, .ndjson.gz with
+--report-format; see report_writer).  A summary.json alongside lists every
+site's executive summary and how long its audit took, slowest first, so it
+is obvious which crawls dominate a nightly run.
+
+--site-options names a JSON object mapping site names to analyze_seo
+options, e.g. {"client-b": {"sitemap": "sites/client-b/sitemap.xml",
+"robots": "sites/client-b/robots.txt", "public_dir": "sites/client-b"}};
+a "*" entry applies to every site and a site's own entry overrides it.
+
+Usage:
+    python batch_audit.py crawls/                  # every *.csv in the directory
+    python batch_audit.py "exports/*/internal_*.csv" -j 8 -o reports/
+    python batch_audit.py crawls/ --report-format ndjson.gz
+    python batch_audit.py crawls/ --store crawl_store/
+    python batch_audit.py crawls/ --site-options sites.json --checks thin_content duplicates links
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import analyze_seo
+import crawl_cache
+import report_writer
+
+REPORT_FORMATS = ('json', 'json.gz', 'ndjson', 'ndjson.gz')
+
+
+def find_exports(patterns):
+    """Expand directories and glob patterns into a sorted, de-duplicated list of CSVs."""
+    found = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            found.update(glob.glob(os.path.join(pattern, '*.csv')))
+        else:
+            found.update(glob.glob(pattern))
+    return sorted(found)
+
+
+def site_names(paths):
+    """Name each export after its file, falling back to parent/file on clashes."""
+    stems = [os.path.splitext(os.path.basename(path))[0] for path in paths]
+    names = []
+    for path, stem in zip(paths, stems):
+        if stems.count(stem) > 1:
+            parent = os.path.basename(os.path.dirname(os.path.abspath(path)))
+            stem = f"{parent}_{stem}"
+        names.append(stem)
+    return names
+
+
+def load_site_options(path):
+    """The JSON object in ``path`` mapping site names (or "*") to analyze_seo options."""
+    with open(path, 'r', encoding='utf-8') as f:
+        site_options = json.load(f)
+    if not isinstance(site_options, dict) or not all(isinstance(v, dict) for v in site_options.values()):
+        raise ValueError(f"{path} must map site names to objects of options")
+    return site_options
+
+
+def options_for(site, site_options):
+    """The options for ``site``: the "*" entry overridden by the site's own."""
+    if not site_options:
+        return None
+    return dict(site_options.get('*', {}), **site_options.get(site, {}))
+
+
+def audit_one(site, csv_path, output_dir, cache_dir=None, report_format='json', store_dir=None,
+              checks=None, options=None):
+    """Worker: audit one export, write its report and return its summary row."""
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    output = os.path.join(output_dir, f"{site}.{report_format}")
+    if report_writer.is_ndjson(output):
+        with report_writer.NDJSONWriter(output, source=csv_path) as writer:
+            report = analyze_seo.run_audit(csv_path, checks=checks, cache_dir=cache_dir,
+                                           options=options, stream=writer)
+            writer.write_report(report)
+    else:
+        report = analyze_seo.run_audit(csv_path, checks=checks, cache_dir=cache_dir, options=options)
+        report.write_json(output)
+    if store_dir:
+        import crawl_store
+
+        # Appends lock the store, so workers can share it
+        crawl_store.CrawlStore(store_dir).append_csv(csv_path, tool='analyze_seo',
+                                                     summary=report.executive_summary)
+    return {
+        'site': site,
+        'source': csv_path,
+        'report': output,
+        'rows': report.counts['total'],
+        'wall_seconds': round(time.perf_counter() - started, 4),
+        'cpu_seconds': round(time.process_time() - cpu_started, 4),
+        'executive_summary': report.executive_summary,
+    }
+
+
+def run_batch(paths, output_dir, workers=None, cache_dir=None, report_format='json', store_dir=None,
+              checks=None, site_options=None):
+    """Audit ``paths`` across a process pool; returns the aggregate summary dict.
+
+    ``site_options`` maps site names to analyze_seo options (see options_for).
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    started = time.perf_counter()
+    sites = []
+    failures = []
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(audit_one, site, path, output_dir, cache_dir, report_format, store_dir,
+                        checks, options_for(site, site_options)): (site, path)
+            for site, path in zip(site_names(paths), paths)
+        }
+        for future in as_completed(futures):
+            site, path = futures[future]
+            try:
+                sites.append(future.result())
+            except Exception as e:
+                failures.append({'site': site, 'source': path, 'error': f"{type(e).__name__}: {e}"})
+
+    sites.sort(key=lambda s: s['wall_seconds'], reverse=True)
+    return {
+        'sites_audited': len(sites),
+        'sites_failed': len(failures),
+        'workers': workers or os.cpu_count(),
+        'wall_seconds': round(time.perf_counter() - started, 4),
+        'sum_site_seconds': round(sum(s['wall_seconds'] for s in sites), 4),
+        'sites': sites,
+        'failures': failures,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Audit many crawl exports in parallel.")
+    parser.add_argument('exports', nargs='+',
+                        help="directories (all *.csv inside) or glob patterns of exports")
+    parser.add_argument('-o', '--output-dir', default='seo_reports',
+                        help="where per-site reports and summary.json go (default: %(default)s)")
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help="worker processes (default: one per CPU)")
+    parser.add_argument('--cache-dir', default=crawl_cache.DEFAULT_CACHE_DIR,
+                        help="columnar cache of parsed exports (default: %(default)s)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="parse the CSVs directly instead of using the cache")
+    parser.add_argument('--report-format', choices=REPORT_FORMATS, default='json',
+                        help="per-site report format; ndjson streams findings as they are found "
+                             "(default: %(default)s)")
+    parser.add_argument('--store', metavar='DIR',
+                        help="also append every crawl and its executive summary to the crawl_store.py "
+                             "store in DIR")
+    parser.add_argument('--checks', nargs='+', choices=list(analyze_seo.CHECKS), metavar='CHECK',
+                        help="checks to run on every site (default: analyze_seo's defaults)")
+    parser.add_argument('--site-options', metavar='PATH',
+                        help="JSON object mapping site names (or \"*\" for all) to analyze_seo "
+                             "options such as sitemap, robots and public_dir")
+    args = parser.parse_args(argv)
+
+    paths = find_exports(args.exports)
+    if not paths:
+        parser.error("no exports matched")
+    try:
+        site_options = load_site_options(args.site_options) if args.site_options else None
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    print(f"Auditing {len(paths)} exports...")
+    summary = run_batch(paths, args.output_dir, args.workers,
+                        None if args.no_cache else args.cache_dir, args.report_format, args.store,
+                        args.checks, site_options)
+
+    summary_path = os.path.join(args.output_dir, 'summary.json')
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+
+    print(f"\n=== BATCH SUMMARY ({summary['wall_seconds']}s wall, "
+          f"{summary['sum_site_seconds']}s across sites) ===")
+    for site in summary['sites']:
+        print(f"  {site['wall_seconds']:>8.3f}s  {site['rows']:>9} rows  {site['site']}")
+    for failure in summary['failures']:
+        print(f"  FAILED  {failure['site']}: {failure['error']}")
+    print(f"\nSummary saved to {summary_path}")
+    return 1 if summary['failures'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,254 @@
+"""
+Benchmark the audit scripts on synthetic crawls and track the results over time.
+
+Every case runs in a fresh interpreter, so its peak RSS is its own, and
+repeats report the best and median wall time.  Results are appended to a
+JSON-lines history; each run is compared with the last recorded run of the
+same case, size and machine, and anything slower or bigger by more than
+the tolerance is flagged (and fails the run with --fail-on-regression).
+The import[...] cases time a fresh interpreter importing each script, which
+is most of what a short CLI run on a small crawl costs.  Where there is no
+resource module (Windows), peak memory is tracemalloc's peak of Python
+allocations instead, which is slower to collect and recorded as such.
+
+Usage:
+    python benchmark_audit.py                          # 10k and 100k rows, every case
+    python benchmark_audit.py --rows 1000000 --cases analyze_seo.run_audit
+    python benchmark_audit.py --fail-on-regression --tolerance 0.2
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import synthetic_crawl
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_HISTORY = os.path.join('.benchmarks', 'history.jsonl')
+
+
+# Cases: name -> (setup(path, workdir), run(path, workdir)).  Imports happen
+# inside the functions so each worker only loads what its case needs.
+
+def _no_setup(path, workdir):
+    pass
+
+
+def _analyze_seo(path, workdir):
+    import analyze_seo
+    analyze_seo.run_audit(path)
+
+
+def _warm_cache(path, workdir):
+    import crawl_cache
+    crawl_cache.load(path, os.path.join(workdir, 'cache'))
+
+
+def _analyze_seo_cached(path, workdir):
+    import analyze_seo
+    analyze_seo.run_audit(path, cache_dir=os.path.join(workdir, 'cache'))
+
+
+def _check(key):
+    def run(path, workdir):
+        import analyze_seo
+        analyze_seo.run_audit(path, checks=[key])
+    return run
+
+
+def _seo_audit_analysis(path, workdir):
+    import seo_audit_analysis
+    seo_audit_analysis.run_audit(path)
+
+
+def _lazy_csv(path, workdir):
+    import lazy_csv
+    with lazy_csv.LazyCSV(path) as crawl:
+        for _ in crawl.records():
+            pass
+
+
+def _cache_build(path, workdir):
+    import crawl_cache
+    crawl_cache.build(path, os.path.join(workdir, 'build'))
+
+
+def _import(module):
+    def run(path, workdir):
+        # A new interpreter each time: in this one the module is already imported
+        subprocess.run([sys.executable, '-c', f'import {module}'], check=True,
+                       cwd=os.path.dirname(os.path.abspath(__file__)))
+    return run
+
+
+IMPORTED_MODULES = ('seo_audit_analysis', 'analyze_seo')
+
+
+def cases():
+    import analyze_seo
+    found = {f'import[{module}]': (_no_setup, _import(module)) for module in IMPORTED_MODULES}
+    found.update({
+        'analyze_seo.run_audit': (_no_setup, _analyze_seo),
+        'analyze_seo.run_audit[cache]': (_warm_cache, _analyze_seo_cached),
+    })
+    for key in analyze_seo.CHECKS:
+        found[f'analyze_seo.check[{key}]'] = (_no_setup, _check(key))
+    found['seo_audit_analysis.run_audit'] = (_no_setup, _seo_audit_analysis)
+    found['lazy_csv.records'] = (_no_setup, _lazy_csv)
+    found['crawl_cache.build'] = (_no_setup, _cache_build)
+    return found
+
+
+def _peak_rss_mb():
+    if resource is None:
+        # No getrusage: fall back to tracemalloc's peak of Python allocations
+        return tracemalloc.get_traced_memory()[1] / (1 << 20)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1 << 20) if sys.platform == 'darwin' else peak / 1024
+
+
+def worker(case, path, workdir, repeat):
+    """Run one case in this (fresh) process and return its measurements."""
+    setup, run = cases()[case]
+    if resource is None:
+        tracemalloc.start()
+    setup(path, workdir)
+    baseline_rss = _peak_rss_mb()
+    walls, cpus = [], []
+    for _ in range(repeat):
+        started, cpu_started = time.perf_counter(), time.process_time()
+        run(path, workdir)
+        walls.append(time.perf_counter() - started)
+        cpus.append(time.process_time() - cpu_started)
+    return {
+        'wall_min': round(min(walls), 4),
+        'wall_median': round(statistics.median(walls), 4),
+        'cpu_min': round(min(cpus), 4),
+        'peak_rss_mb': round(_peak_rss_mb(), 1),
+        'setup_rss_mb': round(baseline_rss, 1),
+        'memory': 'rss' if resource is not None else 'tracemalloc',
+    }
+
+
+def measure(case, path, repeat):
+    with tempfile.TemporaryDirectory(prefix='seo-bench-') as workdir:
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--worker', case, path, workdir, str(repeat)],
+            check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path):
+    history = []
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            history = [json.loads(line) for line in f if line.strip()]
+    return history
+
+
+def previous_results(history, machine):
+    """The most recent result per (case, rows) recorded on ``machine``."""
+    latest = {}
+    for entry in history:
+        if entry.get('machine') == machine:
+            latest[(entry['case'], entry['rows'])] = entry
+    return latest
+
+
+def regressions(result, previous, tolerance):
+    flagged = []
+    if previous is None:
+        return flagged
+    for metric in ('wall_min', 'peak_rss_mb'):
+        before, after = previous.get(metric), result[metric]
+        if before and after > before * (1 + tolerance):
+            flagged.append(f"{metric} {before} -> {after} (+{(after / before - 1) * 100:.0f}%)")
+    return flagged
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ['--worker']:
+        case, path, workdir, repeat = argv[1:5]
+        print(json.dumps(worker(case, path, workdir, int(repeat))))
+        return 0
+
+    parser = argparse.ArgumentParser(description="Benchmark the audit scripts on synthetic crawls.")
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000],
+                        help="synthetic crawl sizes (default: %(default)s)")
+    parser.add_argument('--cases', nargs='+', metavar='CASE',
+                        help=f"cases to run (default: all of {', '.join(cases())})")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="timed runs per case; best and median are kept (default: %(default)s)")
+    parser.add_argument('--crawl-dir', default='synthetic_crawls',
+                        help="where generated crawls are kept between runs (default: %(default)s)")
+    parser.add_argument('--history', default=DEFAULT_HISTORY,
+                        help="JSON-lines results history (default: %(default)s)")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="slowdown/growth over the last run that counts as a regression (default: %(default)s)")
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help="exit 1 if any case regressed")
+    parser.add_argument('--no-record', action='store_true', help="don't append this run to the history")
+    args = parser.parse_args(argv)
+
+    available = cases()
+    selected = args.cases or list(available)
+    unknown = [case for case in selected if case not in available]
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(unknown)}")
+
+    machine = f"{platform.node()}/{platform.machine()}/py{platform.python_version()}"
+    history = load_history(args.history)
+    previous = previous_results(history, machine)
+    commit = _git_commit()
+    recorded = []
+    regressed = 0
+
+    os.makedirs(args.crawl_dir, exist_ok=True)
+    print(f"{'case':<42} {'rows':>9} {'best s':>9} {'median s':>9} {'peak MB':>8}")
+    for rows in args.rows:
+        path = os.path.join(args.crawl_dir, synthetic_crawl.crawl_name(rows))
+        if not os.path.exists(path):
+            synthetic_crawl.write_crawl(path, rows)
+        for case in selected:
+            result = measure(case, path, args.repeat)
+            flagged = regressions(result, previous.get((case, rows)), args.tolerance)
+            regressed += bool(flagged)
+            print(f"{case:<42} {rows:>9} {result['wall_min']:>9.3f} {result['wall_median']:>9.3f} "
+                  f"{result['peak_rss_mb']:>8.1f}" + (f"  REGRESSION: {'; '.join(flagged)}" if flagged else ''))
+            recorded.append(dict(result, case=case, rows=rows, machine=machine, commit=commit,
+                                 timestamp=time.strftime('%Y-%m-%dT%H:%M:%S')))
+
+    if not args.no_record:
+        os.makedirs(os.path.dirname(args.history) or '.', exist_ok=True)
+        with open(args.history, 'a', encoding='utf-8') as f:
+            for entry in recorded:
+                f.write(json.dumps(entry) + '\n')
+        print(f"\nRecorded {len(recorded)} results in {args.history}")
+    if regressed:
+        print(f"{regressed} case(s) regressed by more than {args.tolerance:.0%}")
+    return 1 if regressed and args.fail_on_regression else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""
+Bulk, atomic rewrites of source files (the src/pages/locations/*.astro pages).
+
+A codemod is a function from file text to new file text.  run_codemod()
+applies it across a thread pool, skipping files that do not contain a
+literal ``needle`` without running the transform, and writes changed files
+through a temporary file in the same directory followed by os.replace(), so
+an interrupted run leaves every file either fully old or fully new.  With
+dry_run nothing is written and a unified diff is returned instead.
+
+Usage from a rewrite script:
+    import codemod
+    sys.exit(codemod.cli(transform, needle="quote_request", description="..."))
+"""
+
+import argparse
+import difflib
+import glob
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_PATTERN = "src/pages/locations/*.astro"
+
+UPDATED, UNCHANGED, SKIPPED, ERROR = 'updated', 'unchanged', 'skipped', 'error'
+
+
+def atomic_write(path, text, encoding='utf-8'):
+    """Replace ``path`` with ``text`` via a sibling temp file and rename."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding=encoding, newline='') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp, os.stat(path).st_mode & 0o7777)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def rewrite_file(path, transform, needle=None, dry_run=False, encoding='utf-8'):
+    """Apply ``transform`` to one file; returns its result dict (never raises)."""
+    started = time.perf_counter()
+    result = {'path': path, 'status': UNCHANGED}
+    try:
+        # newline='' keeps the file's own line endings through the round trip
+        with open(path, 'r', encoding=encoding, newline='') as f:
+            content = f.read()
+        if needle is not None and needle not in content:
+            result['status'] = SKIPPED
+        else:
+            new_content = transform(content)
+            if new_content != content:
+                result['status'] = UPDATED
+                if dry_run:
+                    result['diff'] = ''.join(difflib.unified_diff(
+                        content.splitlines(keepends=True), new_content.splitlines(keepends=True),
+                        fromfile=path, tofile=path))
+                else:
+                    atomic_write(path, new_content, encoding)
+    except Exception as e:
+        result['status'] = ERROR
+        result['error'] = f"{type(e).__name__}: {e}"
+    result['seconds'] = time.perf_counter() - started
+    return result
+
+
+def run_codemod(paths, transform, needle=None, dry_run=False, workers=None):
+    """Rewrite ``paths`` concurrently; results come back in ``paths`` order."""
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda path: rewrite_file(path, transform, needle, dry_run), paths))
+
+
+def summarize(results):
+    counts = {UPDATED: 0, UNCHANGED: 0, SKIPPED: 0, ERROR: 0}
+    for result in results:
+        counts[result['status']] += 1
+    return counts
+
+
+_ICONS = {UPDATED: '✅', UNCHANGED: '⚠️ ', SKIPPED: 'ℹ️ ', ERROR: '❌'}
+
+
+def cli(transform, needle=None, description=None, argv=None, pattern=DEFAULT_PATTERN):
+    """Command-line front end shared by the rewrite scripts; returns the exit code."""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('files', nargs='*',
+                        help=f"files or glob patterns to rewrite (default: {pattern})")
+    parser.add_argument('-n', '--dry-run', action='store_true',
+                        help="print a unified diff of each change instead of writing it")
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help="worker threads (default: Python's ThreadPoolExecutor default)")
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help="also list skipped and unchanged files")
+    args = parser.parse_args(argv)
+
+    paths = sorted({path for p in (args.files or [pattern]) for path in glob.glob(p)})
+    print(f"Found {len(paths)} files")
+    started = time.perf_counter()
+    results = run_codemod(paths, transform, needle, args.dry_run, args.workers)
+    elapsed = time.perf_counter() - started
+
+    for result in results:
+        status = result['status']
+        if status in (SKIPPED, UNCHANGED) and not args.verbose:
+            continue
+        name = os.path.basename(result['path'])
+        detail = f" - {result['error']}" if status == ERROR else ''
+        print(f"{_ICONS[status]} {status:<9} {result['seconds'] * 1000:8.2f} ms  {name}{detail}")
+        if result.get('diff'):
+            sys.stdout.write(result['diff'])
+
+    counts = summarize(results)
+    verb = "Would update" if args.dry_run else "Updated"
+    print(f"\n{verb} {counts[UPDATED]} files ({counts[UNCHANGED]} unchanged, "
+          f"{counts[SKIPPED]} skipped, {counts[ERROR]} errors) in {elapsed:.3f}s")
+    slowest = max(results, key=lambda r: r['seconds'], default=None)
+    if slowest is not None:
+        print(f"Slowest: {os.path.basename(slowest['path'])} ({slowest['seconds'] * 1000:.2f} ms)")
+    return 1 if counts[ERROR] else 0
@@ -0,0 +1,396 @@
+"""
+Readability and thin-content scoring from the built pages' own text.
+
+Screaming Frog's 'Word Count' counts every word in the page body, header,
+menus and footer included, so a 300-word floor on it says little about the
+copy itself.  This reads each page in dist/ and splits its text into blocks
+(paragraphs, headings, list items, ...), then:
+
+  - drops blocks inside <nav>, <header>, <footer> and <aside>, and keeps
+    only <main> when the page has one (the boilerplate-stripped main
+    content);
+  - counts how many pages carry each block; blocks on at least
+    ``shared_fraction`` of the pages are template text (calls to action,
+    trust badges), leaving each page's unique copy;
+  - scores the main content with Flesch reading ease and Flesch-Kincaid
+    grade.
+
+Pages are analysed once per content hash (the md5 Screaming Frog and
+local_audit.py report as 'Hash'), so a template stamped out a thousand
+times is parsed once; each worker tokenizes a distinct block once and
+counts syllables once per distinct word.  Everything after parsing is a
+single pass over per-page block lists, so scoring is linear in the size of
+the site.  With --cache the per-hash results are kept between runs.
+
+Usage:
+    python content_analysis.py dist/
+    python content_analysis.py dist/ --crawl internal_all.csv --min-words 250 -o content_report.json
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import re
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+from urllib.parse import unquote, urlparse
+
+import local_audit
+
+CACHE_VERSION = 1
+
+_SKIP_TEXT = {'script', 'style', 'noscript', 'template', 'svg'}
+_BOILERPLATE = {'nav', 'header', 'footer', 'aside'}
+# Text on either side of one of these belongs to different blocks
+_BLOCKS = {
+    'p', 'li', 'dt', 'dd', 'td', 'th', 'caption', 'figcaption', 'blockquote', 'pre', 'address',
+    'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'div', 'section', 'article', 'main', 'header', 'footer',
+    'nav', 'aside', 'ul', 'ol', 'dl', 'table', 'tr', 'form', 'fieldset', 'legend', 'label',
+    'button', 'option', 'br', 'hr', 'body',
+}
+_VOID = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta',
+         'param', 'source', 'track', 'wbr'}
+
+_WORD = re.compile(r"[^\W\d_]+(?:['’][^\W\d_]+)*")
+_SENTENCE_END = re.compile(r"[.!?]+(?=\s|$)")
+_VOWEL_GROUPS = re.compile(r"[aeiouy]+")
+
+
+class _BlockParser(HTMLParser):
+    """Splits a page's visible text into (text, where) blocks; where is 'main', 'body' or 'boilerplate'."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.blocks = []
+        self.has_main = False
+        self._stack = []
+        self._skip = 0
+        self._boilerplate = 0
+        self._main = 0
+        self._buffer = []
+
+    def _flush(self):
+        text = ' '.join(''.join(self._buffer).split())
+        self._buffer = []
+        if text:
+            if self._boilerplate:
+                where = 'boilerplate'
+            elif self._main:
+                where = 'main'
+            else:
+                where = 'body'
+            self.blocks.append((text, where))
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _BLOCKS:
+            self._flush()
+        if tag in _VOID:
+            return
+        self._stack.append(tag)
+        if tag in _SKIP_TEXT:
+            self._skip += 1
+        elif tag in _BOILERPLATE:
+            self._boilerplate += 1
+        elif tag == 'main':
+            self._main += 1
+            self.has_main = True
+
+    def handle_endtag(self, tag):
+        if tag not in self._stack:
+            return
+        if tag in _BLOCKS:
+            self._flush()
+        while self._stack:
+            open_tag = self._stack.pop()
+            if open_tag in _SKIP_TEXT:
+                self._skip -= 1
+            elif open_tag in _BOILERPLATE:
+                self._boilerplate -= 1
+            elif open_tag == 'main':
+                self._main -= 1
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if not self._skip and 'body' in self._stack:
+            self._buffer.append(data)
+
+    def close(self):
+        super().close()
+        self._flush()
+
+
+class _Syllables(dict):
+    """word -> syllable estimate, computed once per distinct word."""
+
+    def __missing__(self, word):
+        groups = len(_VOWEL_GROUPS.findall(word))
+        if word.endswith('e') and not word.endswith(('le', 'ee', 'ye')) and groups > 1:
+            groups -= 1  # silent e
+        value = self[word] = max(1, groups)
+        return value
+
+
+_syllables = _Syllables()
+
+
+def block_stats(text):
+    """(words, sentences, syllables) of one block of text."""
+    words = _WORD.findall(text.lower())
+    if not words:
+        return 0, 0, 0
+    syllables = _syllables
+    # A heading or list item without a full stop still reads as one sentence
+    sentences = max(1, len(_SENTENCE_END.findall(text)))
+    return len(words), sentences, sum(syllables[word] for word in words)
+
+
+# digest -> block_stats(), per worker process: a template's blocks are tokenized once
+_block_stats = {}
+
+
+def _digest(text):
+    return hashlib.blake2b(text.lower().encode('utf-8'), digest_size=8).hexdigest()
+
+
+def analyze_html(path):
+    """Worker: the blocks of one page as [digest, words, sentences, syllables, chars, where] lists."""
+    parser = _BlockParser()
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for chunk in iter(lambda: f.read(local_audit.CHUNK_SIZE), ''):
+            parser.feed(chunk)
+    parser.close()
+    stats = _block_stats
+    blocks = []
+    for text, where in parser.blocks:
+        if where == 'body' and parser.has_main:
+            where = 'boilerplate'  # outside <main> on a page that has one
+        key = _digest(text)
+        counted = stats.get(key)
+        if counted is None:
+            counted = stats[key] = block_stats(text)
+        if counted[0]:
+            blocks.append([key, *counted, len(text), where, text[:120]])
+    return {'size': os.path.getsize(path), 'blocks': blocks}
+
+
+def file_hash(path):
+    digest = hashlib.md5()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def flesch(words, sentences, syllables):
+    """(reading ease, Flesch-Kincaid grade), or (None, None) without words."""
+    if not words:
+        return None, None
+    per_sentence = words / sentences
+    per_word = syllables / words
+    return (round(206.835 - 1.015 * per_sentence - 84.6 * per_word, 1),
+            round(0.39 * per_sentence + 11.8 * per_word - 15.59, 1))
+
+
+def load_cache(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except FileNotFoundError:
+        return {}
+    return cache['pages'] if cache.get('version') == CACHE_VERSION else {}
+
+
+def save_cache(path, pages):
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({'version': CACHE_VERSION, 'pages': pages}, f)
+    os.replace(tmp, path)
+
+
+def crawl_word_counts(path):
+    """URL path -> the crawler's 'Word Count', for comparison."""
+    import lazy_csv
+
+    counts = {}
+    with lazy_csv.LazyCSV(path) as crawl:
+        for row in crawl.records(['Address', 'Content Type', 'Word Count']):
+            if 'text/html' in row.get('Content Type', '') and row.get('Word Count'):
+                counts[unquote(urlparse(row['Address']).path)] = int(row['Word Count'])
+    return counts
+
+
+def analyze_site(dist, base_url=local_audit.DEFAULT_BASE_URL, workers=None, cache=None,
+                 shared_fraction=0.5, min_words=150, min_flesch=30.0, crawl_counts=None):
+    """Score every page in ``dist``; returns the report dict.
+
+    ``cache`` is a dict of previous per-hash analyses (see load_cache),
+    updated in place.  A page is thin when its unique main-content copy has
+    fewer than ``min_words`` words, and hard to read below ``min_flesch``.
+    """
+    started = time.perf_counter()
+    paths = local_audit.find_pages(dist)
+    urls = [local_audit.page_url(path, dist, base_url) for path in paths]
+    hashes = [file_hash(path) for path in paths]
+
+    analyses = {} if cache is None else cache
+    todo = {}
+    for path, digest in zip(paths, hashes):
+        if digest not in analyses:
+            todo.setdefault(digest, path)
+    if todo:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for digest, result in zip(todo, pool.map(analyze_html, todo.values(),
+                                                     chunksize=max(1, len(todo) // (4 * (workers or os.cpu_count() or 1))))):
+                analyses[digest] = result
+    if cache is not None:
+        # Forget pages that are no longer built
+        current = set(hashes)
+        for digest in [digest for digest in cache if digest not in current]:
+            del cache[digest]
+
+    # How many pages carry each main-content block (once per page, however often it repeats there)
+    carriers = Counter()
+    for digest in hashes:
+        carriers.update({block[0] for block in analyses[digest]['blocks'] if block[5] != 'boilerplate'})
+    shared_at = max(2, math.ceil(shared_fraction * len(paths)))
+    shared = {key for key, pages in carriers.items() if pages >= shared_at}
+
+    pages = []
+    for url, digest in zip(urls, hashes):
+        analysis = analyses[digest]
+        total = main = unique = template = unique_chars = 0
+        sentences = syllables = 0
+        for key, words, block_sentences, block_syllables, chars, where, _ in analysis['blocks']:
+            total += words
+            if where == 'boilerplate':
+                continue
+            main += words
+            sentences += block_sentences
+            syllables += block_syllables
+            if key in shared:
+                template += words
+            else:
+                unique += words
+                unique_chars += chars
+        ease, grade = flesch(main, sentences, syllables)
+        issues = []
+        if unique < min_words:
+            issues.append(f"Thin unique content: {unique} words")
+        if ease is not None and ease < min_flesch:
+            issues.append(f"Hard to read: Flesch {ease}")
+        page = {
+            'url': url,
+            'hash': digest,
+            'words': total,
+            'main_words': main,
+            'unique_words': unique,
+            'template_words': template,
+            'boilerplate_share': round(1 - unique / total, 3) if total else None,
+            'content_ratio': round(unique_chars / analysis['size'] * 100, 3) if analysis['size'] else 0.0,
+            'flesch_reading_ease': ease,
+            'flesch_kincaid_grade': grade,
+            'issues': issues,
+        }
+        if crawl_counts is not None:
+            page['crawler_word_count'] = crawl_counts.get(unquote(urlparse(url).path))
+        pages.append(page)
+
+    previews = {}
+    for digest in dict.fromkeys(hashes):
+        for key, *_, preview in analyses[digest]['blocks']:
+            if key in shared and key not in previews:
+                previews[key] = preview
+    template_blocks = sorted(({'text': previews[key], 'pages': carriers[key]} for key in previews),
+                             key=lambda block: -block['pages'])
+    scored = [page['flesch_reading_ease'] for page in pages if page['flesch_reading_ease'] is not None]
+    return {
+        'summary': {
+            'pages': len(pages),
+            'distinct_pages': len(set(hashes)),
+            'analyzed': len(todo),
+            'thin_pages': sum(1 for page in pages if page['unique_words'] < min_words),
+            'hard_to_read_pages': sum(1 for page in pages
+                                      if page['flesch_reading_ease'] is not None
+                                      and page['flesch_reading_ease'] < min_flesch),
+            'template_blocks': len(template_blocks),
+            'median_flesch': sorted(scored)[len(scored) // 2] if scored else None,
+            'seconds': round(time.perf_counter() - started, 3),
+        },
+        'thresholds': {'min_words': min_words, 'min_flesch': min_flesch, 'shared_fraction': shared_fraction},
+        'template_blocks': template_blocks,
+        'pages': sorted(pages, key=lambda page: page['unique_words']),
+    }
+
+
+def print_report(report, limit=20):
+    summary = report['summary']
+    print(f"Pages: {summary['pages']} ({summary['distinct_pages']} distinct, "
+          f"{summary['analyzed']} parsed this run) in {summary['seconds']}s")
+    print(f"Thin pages: {summary['thin_pages']}")
+    print(f"Hard to read: {summary['hard_to_read_pages']}")
+    print(f"Median Flesch reading ease: {summary['median_flesch']}")
+    print(f"Template blocks shared across pages: {summary['template_blocks']}")
+    for block in report['template_blocks'][:5]:
+        print(f"  {block['pages']:>6} pages  {block['text'][:70]}")
+
+    crawler = any('crawler_word_count' in page for page in report['pages'])
+    print(f"\n{'unique':>7} {'main':>7} {'words':>7}" + (f" {'crawler':>7}" if crawler else '')
+          + f" {'flesch':>7}  url")
+    for page in report['pages'][:limit]:
+        flesch_score = page['flesch_reading_ease']
+        line = f"{page['unique_words']:>7} {page['main_words']:>7} {page['words']:>7}"
+        if crawler:
+            line += f" {page.get('crawler_word_count') if page.get('crawler_word_count') is not None else '-':>7}"
+        line += f" {flesch_score if flesch_score is not None else '-':>7}  {page['url']}"
+        print(line)
+    if len(report['pages']) > limit:
+        print(f"  ... {len(report['pages']) - limit} more pages in the report")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score the built pages' copy for thin content and readability.")
+    parser.add_argument('dist', nargs='?', default='dist', help="Astro build output (default: %(default)s)")
+    parser.add_argument('--base-url', default=local_audit.DEFAULT_BASE_URL,
+                        help="URL the site is served from (default: %(default)s)")
+    parser.add_argument('--crawl', metavar='CSV',
+                        help="crawl export whose 'Word Count' to show beside the computed counts")
+    parser.add_argument('--min-words', type=int, default=150,
+                        help="unique main-content words below which a page is thin (default: %(default)s)")
+    parser.add_argument('--min-flesch', type=float, default=30.0,
+                        help="Flesch reading ease below which a page is hard to read (default: %(default)s)")
+    parser.add_argument('--shared-fraction', type=float, default=0.5,
+                        help="share of pages a block must appear on to count as template text "
+                             "(default: %(default)s)")
+    parser.add_argument('--cache', metavar='PATH',
+                        help="keep per-hash page analyses here between runs")
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help="worker processes (default: one per CPU)")
+    parser.add_argument('-o', '--output', default='content_report.json',
+                        help="where to write the JSON report (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.dist):
+        parser.error(f"{args.dist} is not a directory; run the Astro build first")
+    base_url = args.base_url if args.base_url.endswith('/') else args.base_url + '/'
+
+    cache = load_cache(args.cache) if args.cache else None
+    report = analyze_site(args.dist, base_url, args.workers, cache, args.shared_fraction,
+                          args.min_words, args.min_flesch,
+                          crawl_word_counts(args.crawl) if args.crawl else None)
+    if args.cache:
+        save_cache(args.cache, cache)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print_report(report)
+    print(f"\nReport saved to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
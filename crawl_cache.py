@@ -0,0 +1,412 @@
+"""
+Typed columnar cache for Screaming Frog crawl exports.
+
+The first load of an export parses the CSV once, infers a type per column
+and writes each column as a flat binary file under ``<cache_dir>/<sha256>/``:
+
+    int columns     <n>.bin  int64 values  (+ <n>.mask, one byte per row, 1 = empty)
+    float columns   <n>.bin  float64 values, NaN for empty cells
+    str columns     <n>.off  int64 offsets (rows + 1)  +  <n>.dat  UTF-8 bytes
+
+Later loads memory-map those files, so reopening a crawl (for example to
+re-run an audit with different thresholds) costs a few syscalls instead of
+a full CSV parse.  The cache is keyed by the file's content hash; an index
+of path -> (size, mtime, hash) lets unchanged files skip re-hashing.
+
+Every load marks its entry as used.  Whenever a new export is cached,
+entries unused for MAX_AGE_DAYS are removed, then the least recently
+used ones until the cache fits in MAX_CACHE_BYTES; run this module to
+prune by hand with other limits.
+
+Usage:
+    python crawl_cache.py                          # prune .crawl_cache with the default limits
+    python crawl_cache.py --cache-dir /tmp/cache --max-mb 500 --max-age-days 7
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import math
+import mmap
+import os
+import shutil
+import sys
+import time
+from array import array
+
+FORMAT_VERSION = 1
+DEFAULT_CACHE_DIR = '.crawl_cache'
+# Limits applied whenever a new export is cached (see prune)
+MAX_CACHE_BYTES = 4 << 30
+MAX_AGE_DAYS = 30
+
+# Free-text fields stay strings even when every value happens to parse as a number
+TEXT_COLUMNS = frozenset([
+    'Address', 'URL Encoded Address', 'Content Type', 'Status', 'Indexability',
+    'Indexability Status', 'Title 1', 'Meta Description 1', 'Meta Keywords 1',
+    'H1-1', 'H2-1', 'H2-2', 'Meta Robots 1', 'X-Robots-Tag 1', 'Meta Refresh 1',
+    'Canonical Link Element 1', 'Hash', 'Redirect URL', 'Redirect Type',
+    'Last Modified', 'Crawl Timestamp', 'Language', 'HTTP Version',
+])
+
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+_FLUSH_EVERY = 65536
+# Rows decoded per column at a time by Crawl.rows()
+ROW_CHUNK = 1024
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class _Index:
+    """path -> (size, mtime_ns, sha256), so unchanged files are not re-hashed."""
+
+    def __init__(self, cache_dir):
+        self.path = os.path.join(cache_dir, 'index.json')
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def lookup(self, path):
+        st = os.stat(path)
+        key = os.path.abspath(path)
+        entry = self.entries.get(key)
+        if entry and entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns:
+            return entry['sha256']
+        sha = file_hash(path)
+        self.entries[key] = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha256': sha}
+        self._save()
+        return sha
+
+    def forget(self, hashes):
+        """Drop entries for the ``hashes`` and for files that no longer exist."""
+        stale = [key for key, entry in self.entries.items()
+                 if entry['sha256'] in hashes or not os.path.exists(key)]
+        for key in stale:
+            del self.entries[key]
+        if stale:
+            self._save()
+
+    def _save(self):
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f)
+        os.replace(tmp, self.path)
+
+
+# Reading
+
+def _map(path):
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b''
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class StringColumn:
+    """Lazily decoded view over an offsets + UTF-8 data pair."""
+
+    def __init__(self, offsets, data):
+        self.offsets = offsets
+        self.data = data
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return bytes(self.data[self.offsets[i]:self.offsets[i + 1]]).decode('utf-8')
+
+    def slice(self, start, stop):
+        """Decoded values of rows ``start`` to ``stop``, from one copy of their bytes."""
+        offsets = self.offsets[start:stop + 1]
+        if not len(offsets):
+            return []
+        base = offsets[0]
+        chunk = bytes(self.data[base:offsets[-1]])
+        return [chunk[a - base:b - base].decode('utf-8') for a, b in zip(offsets, offsets[1:])]
+
+    def __iter__(self):
+        data = self.data
+        offsets = self.offsets
+        start = offsets[0] if len(offsets) else 0
+        for i in range(1, len(offsets)):
+            end = offsets[i]
+            yield bytes(data[start:end]).decode('utf-8')
+            start = end
+
+
+class Crawl:
+    """A cached crawl: ``columns[name]`` is a memoryview (int/float) or StringColumn."""
+
+    def __init__(self, directory):
+        with open(os.path.join(directory, 'meta.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        self.directory = directory
+        self.header = meta['header']
+        self.types = meta['types']
+        self.nrows = meta['nrows']
+        self.columns = {}
+        self.masks = {}
+        for n, (name, kind) in enumerate(zip(self.header, self.types)):
+            base = os.path.join(directory, str(n))
+            if kind == 'str':
+                offsets = memoryview(_map(base + '.off')).cast('q')
+                self.columns[name] = StringColumn(offsets, memoryview(_map(base + '.dat')))
+            else:
+                self.columns[name] = memoryview(_map(base + '.bin')).cast(
+                    'q' if kind == 'int' else 'd')
+                if kind == 'int' and os.path.exists(base + '.mask'):
+                    self.masks[name] = memoryview(_map(base + '.mask'))
+
+    def __len__(self):
+        return self.nrows
+
+    def column_values(self, name, start=0, stop=None):
+        """Python values for one column (rows ``start`` to ``stop``), with '' for empty cells like the CSV has."""
+        kind = self.types[self.header.index(name)]
+        stop = self.nrows if stop is None else min(stop, self.nrows)
+        column = self.columns[name]
+        if kind == 'str':
+            return column.slice(start, stop)
+        column = column[start:stop]
+        if kind == 'float':
+            return ['' if math.isnan(v) else v for v in column]
+        mask = self.masks.get(name)
+        if mask is None:
+            return column.tolist()
+        return ['' if missing else v for v, missing in zip(column.tolist(), mask[start:stop])]
+
+    def rows(self, columns=None):
+        """Yield row dicts, optionally projected to ``columns``.
+
+        Numeric columns come back as int/float rather than strings.  Rows are
+        decoded ROW_CHUNK at a time straight from the mapped files, so memory
+        stays bounded however long the crawl is.
+        """
+        names = [name for name in (columns or self.header) if name in self.columns]
+        for start in range(0, self.nrows, ROW_CHUNK):
+            values = [self.column_values(name, start, start + ROW_CHUNK) for name in names]
+            for row in zip(*values):
+                yield dict(zip(names, row))
+
+    def to_frame(self):
+        """Build a pandas DataFrame with the dtypes pd.read_csv would have inferred."""
+        import numpy as np
+        import pandas as pd
+
+        data = {}
+        for name, kind in zip(self.header, self.types):
+            column = self.columns[name]
+            if kind == 'str':
+                data[name] = [value or None for value in column]
+            elif kind == 'float':
+                data[name] = np.frombuffer(column, dtype=np.float64)
+            elif name in self.masks:
+                values = np.frombuffer(column, dtype=np.int64).astype(np.float64)
+                values[np.frombuffer(self.masks[name], dtype=np.uint8).astype(bool)] = np.nan
+                data[name] = values
+            else:
+                data[name] = np.frombuffer(column, dtype=np.int64)
+        return pd.DataFrame(data, columns=self.header)
+
+
+# Writing
+
+class _ColumnWriter:
+    def __init__(self, base, name):
+        self.base = base
+        self.name = name
+        self.data = open(base + '.dat', 'wb')
+        self.offsets = open(base + '.off', 'wb')
+        self.pending = array('q', [0])
+        self.position = 0
+        self.maybe_int = name not in TEXT_COLUMNS
+        self.maybe_float = self.maybe_int
+        self.has_empty = False
+        self.has_value = False
+
+    def add(self, value):
+        if value == '':
+            self.has_empty = True
+        else:
+            self.has_value = True
+        if value and self.maybe_float:
+            if self.maybe_int:
+                try:
+                    number = int(value)
+                    if not _INT64_MIN <= number <= _INT64_MAX:
+                        self.maybe_int = False
+                except ValueError:
+                    self.maybe_int = False
+            if not self.maybe_int:
+                try:
+                    float(value)
+                except ValueError:
+                    self.maybe_float = False
+        encoded = value.encode('utf-8')
+        self.data.write(encoded)
+        self.position += len(encoded)
+        self.pending.append(self.position)
+        if len(self.pending) >= _FLUSH_EVERY:
+            self.pending.tofile(self.offsets)
+            self.pending = array('q')
+
+    def finish(self):
+        self.pending.tofile(self.offsets)
+        self.data.close()
+        self.offsets.close()
+        if not self.maybe_float:
+            return 'str'
+
+        # Every value parsed as a number: re-encode the column as a flat
+        # array.  Entirely empty columns become all-NaN floats, as in pandas.
+        kind = 'int' if self.maybe_int and self.has_value else 'float'
+        values = array('q' if kind == 'int' else 'd')
+        mask = bytearray()
+        for text in self._strings():
+            if kind == 'float':
+                values.append(float(text) if text else math.nan)
+            else:
+                values.append(int(text) if text else 0)
+                mask.append(0 if text else 1)
+        with open(self.base + '.bin', 'wb') as f:
+            values.tofile(f)
+        if kind == 'int' and self.has_empty:
+            with open(self.base + '.mask', 'wb') as f:
+                f.write(mask)
+        os.remove(self.base + '.dat')
+        os.remove(self.base + '.off')
+        return kind
+
+    def _strings(self):
+        return iter(StringColumn(memoryview(_map(self.base + '.off')).cast('q'),
+                                 memoryview(_map(self.base + '.dat'))))
+
+
+def build(csv_path, directory):
+    """Parse ``csv_path`` once and write its columnar cache to ``directory``."""
+    tmp = f"{directory}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    try:
+        with open(csv_path, 'r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            writers = [_ColumnWriter(os.path.join(tmp, str(n)), name)
+                       for n, name in enumerate(header)]
+            width = len(header)
+            nrows = 0
+            for row in reader:
+                if len(row) < width:
+                    row = row + [''] * (width - len(row))
+                for writer, value in zip(writers, row):
+                    writer.add(value)
+                nrows += 1
+        types = [writer.finish() for writer in writers]
+        with open(os.path.join(tmp, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump({'version': FORMAT_VERSION, 'source': os.path.abspath(csv_path),
+                       'header': header, 'types': types, 'nrows': nrows}, f)
+        if os.path.isdir(directory) and not _valid(directory):
+            shutil.rmtree(directory)
+        try:
+            os.replace(tmp, directory)
+        except OSError:
+            # Another process finished the same crawl first
+            if not _valid(directory):
+                raise
+            shutil.rmtree(tmp, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+
+
+def _valid(directory):
+    try:
+        with open(os.path.join(directory, 'meta.json'), 'r', encoding='utf-8') as f:
+            return json.load(f).get('version') == FORMAT_VERSION
+    except (OSError, ValueError):
+        return False
+
+
+def load(csv_path, cache_dir=DEFAULT_CACHE_DIR):
+    """Return a Crawl for ``csv_path``, building the cache on first use."""
+    os.makedirs(cache_dir, exist_ok=True)
+    sha = _Index(cache_dir).lookup(csv_path)
+    directory = os.path.join(cache_dir, sha)
+    if not _valid(directory):
+        build(csv_path, directory)
+        prune(cache_dir, keep=(sha,))
+    else:
+        # meta.json's mtime is the entry's last use
+        os.utime(os.path.join(directory, 'meta.json'))
+    return Crawl(directory)
+
+
+def _entries(cache_dir):
+    """(last used, bytes, sha256) of every cached export, least recently used first."""
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if not entry.is_dir() or len(entry.name) != 64 or not _valid(entry.path):
+            continue
+        used = os.stat(os.path.join(entry.path, 'meta.json')).st_mtime
+        entries.append((used, sum(f.stat().st_size for f in os.scandir(entry.path)), entry.name))
+    entries.sort()
+    return entries
+
+
+def prune(cache_dir=DEFAULT_CACHE_DIR, max_bytes=MAX_CACHE_BYTES, max_age_days=MAX_AGE_DAYS, keep=()):
+    """Remove entries unused for ``max_age_days``, then the least recently used over ``max_bytes``.
+
+    Either limit may be None.  Hashes in ``keep`` are never removed.
+    Returns the (sha256, bytes) of every entry removed.
+    """
+    if not os.path.isdir(cache_dir):
+        return []
+    entries = _entries(cache_dir)
+    total = sum(size for _, size, _ in entries)
+    cutoff = None if max_age_days is None else time.time() - max_age_days * 86400
+    removed = []
+    for used, size, sha in entries:
+        if sha in keep:
+            continue
+        expired = cutoff is not None and used < cutoff
+        if not expired and (max_bytes is None or total <= max_bytes):
+            continue
+        shutil.rmtree(os.path.join(cache_dir, sha), ignore_errors=True)
+        total -= size
+        removed.append((sha, size))
+    _Index(cache_dir).forget({sha for sha, _ in removed})
+    return removed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prune the columnar crawl cache.")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help="cache to prune (default: %(default)s)")
+    parser.add_argument('--max-mb', type=float, default=MAX_CACHE_BYTES / (1 << 20),
+                        help="remove the least recently used exports until the cache fits "
+                             "(default: %(default)s)")
+    parser.add_argument('--max-age-days', type=float, default=MAX_AGE_DAYS,
+                        help="remove exports not used for this long (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    removed = prune(args.cache_dir, int(args.max_mb * (1 << 20)), args.max_age_days)
+    for sha, size in removed:
+        print(f"Removed {sha} ({size / (1 << 20):.1f} MB)")
+    remaining = _entries(args.cache_dir) if os.path.isdir(args.cache_dir) else []
+    print(f"{len(removed)} exports removed; {len(remaining)} cached in "
+          f"{sum(size for _, size, _ in remaining) / (1 << 20):.1f} MB")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,437 @@
+"""
+Append-only columnar store of crawls from every site, for cross-site and historical queries.
+
+Each crawl export appended here becomes a contiguous block of rows in one
+set of column files shared by all sites and all crawls:
+
+    <store>/meta.json        format version and the stored columns
+    <store>/crawls.jsonl     one line per crawl: id, site, crawled_at, sha256, row_start, rows
+    <store>/summaries.jsonl  one line per audit of a crawl: crawl id, tool, executive summary
+    <store>/<n>.f8           numeric column n, float64 (NaN for empty cells)
+    <store>/<n>.off|.dat     text column n, int64 end offsets + UTF-8 bytes
+    <store>/kind.u1          analyze_seo.classify() of each row as a byte (see KINDS)
+
+Rows are only ever appended, and a crawl's line in crawls.jsonl is written
+after its rows, so it is the commit point: an interrupted append leaves
+uncommitted bytes that the next append truncates away.  Appends take a
+lock, so parallel batch_audit workers can share a store.  A crawl whose
+content is already stored for the same site is not stored twice; a second
+tool auditing it only adds its summary.
+
+Queries memory-map the columns and work on whole per-crawl slices with
+NumPy, so "title length distribution across all sites over the last 12
+crawls" reads a few float64 ranges instead of re-parsing old exports.
+
+Usage:
+    python crawl_store.py crawl_store/ add internal_all.csv internal_all_dworks.csv
+    python crawl_store.py crawl_store/ crawls
+    python crawl_store.py crawl_store/ distribution "Title 1 Length" --bins 0 30 45 60 70 --last 12
+    python crawl_store.py crawl_store/ trend duplicate_titles --tool analyze_seo
+    python crawl_store.py crawl_store/ trend "Missing H1 Tags" --tool seo_audit_analysis
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from array import array
+from collections import Counter
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+import numpy as np
+
+import crawl_cache
+import lazy_csv
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+FORMAT_VERSION = 1
+DEFAULT_STORE_DIR = 'crawl_store'
+
+NUMERIC_COLUMNS = (
+    'Status Code', 'Title 1 Length', 'Title 1 Pixel Width', 'Meta Description 1 Length',
+    'H1-1 Length', 'H2-1 Length', 'Size (bytes)', 'Word Count', 'Text Ratio', 'Crawl Depth',
+    'Inlinks', 'Unique Inlinks', 'Outlinks', 'Unique Outlinks', 'External Outlinks',
+    'Response Time',
+)
+TEXT_COLUMNS = (
+    'Address', 'Content Type', 'Indexability', 'Title 1', 'Meta Description 1', 'H1-1',
+    'Canonical Link Element 1', 'Redirect URL', 'Hash',
+)
+# Stored per row so queries can filter by kind without decoding Content Type
+KINDS = {None: 0, 'html': 1, 'redirect': 2, 'image': 3, 'css_js': 4}
+_REDIRECT_CODES = ('301', '302', '307', '308')
+
+
+def classify(content_type, status_code):
+    """analyze_seo.classify() on the two fields it reads, without importing analyze_seo."""
+    if status_code in _REDIRECT_CODES:
+        return 'redirect'
+    if 'text/html' in content_type:
+        return 'html'
+    if 'image' in content_type:
+        return 'image'
+    if 'css' in content_type or 'javascript' in content_type:
+        return 'css_js'
+    return None
+
+
+def _number(text):
+    try:
+        return float(text) if text else math.nan
+    except ValueError:
+        return math.nan
+
+
+def crawl_identity(path):
+    """(site, crawled_at) of an export: its most common host and earliest 'Crawl Timestamp'."""
+    hosts = Counter()
+    stamps = []
+    with lazy_csv.LazyCSV(path) as crawl:
+        for record in crawl.records(['Address', 'Crawl Timestamp']):
+            hosts[urlparse(record.get('Address', '')).netloc] += 1
+            if record.get('Crawl Timestamp'):
+                stamps.append(record['Crawl Timestamp'])
+    site = hosts.most_common(1)[0][0] if hosts else ''
+    if stamps:
+        crawled_at = min(stamps)
+    else:
+        crawled_at = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(os.path.getmtime(path)))
+    return site, crawled_at
+
+
+class Crawl:
+    __slots__ = ('id', 'site', 'crawled_at', 'source', 'sha256', 'row_start', 'rows')
+
+    def __init__(self, id, site, crawled_at, source, sha256, row_start, rows, **extra):
+        self.id = id
+        self.site = site
+        self.crawled_at = crawled_at
+        self.source = source
+        self.sha256 = sha256
+        self.row_start = row_start
+        self.rows = rows
+
+    @property
+    def slice(self):
+        return slice(self.row_start, self.row_start + self.rows)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+@contextmanager
+def _exclusive_lock(path):
+    """Hold an exclusive, cross-process lock on the file ``path`` for the with-block."""
+    with open(path, 'a+b') as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            yield
+            return
+        f.seek(0)
+        while True:
+            try:
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                break
+            except OSError:
+                # LK_LOCK gives up after ten seconds; keep waiting, as flock does
+                continue
+        try:
+            yield
+        finally:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _read_jsonl(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class CrawlStore:
+    def __init__(self, directory=DEFAULT_STORE_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        meta_path = os.path.join(directory, 'meta.json')
+        meta = {'version': FORMAT_VERSION, 'numeric': list(NUMERIC_COLUMNS), 'text': list(TEXT_COLUMNS)}
+        if os.path.exists(meta_path):
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+            if stored != meta:
+                raise ValueError(f"{directory} was written with a different store format; "
+                                 f"start a new store or rebuild it from the exports")
+        else:
+            with open(meta_path, 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+        self._numeric = {name: n for n, name in enumerate(NUMERIC_COLUMNS)}
+        self._text = {name: n for n, name in enumerate(TEXT_COLUMNS)}
+        self.refresh()
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def refresh(self):
+        """Re-read the committed crawls (another process may have appended)."""
+        self.crawls = [Crawl(**entry) for entry in _read_jsonl(self._path('crawls.jsonl'))]
+        self.summaries = _read_jsonl(self._path('summaries.jsonl'))
+        self.rows = sum(crawl.rows for crawl in self.crawls)
+
+    @property
+    def sites(self):
+        return sorted({crawl.site for crawl in self.crawls})
+
+    # Appending
+
+    def _truncate_uncommitted(self):
+        # Drop anything a crashed append wrote past the last committed crawl
+        rows = self.rows
+        for n in range(len(NUMERIC_COLUMNS)):
+            self._truncate(self._path(f"{n}.f8"), rows * 8)
+        self._truncate(self._path('kind.u1'), rows)
+        for n in range(len(TEXT_COLUMNS)):
+            offsets_path = self._path(f"{n}.off")
+            self._truncate(offsets_path, (rows + 1) * 8)
+            end = 0
+            if rows and os.path.getsize(offsets_path) >= (rows + 1) * 8:
+                with open(offsets_path, 'rb') as f:
+                    f.seek(rows * 8)
+                    end = array('q', f.read(8))[0]
+            self._truncate(self._path(f"{n}.dat"), end)
+            if os.path.getsize(offsets_path) == 0:
+                with open(offsets_path, 'wb') as f:
+                    array('q', [0]).tofile(f)
+
+    @staticmethod
+    def _truncate(path, size):
+        with open(path, 'ab') as f:
+            if f.tell() > size:
+                f.truncate(size)
+
+    def append_csv(self, path, site=None, crawled_at=None, tool=None, summary=None):
+        """Store the export at ``path`` (once per site and content) and optionally a tool's summary of it.
+
+        Returns the Crawl.
+        """
+        sha = crawl_cache.file_hash(path)
+        detected_site, detected_at = crawl_identity(path)
+        site = site or detected_site
+        crawled_at = crawled_at or detected_at
+
+        with _exclusive_lock(self._path('.lock')):
+            self.refresh()
+            crawl = next((c for c in self.crawls if c.site == site and c.sha256 == sha), None)
+            if crawl is None:
+                crawl = self._append_rows(path, site, crawled_at, sha)
+            if summary is not None:
+                entry = {'crawl': crawl.id, 'tool': tool, 'recorded_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+                         'summary': summary}
+                with open(self._path('summaries.jsonl'), 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+                self.summaries.append(entry)
+        return crawl
+
+    def _append_rows(self, path, site, crawled_at, sha):
+        self._truncate_uncommitted()
+        numeric = [array('d') for _ in NUMERIC_COLUMNS]
+        text = [[] for _ in TEXT_COLUMNS]
+        kinds = bytearray()
+        with lazy_csv.LazyCSV(path) as export:
+            for record in export.records(list(NUMERIC_COLUMNS + TEXT_COLUMNS)):
+                for values, name in zip(numeric, NUMERIC_COLUMNS):
+                    values.append(_number(record.get(name, '')))
+                for values, name in zip(text, TEXT_COLUMNS):
+                    values.append(record.get(name, ''))
+                kinds.append(KINDS[classify(record.get('Content Type', ''), record.get('Status Code', ''))])
+        rows = len(kinds)
+
+        for n, values in enumerate(numeric):
+            with open(self._path(f"{n}.f8"), 'ab') as f:
+                values.tofile(f)
+        with open(self._path('kind.u1'), 'ab') as f:
+            f.write(kinds)
+        for n, values in enumerate(text):
+            with open(self._path(f"{n}.off"), 'rb') as f:
+                f.seek(-8, os.SEEK_END)
+                position = array('q', f.read(8))[0]
+            offsets = array('q')
+            with open(self._path(f"{n}.dat"), 'ab') as f:
+                for value in values:
+                    encoded = value.encode('utf-8')
+                    f.write(encoded)
+                    position += len(encoded)
+                    offsets.append(position)
+            with open(self._path(f"{n}.off"), 'ab') as f:
+                offsets.tofile(f)
+
+        crawl = Crawl(len(self.crawls), site, crawled_at, os.path.abspath(path), sha, self.rows, rows)
+        for name in os.listdir(self.directory):
+            if name.endswith(('.f8', '.u1', '.off', '.dat')):
+                with open(self._path(name), 'rb') as f:
+                    os.fsync(f.fileno())
+        # The commit point: until this line exists the rows above are ignored
+        with open(self._path('crawls.jsonl'), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(crawl.to_dict(), ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        self.crawls.append(crawl)
+        self.rows += rows
+        return crawl
+
+    # Reading
+
+    def _map(self, name, dtype, count):
+        if count == 0:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(self._path(name), dtype=dtype, mode='r', shape=(count,))
+
+    def column(self, name):
+        """A numeric column over every committed row, memory-mapped (float64, NaN = empty)."""
+        if name not in self._numeric:
+            raise KeyError(f"{name!r} is not a stored numeric column (one of {', '.join(NUMERIC_COLUMNS)})")
+        return self._map(f"{self._numeric[name]}.f8", '<f8', self.rows)
+
+    def kinds(self):
+        return self._map('kind.u1', np.uint8, self.rows)
+
+    def text(self, name, crawl):
+        """The values of text column ``name`` for one crawl's rows."""
+        n = self._text[name]
+        offsets = self._map(f"{n}.off", '<i8', self.rows + 1)[crawl.row_start:crawl.row_start + crawl.rows + 1]
+        with open(self._path(f"{n}.dat"), 'rb') as f:
+            f.seek(int(offsets[0]))
+            data = f.read(int(offsets[-1] - offsets[0]))
+        bounds = (offsets - offsets[0]).tolist()
+        return [data[bounds[i]:bounds[i + 1]].decode('utf-8') for i in range(crawl.rows)]
+
+    def select(self, sites=None, last=None, since=None):
+        """Committed crawls, oldest first; ``last`` keeps each site's most recent N."""
+        crawls = [crawl for crawl in self.crawls
+                  if (sites is None or crawl.site in sites) and (since is None or crawl.crawled_at >= since)]
+        crawls.sort(key=lambda crawl: (crawl.site, crawl.crawled_at, crawl.id))
+        if last is not None:
+            per_site = {}
+            for crawl in crawls:
+                per_site.setdefault(crawl.site, []).append(crawl)
+            crawls = [crawl for group in per_site.values() for crawl in group[-last:]]
+        return crawls
+
+
+# Queries
+
+def distribution(store, column, bins, sites=None, last=None, kinds=('html',)):
+    """Histogram and percentiles of ``column`` for each selected crawl.
+
+    Only rows of ``kinds`` (analyze_seo.classify buckets) with a value are
+    counted.  Each crawl is one contiguous slice of the memory-mapped
+    column, so this is a handful of NumPy calls per crawl.
+    """
+    values = store.column(column)
+    row_kinds = store.kinds()
+    codes = [KINDS[kind] for kind in kinds] if kinds else None
+    result = []
+    for crawl in store.select(sites, last):
+        part = values[crawl.slice]
+        keep = ~np.isnan(part)
+        if codes is not None:
+            keep &= np.isin(row_kinds[crawl.slice], codes)
+        part = part[keep]
+        counts, edges = np.histogram(part, bins=bins)
+        entry = {'site': crawl.site, 'crawled_at': crawl.crawled_at, 'crawl': crawl.id,
+                 'rows': int(part.size), 'counts': counts.tolist(),
+                 'below': int((part < edges[0]).sum()), 'above': int((part > edges[-1]).sum())}
+        if part.size:
+            p50, p90 = np.percentile(part, [50, 90])
+            entry.update(mean=round(float(part.mean()), 3), p50=float(p50), p90=float(p90))
+        result.append(entry)
+    return {'column': column, 'bins': [float(edge) for edge in edges] if result else list(bins), 'crawls': result}
+
+
+def trend(store, metric, tool=None, sites=None, last=None):
+    """One executive-summary metric per crawl, from the summaries the audits recorded."""
+    latest = {}
+    for entry in store.summaries:
+        if (tool is None or entry['tool'] == tool) and metric in entry['summary']:
+            latest[entry['crawl']] = entry
+    return [
+        {'site': crawl.site, 'crawled_at': crawl.crawled_at, 'crawl': crawl.id,
+         'tool': latest[crawl.id]['tool'], 'value': latest[crawl.id]['summary'][metric]}
+        for crawl in store.select(sites, last) if crawl.id in latest
+    ]
+
+
+def _print_distribution(report):
+    edges = report['bins']
+    labels = [f"{edges[n]:g}-{edges[n + 1]:g}" for n in range(len(edges) - 1)]
+    print(f"{report['column']} distribution")
+    print(f"{'site':<32} {'crawled at':<20} {'rows':>7} {'p50':>7} {'p90':>7}  " + ' '.join(f"{label:>9}" for label in labels))
+    for entry in report['crawls']:
+        print(f"{entry['site'][:32]:<32} {entry['crawled_at'][:19]:<20} {entry['rows']:>7} "
+              f"{entry.get('p50', float('nan')):>7.1f} {entry.get('p90', float('nan')):>7.1f}  "
+              + ' '.join(f"{count:>9}" for count in entry['counts']))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Append crawls to a shared columnar store and query it.")
+    parser.add_argument('store', help="store directory (created on first use)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    add = commands.add_parser('add', help="append crawl exports")
+    add.add_argument('exports', nargs='+')
+    add.add_argument('--site', help="site name (default: the export's most common host)")
+
+    commands.add_parser('crawls', help="list the stored crawls")
+
+    dist = commands.add_parser('distribution', help="histogram of a numeric column per crawl")
+    dist.add_argument('column', help=f"one of: {', '.join(NUMERIC_COLUMNS)}")
+    dist.add_argument('--bins', type=float, nargs='+', default=[0, 30, 45, 60, 70, 1000],
+                      help="bin edges (default: %(default)s)")
+    dist.add_argument('--all-kinds', action='store_true', help="count every row, not only HTML pages")
+
+    metric = commands.add_parser('trend', help="an executive-summary metric per crawl")
+    metric.add_argument('metric', help="an executive-summary key, e.g. duplicate_titles or 'Missing H1 Tags'")
+    metric.add_argument('--tool', help="only summaries from this script (analyze_seo, seo_audit_analysis)")
+
+    for command in (dist, metric):
+        command.add_argument('--sites', nargs='+', help="only these sites (default: all)")
+        command.add_argument('--last', type=int, help="only each site's N most recent crawls")
+        command.add_argument('--json', action='store_true', help="print JSON instead of a table")
+    args = parser.parse_args(argv)
+
+    store = CrawlStore(args.store)
+    if args.command == 'add':
+        for path in args.exports:
+            crawl = store.append_csv(path, site=args.site)
+            print(f"{path}: crawl {crawl.id} ({crawl.site}, {crawl.crawled_at}, {crawl.rows} rows)")
+    elif args.command == 'crawls':
+        for crawl in store.select():
+            tools = sorted({entry['tool'] for entry in store.summaries if entry['crawl'] == crawl.id and entry['tool']})
+            print(f"{crawl.id:>5}  {crawl.site:<32} {crawl.crawled_at:<20} {crawl.rows:>9} rows  "
+                  f"{', '.join(tools) or '-'}")
+    elif args.command == 'distribution':
+        report = distribution(store, args.column, args.bins, args.sites, args.last,
+                              None if args.all_kinds else ('html',))
+        if args.json:
+            print(json.dumps(report, indent=2))
+        else:
+            _print_distribution(report)
+    elif args.command == 'trend':
+        rows = trend(store, args.metric, args.tool, args.sites, args.last)
+        if args.json:
+            print(json.dumps(rows, indent=2))
+        else:
+            for row in rows:
+                print(f"{row['site']:<32} {row['crawled_at']:<20} {row['tool']:<20} {row['value']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
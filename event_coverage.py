@@ -0,0 +1,545 @@
+"""
+GA4 event coverage: which events each page can send, read from src/.
+
+Every .astro/.tsx/.ts/.jsx/.js file under src/ is scanned for
+
+  - gtag('event', 'name', ...) and window.gtag(...) calls;
+  - dataLayer.push({event: 'name', ...});
+  - gtag('config', ...), which sends page_view itself unless its
+    parameters say send_page_view: false;
+  - calls to functions imported from other files (the trackX helpers in
+    src/utils/analytics.ts);
+  - its imports, and which exported function each of the above sits in.
+
+Imports are then resolved ('@/' is src/, as in tsconfig.json) and each page
+in src/pages is credited with the events of everything it renders: the
+layout, components, the components those render, and the helpers they
+call, each at the line that calls it.  Importing { trackPhoneCall } credits
+only phone_click, not the whole of analytics.ts.
+
+The report flags
+
+  - duplicated events: a page that sends page_view explicitly while
+    gtag('config') already sends it (every view counted twice), and the
+    same event sent with identical arguments from several places in one
+    file, which GA4 cannot tell apart;
+  - missing events: pages without the --require events, helpers that are
+    never called, and events in the quick reference table that nothing
+    sends (or sent but not documented there).
+
+Files are scanned in parallel and the results cached per file by mtime and
+size, so a re-run only rescans what changed.
+
+Usage:
+    python event_coverage.py
+    python event_coverage.py src/ --require page_view,phone_click --csv event_matrix.csv
+    python event_coverage.py --no-cache -j 4 -o event_coverage_report.json
+"""
+
+import argparse
+import bisect
+import csv
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+SOURCE_EXTENSIONS = ('.astro', '.tsx', '.ts', '.jsx', '.js')
+PAGE_EXTENSIONS = ('.astro', '.md', '.mdx')
+DEFAULT_CACHE = '.event_coverage_cache.json'
+DEFAULT_REFERENCE = 'GA4_EVENTS_QUICK_REFERENCE_TABLE.md'
+DEFAULT_REQUIRED = ('page_view', 'phone_click')
+CACHE_VERSION = 1
+# Below this many files to scan, starting worker processes costs more than it saves
+MIN_PARALLEL = 32
+
+_GTAG = re.compile(r"""gtag\(\s*(['"])(event|config)\1\s*,\s*(['"])([^'"\\\n]+)\3""")
+_DATALAYER = re.compile(r"""dataLayer\.push\(\s*\{\s*['"]?event['"]?\s*:\s*(['"])([^'"\\\n]+)\1""")
+_NO_PAGE_VIEW = re.compile(r"""['"]?send_page_view['"]?\s*:\s*false""")
+_IMPORT = re.compile(r"""^\s*import\s+(?!type\b)([^;'"]*?)\s*from\s*(['"])([^'"\n]+)\2""", re.M)
+_SIDE_EFFECT_IMPORT = re.compile(r"""^\s*import\s*(['"])([^'"\n]+)\1""", re.M)
+_EXPORT = re.compile(r"""^export\s+(?:default\s+)?(?:async\s+)?(?:function\s*\*?\s*|(?:const|let|var)\s+)"""
+                     r"""([A-Za-z_$][\w$]*)""", re.M)
+_IDENTIFIER = re.compile(r"[A-Za-z_$][\w$]*")
+_DEFINITION = re.compile(r"\b(?:function\s*\*?|const|let|var)\s+$")
+# Patterns start with a literal so the regex engine can skip ahead to candidates
+_COMMENT = re.compile(r"""/\*.*?\*/|<!--.*?-->|//[^\n]*""", re.S)
+_REFERENCE_ROW = re.compile(r"^\|\s*\*\*([a-z0-9_]+)\*\*\s*\|\s*([^|]*?)\s*\|", re.M)
+
+
+def _blank(match):
+    text = match.group(0)
+    # '//' after ':' or inside a string is a URL, not a comment
+    if text.startswith('//') and match.start():
+        before = match.string[match.start() - 1]
+        if before in ':\'"\\_' or before.isalnum():
+            return text
+    # Keep newlines so line numbers still line up
+    return re.sub(r"[^\n]", ' ', text)
+
+
+def _call_args(text, start):
+    """The argument text of the call whose '(' is at ``start``, whitespace collapsed."""
+    depth = 0
+    quote = None
+    i = start
+    while i < len(text):
+        char = text[i]
+        if quote:
+            if char == '\\':
+                i += 1
+            elif char == quote:
+                quote = None
+        elif char in '\'"`':
+            quote = char
+        elif char in '([{':
+            depth += 1
+        elif char in ')]}':
+            depth -= 1
+            if not depth:
+                return ' '.join(text[start + 1:i].split())
+        i += 1
+    return ' '.join(text[start + 1:].split())
+
+
+def _import_names(clause):
+    """[(imported, local)] for an import clause: 'X', '{ a, b as c }', '* as ns', 'X, { a }'."""
+    names = []
+    named = re.search(r"\{([^}]*)\}", clause)
+    if named:
+        for part in named.group(1).split(','):
+            part = part.strip()
+            if not part or part.startswith('type '):
+                continue
+            imported, _, local = part.partition(' as ')
+            names.append((imported.strip(), (local or imported).strip()))
+        clause = clause[:named.start()] + clause[named.end():]
+    namespace = re.search(r"\*\s*as\s+([A-Za-z_$][\w$]*)", clause)
+    if namespace:
+        names.append(('*', namespace.group(1)))
+        clause = clause[:namespace.start()] + clause[namespace.end():]
+    default = clause.strip().strip(',').strip()
+    if default and _IDENTIFIER.fullmatch(default):
+        names.append(('default', default))
+    return names
+
+
+def scan_file(path):
+    """Events, helper calls, imports and export scopes of one source file."""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        text = _COMMENT.sub(_blank, f.read())
+    newlines = [match.start() for match in re.finditer('\n', text)]
+
+    def line(offset):
+        return bisect.bisect_left(newlines, offset) + 1
+
+    # Code after 'export function X' up to the next export belongs to X
+    exports = [(match.start(), match.group(1)) for match in _EXPORT.finditer(text)]
+    starts = [offset for offset, _ in exports]
+
+    def scope(offset):
+        n = bisect.bisect_right(starts, offset)
+        return exports[n - 1][1] if n else None
+
+    imports = []
+    for match in _IMPORT.finditer(text):
+        names = _import_names(match.group(1))
+        if names:
+            imports.append({'from': match.group(3), 'names': names, 'line': line(match.start(3))})
+    for match in _SIDE_EFFECT_IMPORT.finditer(text):
+        imports.append({'from': match.group(2), 'names': [], 'line': line(match.start(2))})
+
+    events = []
+    for match in _GTAG.finditer(text):
+        args = _call_args(text, match.start() + 4)
+        if match.group(2) == 'event':
+            events.append([match.group(4), line(match.start()), 'gtag', args, scope(match.start())])
+        elif not _NO_PAGE_VIEW.search(args):
+            events.append(['page_view', line(match.start()), 'config', args, scope(match.start())])
+    for match in _DATALAYER.finditer(text):
+        events.append([match.group(2), line(match.start()), 'dataLayer',
+                       _call_args(text, match.start() + match.group(0).index('(')),
+                       scope(match.start())])
+
+    # Calls and references to imported names, and to this file's own exports
+    calls = []
+    refs = defaultdict(set)
+    tracked = {local for entry in imports for _, local in entry['names']} | {name for _, name in exports}
+    pattern = re.compile(r"(?<![\w$.])(?:%s)(?![\w$])" % '|'.join(map(re.escape, sorted(tracked))))
+    for match in pattern.finditer(text) if tracked else ():
+        name = match.group(0)
+        if _DEFINITION.search(text, max(0, match.start() - 16), match.start()):
+            continue
+        where = scope(match.start())
+        refs[where or ''].add(name)
+        rest = match.end()
+        while rest < len(text) and text[rest] in ' \t':
+            rest += 1
+        if rest < len(text) and text[rest] == '(':
+            calls.append([name, line(match.start()), _call_args(text, rest), where])
+
+    return {
+        'exports': [name for _, name in exports],
+        'imports': imports,
+        'events': events,
+        'calls': calls,
+        'refs': {name: sorted(found) for name, found in refs.items()},
+    }
+
+
+def find_sources(src):
+    paths = []
+    for root, dirs, files in os.walk(src):
+        dirs[:] = sorted(d for d in dirs if d not in ('node_modules', '.astro'))
+        paths.extend(os.path.join(root, name) for name in sorted(files) if name.endswith(SOURCE_EXTENSIONS))
+    return paths
+
+
+def load_cache(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except FileNotFoundError:
+        return {}
+    return cache['files'] if cache.get('version') == CACHE_VERSION else {}
+
+
+def save_cache(path, files):
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({'version': CACHE_VERSION, 'files': files}, f)
+    os.replace(tmp, path)
+
+
+def scan_sources(src, workers=None, cache=None):
+    """{path: scan_file result} for every source file, and how many were scanned this run.
+
+    ``cache`` maps path -> {'mtime_ns', 'size', 'scan'} and is updated in place;
+    a file whose mtime and size are unchanged is not read again.
+    """
+    scans = {}
+    todo = []
+    for path in find_sources(src):
+        stat = os.stat(path)
+        entry = cache.get(path) if cache is not None else None
+        if entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            scans[path] = entry['scan']
+        else:
+            todo.append((path, stat))
+    if len(todo) >= MIN_PARALLEL and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(scan_file, [path for path, _ in todo],
+                                    chunksize=max(1, len(todo) // (4 * (workers or os.cpu_count() or 1)))))
+    else:
+        results = [scan_file(path) for path, _ in todo]
+    for (path, stat), scan in zip(todo, results):
+        scans[path] = scan
+        if cache is not None:
+            cache[path] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'scan': scan}
+    if cache is not None:
+        for path in [path for path in cache if path not in scans]:
+            del cache[path]
+    return scans, len(todo)
+
+
+def resolve_import(specifier, importer, src, known):
+    """The scanned file an import specifier refers to, or None for packages and assets."""
+    if specifier.startswith('@/'):
+        base = os.path.join(src, specifier[2:])
+    elif specifier.startswith('.'):
+        base = os.path.join(os.path.dirname(importer), specifier)
+    else:
+        return None
+    base = os.path.normpath(base)
+    for candidate in [base] + [base + ext for ext in SOURCE_EXTENSIONS] + \
+            [os.path.join(base, 'index' + ext) for ext in SOURCE_EXTENSIONS]:
+        if candidate in known:
+            return candidate
+    return None
+
+
+class Coverage:
+    """Resolves which events reach a file, or one exported function of it, through its imports."""
+
+    def __init__(self, scans, src):
+        self.scans = scans
+        self.memo = {}
+        self.bindings = {}
+        self.side_effects = {}
+        for path, scan in scans.items():
+            bound = {name: (path, name) for name in scan['exports']}
+            side_effects = []
+            for entry in scan['imports']:
+                target = resolve_import(entry['from'], path, src, scans)
+                if target is None:
+                    continue
+                if not entry['names']:
+                    side_effects.append(target)
+                for imported, local in entry['names']:
+                    # Named imports of an exported function narrow to that function
+                    bound[local] = (target, imported if imported in scans[target]['exports'] else None)
+            self.bindings[path] = bound
+            self.side_effects[path] = side_effects
+
+    def events(self, path, scope=None):
+        return list(dict.fromkeys(site[0] for site in self.sites(path, scope)))
+
+    def sites(self, path, scope=None):
+        """[(event, file, line, via, args)] sent by ``path`` (or its export ``scope``) and what it uses.
+
+        ``via`` is 'gtag', 'dataLayer' or 'config' for direct sends, otherwise
+        the name of the function called at that line.
+        """
+        key = (path, scope)
+        if key in self.memo:
+            return self.memo[key]
+        self.memo[key] = []  # import cycles contribute nothing the second time round
+        scan = self.scans[path]
+        found = []
+        seen = set()
+        for event, line, via, args, where in scan['events']:
+            if scope is not None and where != scope:
+                continue
+            # A helper's gtag call and its dataLayer fallback are one send
+            if (event, where) in seen and via == 'dataLayer':
+                continue
+            seen.add((event, where))
+            found.append((event, path, line, via, args))
+
+        bound = self.bindings[path]
+
+        def target(name):
+            # The whole file already includes its own exports
+            resolved = bound.get(name)
+            return None if resolved is None or (scope is None and resolved[0] == path) else resolved
+
+        called = set()
+        for name, line, args, where in scan['calls']:
+            if (scope is not None and where != scope) or target(name) is None:
+                continue
+            called.add(name)
+            for event in self.events(*target(name)):
+                found.append((event, path, line, name, args))
+        names = scan['refs'].get(scope, []) if scope is not None else \
+            sorted({name for scoped in scan['refs'].values() for name in scoped})
+        for name in names:
+            if name not in called and target(name) is not None:
+                found.extend(self.sites(*target(name)))
+        if scope is None:
+            for side_effect in self.side_effects[path]:
+                found.extend(self.sites(side_effect))
+
+        self.memo[key] = found
+        return found
+
+
+def page_route(path, pages_dir):
+    route = os.path.splitext(os.path.relpath(path, pages_dir))[0].replace(os.sep, '/')
+    if route == 'index' or route.endswith('/index'):
+        route = route[:-len('index')]
+    return '/' + route.rstrip('/') if route else '/'
+
+
+def reference_events(path):
+    """{event: type} from the quick reference table's '| **name** | Type |' rows.
+
+    Later tables in the file repeat event names with other columns; the first row wins.
+    """
+    events = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for match in _REFERENCE_ROW.finditer(f.read()):
+            events.setdefault(match.group(1), match.group(2))
+    return events
+
+
+def analyze(src, workers=None, cache=None, required=DEFAULT_REQUIRED, reference=None):
+    """Scan ``src`` and return the coverage report dict.
+
+    ``reference`` is {event: type} from reference_events; events typed
+    'Auto' there are sent by GA4 itself and not expected in the code.
+    """
+    started = time.perf_counter()
+    src = os.path.normpath(src)
+    scans, scanned = scan_sources(src, workers, cache)
+    coverage = Coverage(scans, src)
+    pages_dir = os.path.join(src, 'pages')
+
+    matrix = {}
+    page_sites = {}
+    for path in sorted(scans):
+        if not path.startswith(pages_dir + os.sep) or not path.endswith(PAGE_EXTENSIONS):
+            continue
+        route = page_route(path, pages_dir)
+        sites = list(dict.fromkeys(coverage.sites(path)))
+        page_sites[route] = sites
+        matrix[route] = dict(sorted(Counter(site[0] for site in sites).items()))
+
+    # Every place an event is sent from: direct sends, and each call of a function that sends it
+    events = defaultdict(set)
+    by_call = defaultdict(list)
+    for path, scan in scans.items():
+        name = os.path.relpath(path, src)
+        for event, line, via, args, _ in scan['events']:
+            events[event].add((name, line))
+            if via == 'gtag':
+                by_call[(name, event, args)].append(line)
+        for called, line, args, _ in scan['calls']:
+            for event in coverage.events(*coverage.bindings[path][called]) if called in coverage.bindings[path] else ():
+                events[event].add((name, line))
+                by_call[(name, event, f"{called}({args})")].append(line)
+
+    # Helpers are exported functions that send an event themselves or through one beside them
+    direct = {(path, where) for path, scan in scans.items() for *_, where in scan['events'] if where}
+    helpers = set(direct)
+    for path, scan in scans.items():
+        for called, _, _, where in scan['calls']:
+            if where and coverage.bindings[path].get(called) in direct:
+                helpers.add((path, where))
+    used = set()
+    for path, scan in scans.items():
+        for where, names in scan['refs'].items():
+            for name in names:
+                if name in coverage.bindings[path] and coverage.bindings[path][name] != (path, where):
+                    used.add(coverage.bindings[path][name])
+    unused_helpers = [{'file': os.path.relpath(path, src), 'helper': name, 'events': coverage.events(path, name)}
+                      for path, name in sorted(helpers - used)]
+
+    fired = {event for row in matrix.values() for event in row}
+    duplicates = []
+    for route, sites in page_sites.items():
+        vias = Counter(site[3] == 'config' for site in sites if site[0] == 'page_view')
+        if vias[True] and vias[False]:
+            duplicates.append({
+                'type': 'double_page_view',
+                'page': route,
+                'event': 'page_view',
+                'sites': sorted({f"{os.path.relpath(path, src)}:{line} ({via})"
+                                 for event, path, line, via, _ in sites if event == 'page_view'}),
+            })
+    for (name, event, call), lines in sorted(by_call.items()):
+        if len(lines) > 1:
+            duplicates.append({
+                'type': 'indistinguishable',
+                'file': name,
+                'event': event,
+                'call': call,
+                'lines': sorted(lines),
+            })
+
+    missing_on_pages = {route: [event for event in required if event not in row]
+                        for route, row in matrix.items()}
+    missing = {
+        'pages_without_required': {route: events_ for route, events_ in missing_on_pages.items() if events_},
+        'unused_helpers': unused_helpers,
+    }
+    if reference is not None:
+        expected = {event for event, kind in reference.items() if kind.lower() != 'auto'}
+        missing['documented_not_sent'] = sorted(expected - fired)
+        missing['sent_not_documented'] = sorted(fired - set(reference))
+
+    all_events = sorted(fired | ({event for event, kind in reference.items() if kind.lower() != 'auto'}
+                                 if reference else set()))
+    return {
+        'summary': {
+            'files': len(scans),
+            'scanned': scanned,
+            'pages': len(matrix),
+            'events': len(fired),
+            'duplicates': len(duplicates),
+            'pages_without_required': len(missing['pages_without_required']),
+            'unused_helpers': len(unused_helpers),
+            'seconds': round(time.perf_counter() - started, 3),
+        },
+        'events': {event: {
+            'pages': sum(1 for row in matrix.values() if event in row),
+            'sites': [f"{name}:{line}" for name, line in sorted(events.get(event, ()))],
+        } for event in all_events},
+        'matrix': matrix,
+        'duplicates': duplicates,
+        'missing': missing,
+    }
+
+
+def write_matrix_csv(report, path):
+    events = list(report['events'])
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['page'] + events)
+        for route, row in report['matrix'].items():
+            writer.writerow([route] + [row.get(event, 0) for event in events])
+
+
+def print_report(report, limit=20):
+    summary = report['summary']
+    print(f"Files: {summary['files']} ({summary['scanned']} scanned this run) in {summary['seconds']}s")
+    print(f"Pages: {summary['pages']}")
+    print(f"\n{'pages':>6} {'sites':>6}  event")
+    for event, info in report['events'].items():
+        print(f"{info['pages']:>6} {len(info['sites']):>6}  {event}")
+
+    if report['duplicates']:
+        print(f"\nDuplicated events: {len(report['duplicates'])}")
+        for entry in report['duplicates'][:limit]:
+            if entry['type'] == 'double_page_view':
+                print(f"  {entry['page']}: page_view sent by gtag('config') and again by "
+                      + ', '.join(site for site in entry['sites'] if '(config)' not in site))
+            else:
+                print(f"  {entry['file']} lines {', '.join(map(str, entry['lines']))}: "
+                      f"{entry['event']} from identical {entry['call']}")
+        if len(report['duplicates']) > limit:
+            print(f"  ... {len(report['duplicates']) - limit} more in the report")
+
+    missing = report['missing']
+    if missing['pages_without_required']:
+        print(f"\nPages missing required events: {len(missing['pages_without_required'])}")
+        for route, events in list(missing['pages_without_required'].items())[:limit]:
+            print(f"  {route}: {', '.join(events)}")
+    for helper in missing['unused_helpers']:
+        print(f"Never called: {helper['helper']} ({', '.join(helper['events'])}) in {helper['file']}")
+    if missing.get('documented_not_sent'):
+        print(f"Documented but never sent: {', '.join(missing['documented_not_sent'])}")
+    if missing.get('sent_not_documented'):
+        print(f"Sent but not documented: {', '.join(missing['sent_not_documented'])}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Map which GA4 events each page in src/ can send.")
+    parser.add_argument('src', nargs='?', default='src', help="source directory (default: %(default)s)")
+    parser.add_argument('--require', default=','.join(DEFAULT_REQUIRED),
+                        help="comma-separated events every page should send (default: %(default)s)")
+    parser.add_argument('--reference', default=DEFAULT_REFERENCE,
+                        help="markdown table of documented events to compare against, "
+                             "skipped if absent (default: %(default)s)")
+    parser.add_argument('--cache', default=DEFAULT_CACHE,
+                        help="per-file scan cache (default: %(default)s)")
+    parser.add_argument('--no-cache', action='store_true', help="rescan every file")
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help="worker processes (default: one per CPU)")
+    parser.add_argument('--csv', metavar='PATH', help="also write the page x event matrix as CSV")
+    parser.add_argument('-o', '--output', default='event_coverage_report.json',
+                        help="where to write the JSON report (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.src):
+        parser.error(f"{args.src} is not a directory")
+    required = tuple(event.strip() for event in args.require.split(',') if event.strip())
+    reference = reference_events(args.reference) if os.path.exists(args.reference) else None
+
+    cache = None if args.no_cache else load_cache(args.cache)
+    report = analyze(args.src, args.workers, cache, required, reference)
+    if cache is not None:
+        save_cache(args.cache, cache)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    if args.csv:
+        write_matrix_csv(report, args.csv)
+    print_report(report)
+    print(f"\nReport saved to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,253 @@
+"""
+Keyword cannibalization: which URLs compete for the same search terms.
+
+Every page is reduced to a sparse vector of weighted terms taken from the
+fields that signal what it targets:
+
+    Title 1          weight 3   word bigrams and trigrams
+    H1-1             weight 2   word bigrams and trigrams
+    H2-1, H2-2       weight 1   word bigrams and trigrams
+    Meta Keywords 1  weight 1   each comma-separated phrase as one term
+
+Words are interned to integer ids and terms (tuples of word ids) to term
+ids, so a phrase repeated on 100,000 pages is stored once; each page keeps
+only two parallel arrays of term ids and weights, and each term an array
+of the pages carrying it (the inverted index).  N-grams starting or ending
+with a stop word ("services in", "in glasgow") are skipped.
+
+Pages are compared through the inverted index, so only pages sharing a
+term are ever scored.  Terms on more than ``max_pages`` pages (brand names,
+a keyword list pasted into every template) would make that quadratic; they
+are left out of the scoring and reported as site-wide terms instead.  Pages
+whose cosine similarity reaches ``threshold`` are joined into clusters.
+"""
+
+import re
+from array import array
+from bisect import bisect_right
+from collections import defaultdict
+from math import sqrt
+
+_WORD = re.compile(r"\w+")
+
+FIELD_WEIGHTS = {
+    'Title 1': 3.0,
+    'H1-1': 2.0,
+    'H2-1': 1.0,
+    'H2-2': 1.0,
+}
+KEYWORD_FIELD = 'Meta Keywords 1'
+KEYWORD_WEIGHT = 1.0
+# A term in the title or H1 of two pages means they target it directly
+STRONG_WEIGHT = 2.0
+NGRAM_SIZES = (2, 3)
+
+STOP_WORDS = frozenset("""
+a an and are as at be by for from how in into is it its of on or our the their this to we with you your
+""".split())
+
+
+def phrases(text, sizes=NGRAM_SIZES):
+    """The lower-cased word n-grams of ``text`` that neither start nor end with a stop word."""
+    words = _WORD.findall(text.lower())
+    found = []
+    for size in sizes:
+        for i in range(len(words) - size + 1):
+            if words[i] in STOP_WORDS or words[i + size - 1] in STOP_WORDS:
+                continue
+            found.append(' '.join(words[i:i + size]))
+    return found
+
+
+def keyword_phrases(text):
+    """The comma-separated phrases of a meta keywords value, normalised."""
+    found = []
+    for phrase in text.lower().split(','):
+        words = _WORD.findall(phrase)
+        if words:
+            found.append(' '.join(words))
+    return found
+
+
+def page_terms(page):
+    """{term: weight} for one crawl row; a term's weight sums over the fields it appears in."""
+    terms = {}
+    for field, weight in FIELD_WEIGHTS.items():
+        text = page.get(field, '')
+        if text:
+            # Count a term once per field however often the field repeats it
+            for term in dict.fromkeys(phrases(text)):
+                terms[term] = terms.get(term, 0.0) + weight
+    keywords = page.get(KEYWORD_FIELD, '')
+    if keywords:
+        for term in dict.fromkeys(keyword_phrases(keywords)):
+            terms[term] = terms.get(term, 0.0) + KEYWORD_WEIGHT
+    return terms
+
+
+class KeywordIndex:
+    """Add each page's {term: weight}, then ask for contested terms and clusters."""
+
+    def __init__(self, threshold=0.5, max_pages=200):
+        self.threshold = threshold
+        self.max_pages = max_pages
+        self.words = {}
+        self.word_list = []
+        self.term_ids = {}
+        self.term_words = []
+        self.urls = []
+        self.page_terms = []
+        self.page_weights = []
+        self.norms = array('d')
+        self.postings = []  # term id -> array('I') of page ids
+        self.posting_weights = []  # term id -> array('d'), parallel to postings
+
+    def _term(self, term):
+        term_id = self.term_ids.get(term)
+        if term_id is None:
+            words = self.words
+            ids = []
+            for word in term.split(' '):
+                word_id = words.get(word)
+                if word_id is None:
+                    word_id = words[word] = len(self.word_list)
+                    self.word_list.append(word)
+                ids.append(word_id)
+            term_id = self.term_ids[term] = len(self.term_words)
+            self.term_words.append(tuple(ids))
+            self.postings.append(array('I'))
+            self.posting_weights.append(array('d'))
+        return term_id
+
+    def term(self, term_id):
+        return ' '.join(self.word_list[word] for word in self.term_words[term_id])
+
+    def add(self, url, terms):
+        """Index one page's {term: weight}."""
+        page = len(self.urls)
+        self.urls.append(url)
+        ids = array('I')
+        weights = array('d')
+        for term, weight in terms.items():
+            term_id = self._term(term)
+            ids.append(term_id)
+            weights.append(weight)
+            self.postings[term_id].append(page)
+            self.posting_weights[term_id].append(weight)
+        self.page_terms.append(ids)
+        self.page_weights.append(weights)
+        self.norms.append(sqrt(sum(weight * weight for weight in weights)))
+
+    def add_page(self, page, url_field='Address'):
+        self.add(page.get(url_field, ''), page_terms(page))
+
+    def contested_terms(self, strong=STRONG_WEIGHT):
+        """Terms that at least two pages carry in their title or H1, most contested first.
+
+        Each is {'term', 'urls': [(url, weight), ...] strongest first, 'pages'}.
+        Site-wide terms (more than ``max_pages`` pages) list no URLs.
+        """
+        contested = []
+        for term_id, pages in enumerate(self.postings):
+            weights = self.posting_weights[term_id]
+            competing = [n for n in range(len(pages)) if weights[n] >= strong]
+            if len(competing) < 2:
+                continue
+            entry = {'term': self.term(term_id), 'pages': len(competing)}
+            if len(pages) <= self.max_pages:
+                entry['urls'] = sorted(((self.urls[pages[n]], weights[n]) for n in competing),
+                                       key=lambda item: -item[1])
+            contested.append(entry)
+        contested.sort(key=lambda entry: (-entry['pages'], entry['term']))
+        return contested
+
+    def sitewide_terms(self):
+        """(term, pages) for the terms too common to score, most common first."""
+        common = [(self.term(term_id), len(pages)) for term_id, pages in enumerate(self.postings)
+                  if len(pages) > self.max_pages]
+        return sorted(common, key=lambda item: (-item[1], item[0]))
+
+    def pairs(self):
+        """Yield (i, j, cosine) for pages sharing scored terms with similarity >= threshold.
+
+        For each page, dot products with later pages are accumulated over its
+        terms' postings, so a pair is only touched through the terms it shares.
+        """
+        postings = self.postings
+        posting_weights = self.posting_weights
+        norms = self.norms
+        max_pages = self.max_pages
+        threshold = self.threshold
+        for i, (ids, weights) in enumerate(zip(self.page_terms, self.page_weights)):
+            if not norms[i]:
+                continue
+            scores = defaultdict(float)
+            for term_id, weight in zip(ids, weights):
+                pages = postings[term_id]
+                if len(pages) < 2 or len(pages) > max_pages:
+                    continue
+                # Postings are in page order, so the later pages follow i
+                start = bisect_right(pages, i)
+                others = posting_weights[term_id]
+                for n in range(start, len(pages)):
+                    scores[pages[n]] += weight * others[n]
+            for j, dot in scores.items():
+                score = dot / (norms[i] * norms[j])
+                if score >= threshold:
+                    yield i, j, score
+
+    def _shared_terms(self, members, limit):
+        counts = defaultdict(int)
+        totals = defaultdict(float)
+        for page in members:
+            for term_id, weight in zip(self.page_terms[page], self.page_weights[page]):
+                counts[term_id] += 1
+                totals[term_id] += weight
+        shared = [term_id for term_id, count in counts.items() if count > 1]
+        shared.sort(key=lambda term_id: (-counts[term_id], -totals[term_id], term_id))
+        return [{'term': self.term(term_id), 'pages': counts[term_id]} for term_id in shared[:limit]]
+
+    def clusters(self, term_limit=10):
+        """Groups of pages competing for the same terms, largest first.
+
+        Each cluster is {'urls', 'min_similarity', 'max_similarity', 'shared_terms'},
+        where shared_terms are the terms most of its pages carry.
+        """
+        parent = list(range(len(self.urls)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        scores = []
+        for i, j, score in self.pairs():
+            scores.append((i, score))
+            root_i, root_j = find(i), find(j)
+            if root_i != root_j:
+                parent[root_j] = root_i
+
+        roots = {find(i) for i, _ in scores}
+        members = defaultdict(list)
+        for i in range(len(self.urls)):
+            root = find(i)
+            if root in roots:
+                members[root].append(i)
+        ranges = {}
+        for i, score in scores:
+            root = find(i)
+            low, high = ranges.get(root, (score, score))
+            ranges[root] = (min(low, score), max(high, score))
+
+        clusters = []
+        for root, group in members.items():
+            low, high = ranges[root]
+            clusters.append({
+                'urls': [self.urls[i] for i in group],
+                'min_similarity': round(low, 3),
+                'max_similarity': round(high, 3),
+                'shared_terms': self._shared_terms(group, term_limit)
+            })
+        clusters.sort(key=lambda cluster: (-len(cluster['urls']), -cluster['max_similarity']))
+        return clusters
@@ -0,0 +1,172 @@
+"""
+Memory-mapped, lazily decoded access to a Screaming Frog CSV export.
+
+A csv.DictReader row holds every one of the export's ~75 columns as a
+separate string in a fresh dict, although each check reads a handful of
+them ('Meta Keywords 1' alone can run to 700+ characters).  LazyCSV maps
+the file, finds where every row starts once (a quote-aware scan, so
+newlines inside quoted cells do not split rows) and decodes rows only when
+asked, keeping only the projected columns.  Each row becomes a small
+``__slots__`` record holding one tuple of values; records answer
+``row.get(column)`` and ``row[column]`` like DictReader rows, so the checks
+in analyze_seo.py work on either.
+
+    with LazyCSV('internal_all.csv') as crawl:
+        for row in crawl.records(['Address', 'Status Code']):
+            ...
+"""
+
+import csv
+import io
+import mmap
+import os
+from array import array
+from operator import itemgetter
+
+_BOM = b'\xef\xbb\xbf'
+
+
+class Record:
+    """One projected row; ``fields`` (set per projection) maps column -> position in ``values``."""
+    __slots__ = ('values',)
+    fields = {}
+
+    def __init__(self, values):
+        self.values = values
+
+    def __getitem__(self, name):
+        return self.values[self.fields[name]]
+
+    def get(self, name, default=None):
+        n = self.fields.get(name)
+        return default if n is None else self.values[n]
+
+    def __contains__(self, name):
+        return name in self.fields
+
+    def __iter__(self):
+        return iter(self.fields)
+
+    def __len__(self):
+        return len(self.fields)
+
+    def keys(self):
+        return self.fields.keys()
+
+    def items(self):
+        return zip(self.fields, self.values)
+
+    def __repr__(self):
+        return f"Record({dict(self.items())!r})"
+
+
+_record_types = {}
+
+
+def record_type(columns):
+    """A Record subclass for this tuple of column names (created once per projection)."""
+    columns = tuple(columns)
+    cls = _record_types.get(columns)
+    if cls is None:
+        fields = {name: n for n, name in enumerate(columns)}
+        cls = _record_types[columns] = type('Record', (Record,), {'__slots__': (), 'fields': fields})
+    return cls
+
+
+def row_offsets(buffer, start=0):
+    """array('q') of the byte offset at which each row starts, plus the end offset.
+
+    A newline ends a row only when the row so far holds an even number of
+    quote characters; escaped quotes ("") come in pairs so they never
+    change the parity.  Blank lines are skipped.
+    """
+    offsets = array('q')
+    end = len(buffer)
+    pos = start
+    while pos < end:
+        newline = buffer.find(b'\n', pos)
+        if newline < 0:
+            newline = end
+        quotes = buffer[pos:newline].count(b'"')
+        while quotes % 2 and newline < end:
+            following = buffer.find(b'\n', newline + 1)
+            if following < 0:
+                following = end
+            quotes += buffer[newline + 1:following].count(b'"')
+            newline = following
+        if buffer[pos:newline].strip():
+            offsets.append(pos)
+        pos = newline + 1
+    offsets.append(end)
+    return offsets
+
+
+class LazyCSV:
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        if os.fstat(self._file.fileno()).st_size:
+            self.buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self.buffer = b''
+        start = len(_BOM) if self.buffer[:len(_BOM)] == _BOM else 0
+        offsets = row_offsets(self.buffer, start)
+        if len(offsets) > 1:
+            self.header = next(csv.reader([self._line(offsets[0], offsets[1])]))
+            self.offsets = offsets[1:]
+        else:
+            self.header = []
+            self.offsets = offsets
+        self.index = {name: n for n, name in enumerate(self.header)}
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def _line(self, start, stop):
+        return self.buffer[start:stop].decode('utf-8')
+
+    def _lines(self, first, last, block=4096):
+        # Decode a block of rows at a time; csv.reader stitches quoted
+        # newlines back together across lines
+        offsets = self.offsets
+        for n in range(first, last, block):
+            text = self._line(offsets[n], offsets[min(n + block, last)])
+            yield from io.StringIO(text, newline='')
+
+    def _projection(self, columns):
+        names = [name for name in (columns or self.header) if name in self.index]
+        return record_type(names), [self.index[name] for name in names]
+
+    def records(self, columns=None, start=0, stop=None):
+        """Yield a Record per row in [start, stop), decoding only ``columns`` (all if None)."""
+        cls, positions = self._projection(columns)
+        stop = len(self) if stop is None else min(stop, len(self))
+        width = len(self.header)
+        if len(positions) == 1:
+            pick = (lambda n: lambda fields: (fields[n],))(positions[0])
+        elif positions:
+            pick = itemgetter(*positions)
+        else:
+            pick = lambda fields: ()
+        for fields in csv.reader(self._lines(start, stop)):
+            if not fields:
+                continue  # blank line between rows
+            if len(fields) < width:
+                # Short rows read as empty cells, as DictReader's restval does
+                fields += [''] * (width - len(fields))
+            yield cls(pick(fields))
+
+    def record(self, n, columns=None):
+        """Row ``n`` alone, without reading any other row."""
+        return next(self.records(columns, n, n + 1))
+
+    def close(self):
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,285 @@
+"""
+Internal link graph analysis: click depth, true orphans and link equity.
+
+analyze_seo.py only sees the per-row 'Inlinks' / 'Crawl Depth' counters.
+This module builds the actual graph from a Screaming Frog "All Inlinks"
+bulk export (one row per link, with 'Source' and 'Destination' columns) and
+stores it as compressed sparse row (CSR) arrays: ``offsets[u]:offsets[u+1]``
+slices ``targets`` to give u's out-neighbours.  Click depth is a
+level-synchronous BFS over whole frontiers at once, and PageRank is a
+handful of bincount passes per iteration, so million-edge graphs take
+seconds.
+
+Usage:
+    python link_graph.py all_inlinks.csv --sitemap public/sitemap.xml
+    python link_graph.py all_inlinks.csv --equity-map link-equity-map.txt
+    python link_graph.py all_inlinks.csv --domain dirtworkslandscaping.co.uk --start https://dirtworkslandscaping.co.uk/
+"""
+
+import argparse
+import csv
+import json
+import sys
+from array import array
+
+from urllib.parse import urlsplit
+
+import numpy as np
+
+import sitemap_check
+
+
+def _normalise(url):
+    return url.partition('#')[0].strip()
+
+
+def _host(url):
+    """Lower-cased host of ``url`` without a leading 'www.', or '' for non-http(s) URLs."""
+    parts = urlsplit(url)
+    if parts.scheme not in ('http', 'https'):
+        return ''
+    host = (parts.hostname or '').lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+class LinkGraph:
+    def __init__(self, urls, offsets, targets, ids=None):
+        self.domain = None
+        self.external_links = 0
+        self.urls = urls
+        self.ids = ids if ids is not None else {url: n for n, url in enumerate(urls)}
+        self.offsets = offsets
+        self.targets = targets
+
+    @property
+    def num_nodes(self):
+        return len(self.urls)
+
+    @property
+    def num_edges(self):
+        return len(self.targets)
+
+    @classmethod
+    def from_edges(cls, edges):
+        """Build from an iterable of (source_url, destination_url) pairs."""
+        ids = {}
+        urls = []
+        sources = array('i')
+        destinations = array('i')
+        for source, destination in edges:
+            n = ids.get(source)
+            if n is None:
+                n = ids[source] = len(urls)
+                urls.append(source)
+            sources.append(n)
+            n = ids.get(destination)
+            if n is None:
+                n = ids[destination] = len(urls)
+                urls.append(destination)
+            destinations.append(n)
+
+        src = np.frombuffer(sources, dtype=np.int32) if sources else np.zeros(0, np.int32)
+        dst = np.frombuffer(destinations, dtype=np.int32) if destinations else np.zeros(0, np.int32)
+        # Drop self-links and parallel edges; they carry no extra structure
+        keep = src != dst
+        pairs = np.unique(np.stack([src[keep], dst[keep]], axis=1), axis=0) \
+            if keep.any() else np.zeros((0, 2), np.int32)
+        # Counting sort by source gives the CSR layout
+        order = np.argsort(pairs[:, 0], kind='stable')
+        counts = np.bincount(pairs[:, 0], minlength=len(urls))
+        offsets = np.zeros(len(urls) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        return cls(urls, offsets, pairs[order, 1].astype(np.int32), ids)
+
+    @classmethod
+    def from_inlinks_csv(cls, path, link_types=('Hyperlink',), follow_only=True, domain=None):
+        """Build from a Screaming Frog "All Inlinks" export, streamed row by row.
+
+        Only links to ``domain`` (default: the host of the first source, 'www.'
+        ignored) become edges, so off-site destinations take no PageRank.
+        """
+        if domain:
+            domain = _host(domain if '://' in domain else f"https://{domain}")
+        site = {'domain': domain, 'external': 0}
+
+        def edges():
+            with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+                reader = csv.reader(f)
+                header = next(reader, [])
+                source = header.index('Source')
+                destination = header.index('Destination')
+                kind = header.index('Type') if link_types and 'Type' in header else None
+                follow = header.index('Follow') if follow_only and 'Follow' in header else None
+                for row in reader:
+                    if kind is not None and row[kind] not in link_types:
+                        continue
+                    if follow is not None and row[follow].lower() == 'false':
+                        continue
+                    from_url, to_url = _normalise(row[source]), _normalise(row[destination])
+                    if site['domain'] is None:
+                        site['domain'] = _host(from_url)
+                    if _host(to_url) != site['domain']:
+                        site['external'] += 1
+                        continue
+                    yield from_url, to_url
+        graph = cls.from_edges(edges())
+        graph.domain = site['domain']
+        graph.external_links = site['external']
+        return graph
+
+    def site_root(self):
+        """The home page of ``domain`` as it appears in the graph, or None."""
+        if not self.domain:
+            return None
+        for scheme in ('https', 'http'):
+            for host in (self.domain, 'www.' + self.domain):
+                for url in (f"{scheme}://{host}/", f"{scheme}://{host}"):
+                    if url in self.ids:
+                        return url
+        return None
+
+    def in_degree(self):
+        return np.bincount(self.targets, minlength=self.num_nodes)
+
+    def out_degree(self):
+        return np.diff(self.offsets)
+
+    def click_depth(self, start):
+        """BFS depth of every node from ``start`` (-1 where unreachable)."""
+        depth = np.full(self.num_nodes, -1, dtype=np.int32)
+        if start not in self.ids:
+            return depth
+        frontier = np.array([self.ids[start]], dtype=np.int64)
+        depth[frontier] = 0
+        level = 0
+        offsets, targets = self.offsets, self.targets
+        while frontier.size:
+            level += 1
+            starts = offsets[frontier]
+            lengths = offsets[frontier + 1] - starts
+            total = int(lengths.sum())
+            if not total:
+                break
+            # Gather every out-neighbour of the frontier without a Python loop
+            shift = np.repeat(starts - np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths)
+            neighbours = np.unique(targets[shift + np.arange(total)])
+            frontier = neighbours[depth[neighbours] == -1].astype(np.int64)
+            depth[frontier] = level
+        return depth
+
+    def pagerank(self, damping=0.85, tolerance=1e-9, max_iterations=100):
+        """Internal PageRank; dangling pages spread their rank evenly."""
+        n = self.num_nodes
+        if not n:
+            return np.zeros(0)
+        out_degree = self.out_degree()
+        sources = np.repeat(np.arange(n), out_degree)
+        dangling = out_degree == 0
+        safe_degree = np.where(dangling, 1, out_degree)
+        rank = np.full(n, 1.0 / n)
+        for _ in range(max_iterations):
+            share = rank / safe_degree
+            new = np.bincount(self.targets, weights=share[sources], minlength=n)
+            new = damping * (new + rank[dangling].sum() / n) + (1 - damping) / n
+            if np.abs(new - rank).sum() < tolerance:
+                rank = new
+                break
+            rank = new
+        return rank
+
+
+def sitemap_urls(path):
+    """<loc> values from a sitemap (or every sitemap of a sitemap index), parsed incrementally."""
+    return [_normalise(url) for url in sitemap_check.iter_sitemap(path)]
+
+
+def analyze(graph, start=None, sitemap=None, max_depth=3, top=50):
+    """Depth, orphan and equity analysis; returns a JSON-ready dict."""
+    start = start or graph.site_root() or (graph.urls[0] if graph.urls else None)
+    depth = graph.click_depth(start)
+    in_degree = graph.in_degree()
+    rank = graph.pagerank()
+
+    by_rank = np.argsort(-rank, kind='stable')[:top]
+    histogram = {}
+    for level, count in zip(*np.unique(depth, return_counts=True)):
+        histogram['unreachable' if level < 0 else str(int(level))] = int(count)
+
+    report = {
+        'nodes': graph.num_nodes,
+        'edges': graph.num_edges,
+        'domain': graph.domain,
+        'external_links_skipped': graph.external_links,
+        'start': start,
+        'depth_histogram': histogram,
+        'deep_pages': [
+            {'url': graph.urls[n], 'depth': int(depth[n])}
+            for n in np.flatnonzero(depth > max_depth)
+        ],
+        'unreachable': [graph.urls[n] for n in np.flatnonzero(depth < 0)],
+        'link_equity': [
+            {'url': graph.urls[n], 'pagerank': round(float(rank[n]), 6),
+             'share': round(float(rank[n]) * 100, 2), 'inlinks': int(in_degree[n])}
+            for n in by_rank
+        ],
+    }
+
+    if sitemap is not None:
+        orphans = []
+        for url in sitemap:
+            n = graph.ids.get(url)
+            if n is None or in_degree[n] == 0:
+                orphans.append({'url': url, 'in_graph': n is not None})
+        report['sitemap_urls'] = len(sitemap)
+        report['orphans'] = orphans
+    return report
+
+
+def format_equity_map(report):
+    lines = ["INTERNAL LINK EQUITY (computed by link_graph.py)", "=" * 48, ""]
+    lines.append(f"{'Share':>7}  {'Inlinks':>7}  URL")
+    for entry in report['link_equity']:
+        lines.append(f"{entry['share']:>6.2f}%  {entry['inlinks']:>7}  {entry['url']}")
+    return '\n'.join(lines) + '\n'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyse the internal link graph of a crawl.")
+    parser.add_argument('inlinks_csv', help='Screaming Frog "All Inlinks" bulk export')
+    parser.add_argument('--start', help="URL to measure click depth from (default: the site root)")
+    parser.add_argument('--domain',
+                        help="site host; links to other hosts are left out of the graph "
+                             "(default: the host of --start, else of the first source)")
+    parser.add_argument('--sitemap', help="sitemap.xml to check for orphaned pages")
+    parser.add_argument('--max-depth', type=int, default=3,
+                        help="click depth above which pages are reported (default: %(default)s)")
+    parser.add_argument('--top', type=int, default=50,
+                        help="how many pages to list by link equity (default: %(default)s)")
+    parser.add_argument('-o', '--output', default='link_graph_report.json',
+                        help="where to write the JSON report (default: %(default)s)")
+    parser.add_argument('--equity-map', help="also write a plain-text link equity table here")
+    args = parser.parse_args(argv)
+
+    graph = LinkGraph.from_inlinks_csv(args.inlinks_csv, domain=args.domain or args.start)
+    sitemap = sitemap_urls(args.sitemap) if args.sitemap else None
+    report = analyze(graph, args.start, sitemap, args.max_depth, args.top)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    if args.equity_map:
+        with open(args.equity_map, 'w', encoding='utf-8') as f:
+            f.write(format_equity_map(report))
+
+    print(f"Graph: {report['nodes']} pages, {report['edges']} links on {report['domain']} "
+          f"({report['external_links_skipped']} off-site links left out)")
+    print(f"Click depth from {report['start']}: {report['depth_histogram']}")
+    print(f"Pages deeper than {args.max_depth}: {len(report['deep_pages'])}")
+    print(f"Unreachable pages: {len(report['unreachable'])}")
+    if 'orphans' in report:
+        print(f"Orphaned sitemap URLs: {len(report['orphans'])} of {report['sitemap_urls']}")
+    print(f"Report saved to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
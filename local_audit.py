@@ -0,0 +1,310 @@
+"""
+Audit the built site in dist/ without crawling it.
+
+astro.config.mjs builds a static site ('output: static'), so every page
+already exists as dist/**/index.html.  This walks those files, streams each
+one through html.parser in a process pool and emits one row per page with
+the Screaming Frog column names analyze_seo.py and seo_audit_analysis.py
+read ('Title 1', 'Meta Description 1', 'H1-1', 'H2-n', 'Canonical Link
+Element 1', 'Word Count', 'Text Ratio', 'Outlinks', ...).  Inlinks and
+'Crawl Depth' come from the internal links found across all pages, so the
+rows stand in for an internal_all.csv export of the same build.
+
+Usage:
+    npm run build && python local_audit.py dist/ -o local_crawl.csv
+    python local_audit.py dist/ --audit -r local_audit_report.json
+"""
+
+import argparse
+import codecs
+import csv
+import hashlib
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlparse
+
+DEFAULT_BASE_URL = 'https://dirtworkslandscaping.co.uk/'
+CHUNK_SIZE = 1 << 16
+
+# Screaming Frog's column order, limited to the columns produced here
+FIELDS = [
+    'Address', 'Content Type', 'Status Code', 'Status', 'Indexability', 'Indexability Status',
+    'Title 1', 'Title 1 Length', 'Meta Description 1', 'Meta Description 1 Length',
+    'Meta Keywords 1', 'Meta Keywords 1 Length', 'H1-1', 'H1-1 Length', 'H1-2', 'H1-2 Length',
+    'H2-1', 'H2-1 Length', 'H2-2', 'H2-2 Length', 'Meta Robots 1', 'Canonical Link Element 1',
+    'Size (bytes)', 'Word Count', 'Text Ratio', 'Crawl Depth', 'Folder Depth',
+    'Inlinks', 'Unique Inlinks', 'Outlinks', 'Unique Outlinks',
+    'External Outlinks', 'Unique External Outlinks', 'Hash', 'Response Time',
+    'Redirect URL', 'Language', 'Crawl Timestamp',
+]
+
+# Text inside these never counts as page copy
+_SKIP_TEXT = {'script', 'style', 'noscript', 'template', 'svg'}
+# ...and, like Screaming Frog's default content area, neither do these
+_NON_CONTENT = {'nav', 'footer'}
+_VOID = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta',
+         'param', 'source', 'track', 'wbr'}
+
+
+class _PageParser(HTMLParser):
+    """Collects the SEO fields of one page as it is fed, keeping only counters and short strings."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title = None
+        self.meta = {}
+        self.canonical = None
+        self.language = None
+        self.headings = {'h1': [], 'h2': []}
+        self.links = []
+        self.words = 0
+        self.text_chars = 0
+        self._stack = []
+        self._skip = 0
+        self._non_content = 0
+        self._capture = None
+        self._buffer = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = {name: value or '' for name, value in attrs}
+        if tag == 'html':
+            self.language = attrs.get('lang')
+        elif tag == 'meta':
+            name = (attrs.get('name') or '').lower()
+            if name in ('description', 'keywords', 'robots') and name not in self.meta:
+                self.meta[name] = attrs.get('content', '').strip()
+        elif tag == 'link':
+            if 'canonical' in (attrs.get('rel') or '').lower().split() and self.canonical is None:
+                self.canonical = attrs.get('href', '').strip()
+        elif tag == 'a' and attrs.get('href'):
+            self.links.append(attrs['href'].strip())
+
+        if tag in _VOID:
+            return
+        self._stack.append(tag)
+        if tag in _SKIP_TEXT:
+            self._skip += 1
+        elif tag in _NON_CONTENT:
+            self._non_content += 1
+        elif self._capture is None and (tag in self.headings or (tag == 'title' and self.title is None)):
+            self._capture = (tag, len(self._stack))
+            self._buffer = []
+
+    def handle_endtag(self, tag):
+        if tag not in self._stack:
+            return
+        # Close anything left open inside this element, as browsers do
+        while self._stack:
+            open_tag = self._stack.pop()
+            if open_tag in _SKIP_TEXT:
+                self._skip -= 1
+            elif open_tag in _NON_CONTENT:
+                self._non_content -= 1
+            if self._capture is not None and len(self._stack) < self._capture[1]:
+                name = self._capture[0]
+                text = ' '.join(''.join(self._buffer).split())
+                if name == 'title':
+                    self.title = text
+                else:
+                    self.headings[name].append(text)
+                self._capture = None
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if self._skip:
+            return
+        if self._capture is not None:
+            self._buffer.append(data)
+        if self._non_content or 'body' not in self._stack:
+            return
+        words = data.split()
+        if words:
+            self.words += len(words)
+            self.text_chars += len(data.strip())
+
+
+def page_url(path, dist, base_url):
+    """The URL dist/<path> is served at: .../index.html becomes its directory URL."""
+    relative = os.path.relpath(path, dist).replace(os.sep, '/')
+    if relative == 'index.html':
+        relative = ''
+    elif relative.endswith('/index.html'):
+        relative = relative[:-len('index.html')]
+    return urljoin(base_url, relative)
+
+
+def find_pages(dist):
+    """Every built HTML page under ``dist`` (the 404 page is served for missing URLs, not crawled)."""
+    pages = []
+    for root, dirs, files in os.walk(dist):
+        dirs.sort()
+        for name in sorted(files):
+            if name.endswith('.html') and not (root == dist and name == '404.html'):
+                pages.append(os.path.join(root, name))
+    return pages
+
+
+def parse_page(path, url, host):
+    """Worker: stream one HTML file through the parser; returns (row, internal link targets)."""
+    parser = _PageParser()
+    digest = hashlib.md5()
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    size = 0
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            digest.update(chunk)
+            parser.feed(decoder.decode(chunk))
+    parser.feed(decoder.decode(b'', final=True))
+    parser.close()
+
+    internal, external = [], []
+    for href in parser.links:
+        target = urljoin(url, href).partition('#')[0]
+        parsed = urlparse(target)
+        if parsed.scheme not in ('http', 'https'):
+            continue
+        (internal if parsed.netloc == host else external).append(target)
+
+    robots = parser.meta.get('robots', '')
+    noindex = 'noindex' in robots.lower()
+    row = {
+        'Address': url,
+        'Content Type': 'text/html; charset=utf-8',
+        'Status Code': '200',
+        'Status': 'OK',
+        'Indexability': 'Non-Indexable' if noindex else 'Indexable',
+        'Indexability Status': 'noindex' if noindex else '',
+        'Title 1': parser.title or '',
+        'Meta Description 1': parser.meta.get('description', ''),
+        'Meta Keywords 1': parser.meta.get('keywords', ''),
+        'Meta Robots 1': robots,
+        'Canonical Link Element 1': urljoin(url, parser.canonical) if parser.canonical else '',
+        'Size (bytes)': str(size),
+        'Word Count': str(parser.words),
+        'Text Ratio': f"{parser.text_chars / size * 100:.3f}" if size else '0.000',
+        'Folder Depth': str(len([part for part in urlparse(url).path.split('/') if part])),
+        'Outlinks': str(len(internal)),
+        'Unique Outlinks': str(len(set(internal))),
+        'External Outlinks': str(len(external)),
+        'Unique External Outlinks': str(len(set(external))),
+        'Hash': digest.hexdigest(),
+        'Language': parser.language or '',
+    }
+    for level, texts in (('H1', parser.headings['h1']), ('H2', parser.headings['h2'])):
+        for n in (1, 2):
+            row[f'{level}-{n}'] = texts[n - 1] if len(texts) >= n else ''
+    for field in ('Title 1', 'Meta Description 1', 'Meta Keywords 1', 'H1-1', 'H1-2', 'H2-1', 'H2-2'):
+        row[f'{field} Length'] = str(len(row[field]))
+    return row, internal
+
+
+def _page_target(url, pages):
+    """Map a link to the page it serves: Netlify redirects '/x' to '/x/' for directory pages."""
+    if url in pages:
+        return url
+    if not url.endswith('/') and url + '/' in pages:
+        return url + '/'
+    if url.endswith('/index.html') and url[:-len('index.html')] in pages:
+        return url[:-len('index.html')]
+    return None
+
+
+def audit_dist(dist, base_url=DEFAULT_BASE_URL, workers=None):
+    """Rows for every page in ``dist``, in the shape of a Screaming Frog internal_all export."""
+    import link_graph
+
+    paths = find_pages(dist)
+    urls = [page_url(path, dist, base_url) for path in paths]
+    host = urlparse(base_url).netloc
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parsed = list(pool.map(parse_page, paths, urls, [host] * len(paths),
+                               chunksize=max(1, len(paths) // (4 * (workers or os.cpu_count() or 1)))))
+
+    pages = set(urls)
+    edges = []
+    inlinks = dict.fromkeys(urls, 0)
+    unique_inlinks = {url: set() for url in urls}
+    for row, links in parsed:
+        for link in links:
+            target = _page_target(link, pages)
+            if target is None or target == row['Address']:
+                continue
+            inlinks[target] += 1
+            unique_inlinks[target].add(row['Address'])
+            edges.append((row['Address'], target))
+
+    graph = link_graph.LinkGraph.from_edges(edges)
+    start = base_url if base_url in graph.ids else None
+    depth = graph.click_depth(start) if start else None
+    timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
+
+    rows = []
+    for row, _ in parsed:
+        url = row['Address']
+        n = graph.ids.get(url)
+        if url == start:
+            row['Crawl Depth'] = '0'
+        elif depth is not None and n is not None and depth[n] >= 0:
+            row['Crawl Depth'] = str(int(depth[n]))
+        else:
+            row['Crawl Depth'] = ''  # unreachable from the home page
+        row['Inlinks'] = str(inlinks[url])
+        row['Unique Inlinks'] = str(len(unique_inlinks[url]))
+        row['Response Time'] = ''
+        row['Redirect URL'] = ''
+        row['Crawl Timestamp'] = timestamp
+        rows.append({field: row.get(field, '') for field in FIELDS})
+    return rows
+
+
+def write_csv(rows, path):
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS, quoting=csv.QUOTE_ALL)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extract crawl-style SEO fields from the built site.")
+    parser.add_argument('dist', nargs='?', default='dist', help="Astro build output (default: %(default)s)")
+    parser.add_argument('--base-url', default=DEFAULT_BASE_URL,
+                        help="URL the site is served from (default: %(default)s)")
+    parser.add_argument('-o', '--output', default='local_crawl.csv',
+                        help="where to write the crawl-style CSV (default: %(default)s)")
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help="worker processes (default: one per CPU)")
+    parser.add_argument('--audit', action='store_true',
+                        help="also run analyze_seo's checks over the extracted rows")
+    parser.add_argument('-r', '--report', default='local_audit_report.json',
+                        help="where --audit writes its JSON report (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.dist):
+        parser.error(f"{args.dist} is not a directory; run the Astro build first")
+    base_url = args.base_url if args.base_url.endswith('/') else args.base_url + '/'
+
+    started = time.perf_counter()
+    rows = audit_dist(args.dist, base_url, args.workers)
+    write_csv(rows, args.output)
+    print(f"Extracted {len(rows)} pages from {args.dist} in {time.perf_counter() - started:.2f}s "
+          f"-> {args.output}")
+
+    if args.audit:
+        import analyze_seo
+        report = analyze_seo.run_audit(rows)
+        report.write_json(args.report)
+        analyze_seo.print_summary(report)
+        print(f"\nReport saved to {args.report}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,240 @@
+"""
+Near-duplicate detection with shingling, MinHash and LSH banding.
+
+Exact 'Hash' matching only catches byte-identical pages; templated pages
+(every src/pages/locations/*.astro, for instance) differ by a town name and
+never collide.  Here each page is reduced to a set of word shingles, then to
+a fixed-size MinHash signature whose agreement rate estimates the Jaccard
+similarity of two pages.  Signatures are cut into bands and bucketed, so
+only pages sharing at least one band are ever compared: finding similar
+pairs is roughly linear in the number of pages instead of quadratic.
+
+A bucket holding many similar but not identical pages (a boilerplate-heavy
+template) would still be compared pairwise, so buckets of more than
+``max_bucket`` distinct pages are not scored; they are reported as
+oversized buckets instead.
+"""
+
+import hashlib
+import random
+import re
+from array import array
+from collections import defaultdict
+
+_MAX_HASH = (1 << 64) - 1
+_WORD = re.compile(r"\w+")
+
+
+def _hash64(text):
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class _Vocabulary(dict):
+    """word -> stable 64-bit hash, computed once per distinct word."""
+
+    def __missing__(self, word):
+        value = self[word] = _hash64(word)
+        return value
+
+
+_vocabulary = _Vocabulary()
+
+
+def shingles(text, size=3):
+    """The set of hashed ``size``-word shingles in ``text`` (lower-cased).
+
+    Words are hashed once each; a shingle is the (deterministic, unsalted)
+    tuple hash of its word hashes, so no string is built per shingle.
+    """
+    words = [_vocabulary[word] for word in _WORD.findall(text.lower())]
+    if len(words) < size:
+        return {hash(tuple(words)) & _MAX_HASH} if words else set()
+    return {hash(shingle) & _MAX_HASH for shingle in zip(*(words[i:] for i in range(size)))}
+
+
+def choose_bands(num_perm, threshold):
+    """Pick (bands, rows) with bands * rows <= num_perm whose S-curve crosses ``threshold``.
+
+    A pair with similarity s becomes a candidate with probability
+    1 - (1 - s**rows)**bands; the steepest part of that curve sits near
+    (1 / bands) ** (1 / rows), which we place as close to the threshold as possible.
+    """
+    best = None
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        error = abs((1 / bands) ** (1 / rows) - threshold)
+        if best is None or error < best[0]:
+            best = (error, bands, rows)
+    return best[1], best[2]
+
+
+class MinHasher:
+    """One-permutation MinHash with rotation densification.
+
+    Rather than applying ``num_perm`` hash functions to every shingle, each
+    (already uniformly hashed) shingle is routed to one of ``num_perm`` bins
+    and only the bin minimum is kept, which makes a signature O(shingles)
+    instead of O(shingles * num_perm).  Empty bins borrow from the next
+    non-empty bin to their right, offset by the distance travelled, so the
+    fraction of agreeing bins still estimates Jaccard similarity
+    (Shrivastava & Li, "Densifying One Permutation Hashing", 2014).
+    """
+
+    def __init__(self, num_perm=64, seed=1):
+        self.num_perm = num_perm
+        self.mask = random.Random(seed).getrandbits(64)
+        self.offset = (_MAX_HASH // num_perm) + 1
+
+    def signature(self, shingle_set):
+        """array('Q') of ``num_perm`` bin minima (all-max for an empty set)."""
+        k = self.num_perm
+        empty = _MAX_HASH
+        bins = [empty] * k
+        mask = self.mask
+        for x in shingle_set:
+            x ^= mask
+            b = x % k
+            v = x // k
+            if v < bins[b]:
+                bins[b] = v
+        if empty in bins and len(set(bins)) > 1:
+            filled = list(bins)
+            for i in range(k):
+                if bins[i] != empty:
+                    continue
+                distance = 1
+                while bins[(i + distance) % k] == empty:
+                    distance += 1
+                filled[i] = bins[(i + distance) % k] + distance * self.offset
+            bins = filled
+        return array('Q', bins)
+
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity: the fraction of signature slots that agree."""
+    return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / len(sig_a)
+
+
+class NearDuplicateIndex:
+    """Add (key, text) pairs, then ask for clusters of near-duplicates.
+
+    Only the signature (8 bytes per permutation) is kept per distinct page.
+    Pages with identical signatures share one entry, so a template stamped
+    out thousands of times does not turn one LSH bucket quadratic.
+    """
+
+    def __init__(self, threshold=0.8, num_perm=64, shingle_size=3, seed=1, max_bucket=200):
+        self.threshold = threshold
+        self.max_bucket = max_bucket
+        self.shingle_size = shingle_size
+        self.hasher = MinHasher(num_perm, seed)
+        self.bands, self.rows = choose_bands(num_perm, threshold)
+        self.keys = []
+        self.signatures = []
+        self.exact = {}
+        self.buckets = [defaultdict(list) for _ in range(self.bands)]
+
+    def signature(self, text):
+        """MinHash signature of ``text``, or None if it has no words."""
+        shingle_set = shingles(text, self.shingle_size)
+        if not shingle_set:
+            return None
+        return self.hasher.signature(shingle_set)
+
+    def add(self, key, text):
+        signature = self.signature(text)
+        if signature is not None:
+            self.add_signature(key, signature)
+
+    def add_signature(self, key, signature):
+        exact = signature.tobytes()
+        if exact in self.exact:
+            self.keys[self.exact[exact]].append(key)
+            return
+        n = self.exact[exact] = len(self.keys)
+        self.keys.append([key])
+        self.signatures.append(signature)
+        rows = self.rows
+        for band, buckets in enumerate(self.buckets):
+            buckets[signature[band * rows:(band + 1) * rows].tobytes()].append(n)
+
+    def pairs(self):
+        """Yield (i, j, similarity) for candidate pairs at or above the threshold."""
+        seen = set()
+        signatures = self.signatures
+        for buckets in self.buckets:
+            for members in buckets.values():
+                if len(members) < 2 or len(members) > self.max_bucket:
+                    continue
+                for x in range(len(members)):
+                    for y in range(x + 1, len(members)):
+                        pair = (members[x], members[y])
+                        if pair in seen:
+                            continue
+                        seen.add(pair)
+                        score = similarity(signatures[pair[0]], signatures[pair[1]])
+                        if score >= self.threshold:
+                            yield pair[0], pair[1], score
+
+    def oversized_buckets(self, sample=5):
+        """Buckets too large to score, largest first: {'pages', 'bands', 'sample'}.
+
+        The same group of pages often fills a bucket in several bands; each
+        distinct group is listed once.
+        """
+        groups = {}
+        for buckets in self.buckets:
+            for members in buckets.values():
+                if len(members) > self.max_bucket:
+                    key = tuple(members)
+                    groups[key] = groups.get(key, 0) + 1
+        found = []
+        for members, bands in groups.items():
+            urls = [key for i in members for key in self.keys[i]]
+            found.append({'pages': len(urls), 'bands': bands, 'sample': urls[:sample]})
+        found.sort(key=lambda bucket: -bucket['pages'])
+        return found
+
+    def clusters(self):
+        """Connected groups of near-duplicate keys, largest first.
+
+        Each cluster is {'urls': [...], 'min_similarity': s, 'max_similarity': s}
+        over the pairs that joined it.
+        """
+        parent = list(range(len(self.keys)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        scores = [(i, 1.0) for i, keys in enumerate(self.keys) if len(keys) > 1]
+        for i, j, score in self.pairs():
+            scores.append((i, score))
+            root_i, root_j = find(i), find(j)
+            if root_i != root_j:
+                parent[root_j] = root_i
+
+        members = defaultdict(list)
+        for i in range(len(self.keys)):
+            members[find(i)].append(i)
+        ranges = {}
+        for i, score in scores:
+            root = find(i)
+            low, high = ranges.get(root, (score, score))
+            ranges[root] = (min(low, score), max(high, score))
+
+        clusters = []
+        for root, group in members.items():
+            urls = [key for i in group for key in self.keys[i]]
+            if len(urls) < 2:
+                continue
+            low, high = ranges[root]
+            clusters.append({
+                'urls': urls,
+                'min_similarity': round(low, 3),
+                'max_similarity': round(high, 3),
+            })
+        clusters.sort(key=lambda c: len(c['urls']), reverse=True)
+        return clusters
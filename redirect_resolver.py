@@ -0,0 +1,127 @@
+"""
+Resolve every redirect in a crawl to its final target in one linear pass.
+
+Given ``redirect_map`` (url -> redirect target) this computes, for each
+redirecting URL, the final non-redirecting destination, the number of hops
+to get there and whether the chain ends in a loop.  Each URL is walked at
+most once: results are memoised as soon as a walk reaches a URL that is
+already resolved, so total work is O(number of redirects) no matter how
+long or shared the chains are.
+"""
+
+import json
+from urllib.parse import urlparse
+
+_UNSEEN, _ACTIVE, _DONE = 0, 1, 2
+
+
+class Resolution:
+    __slots__ = ('final', 'hops', 'loop', 'next')
+
+    def __init__(self, final, hops, loop, next):
+        self.final = final  # None when the chain ends in a loop
+        self.hops = hops
+        self.loop = loop
+        self.next = next
+
+
+def resolve(redirect_map):
+    """Return {url: Resolution} for every key of ``redirect_map``."""
+    state = {}
+    resolved = {}
+
+    for start in redirect_map:
+        if state.get(start) == _DONE:
+            continue
+        path = []
+        current = start
+        # Walk until we leave the map, hit a resolved URL, or revisit this walk
+        while current in redirect_map and state.get(current, _UNSEEN) == _UNSEEN:
+            state[current] = _ACTIVE
+            path.append(current)
+            current = redirect_map[current]
+
+        if current in redirect_map and state.get(current) == _ACTIVE:
+            # current is on this walk: everything from it onwards is the cycle
+            cycle_start = path.index(current)
+            cycle = path[cycle_start:]
+            for url in cycle:
+                resolved[url] = Resolution(None, len(cycle), True, redirect_map[url])
+                state[url] = _DONE
+            path = path[:cycle_start]
+            tail = resolved[current]
+        elif current in redirect_map:
+            tail = resolved[current]
+        else:
+            tail = Resolution(current, 0, False, None)
+
+        # Unwind the walk back to start, one hop further each step
+        for url in reversed(path):
+            tail = Resolution(tail.final, tail.hops + 1, tail.loop, redirect_map[url])
+            resolved[url] = tail
+            state[url] = _DONE
+
+    return resolved
+
+
+def chain(url, resolved):
+    """The URLs visited from ``url`` before its final target (stops once at a loop)."""
+    seen = set()
+    steps = []
+    while url in resolved and url not in seen:
+        seen.add(url)
+        steps.append(url)
+        url = resolved[url].next
+    return steps
+
+
+def cycles(resolved):
+    """Each distinct redirect loop once, as [a, b, ..., a]."""
+    found = []
+    seen = set()
+    for url, resolution in resolved.items():
+        if not resolution.loop or url in seen:
+            continue
+        steps = chain(url, resolved)
+        # The walk may lead into the cycle; the repeated URL marks where it starts
+        cycle_start = steps.index(resolved[steps[-1]].next)
+        cycle = steps[cycle_start:]
+        if not seen.intersection(cycle):
+            found.append(cycle + [cycle[0]])
+        seen.update(steps)
+    return found
+
+
+def _path(url, host):
+    parsed = urlparse(url)
+    if host is not None and parsed.netloc == host:
+        path = parsed.path or '/'
+        return path + (f"?{parsed.query}" if parsed.query else '')
+    return url
+
+
+def _toml_string(value):
+    # JSON string escapes (\", \\, \uXXXX) are valid in TOML basic strings
+    return json.dumps(value)
+
+
+def to_netlify_toml(entries, host=None):
+    """Render flattened redirects as netlify.toml [[redirects]] blocks.
+
+    ``entries`` are dicts with 'from', 'to' and 'status'.  URLs on ``host``
+    are written as site-relative paths.  Trailing-slash-only redirects are
+    left out: Netlify matches rules regardless of a trailing slash, so
+    "/glasgow" -> "/glasgow/" would redirect to itself forever.
+    """
+    blocks = []
+    for entry in entries:
+        source, target = _path(entry['from'], host), _path(entry['to'], host)
+        if source.rstrip('/') == target.rstrip('/'):
+            continue
+        blocks.append(
+            "[[redirects]]\n"
+            f"  from = {_toml_string(source)}\n"
+            f"  to = {_toml_string(target)}\n"
+            f"  status = {entry['status']}\n"
+            "  force = true\n")
+    return '\n'.join(blocks)
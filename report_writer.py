@@ -0,0 +1,165 @@
+"""
+Stream an audit report as newline-delimited JSON instead of one JSON document.
+
+An .ndjson report is one compact JSON record per line:
+
+    {"type": "header", "format": "seo-audit-ndjson", "version": 1, ...}
+    {"type": "item", "section": "thin_content", "field": null, "value": {...}}
+    {"type": "item", "section": "links", "field": "link_issues", "value": {...}}
+    ...
+    {"type": "section", "section": "links", "value": {}, "counts": {"link_issues": 812, ...}}
+    {"type": "profile", "value": {...}}            (only with --profile)
+    {"type": "executive_summary", "value": {...}}
+
+Every entry of a section's lists (the section itself when it is a list, or
+its list-valued fields) is an 'item' record, so a dashboard can load or
+filter one line at a time.  When the audit is streamed, per-row findings
+(thin pages, link issues, meta descriptions, 404s, canonical issues) are
+written as they are found and never held in memory; everything else is
+written once the crawl is exhausted.  The 'section' record carries the
+section's remaining fields and how many items each list had, and the
+executive summary is always the last line, so a file without one was cut
+short.
+
+Paths ending in .gz are gzip-compressed, for JSON reports as well.
+read_report() turns an NDJSON report back into the dict analyze_seo.py
+writes as JSON.
+"""
+
+import gzip
+import json
+
+FORMAT = 'seo-audit-ndjson'
+VERSION = 1
+NDJSON_SUFFIXES = ('.ndjson', '.jsonl')
+
+
+def is_ndjson(path):
+    name = path[:-3] if path.endswith('.gz') else path
+    return name.endswith(NDJSON_SUFFIXES)
+
+
+def open_text(path, mode='r'):
+    """Open ``path`` as UTF-8 text, through gzip when it ends in .gz."""
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8', newline='\n')
+    return open(path, mode, encoding='utf-8', newline='\n')
+
+
+class SpilledList:
+    """Stands in for a check's list of findings: append() writes each one out and only the count is kept."""
+
+    def __init__(self, writer, section, field):
+        self._writer = writer
+        self.section = section
+        self.field = field
+        self.count = 0
+
+    def append(self, item):
+        self._writer.item(self.section, self.field, item)
+        self.count += 1
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        # Already written; nothing is kept to iterate over
+        return iter(())
+
+
+class NDJSONWriter:
+    def __init__(self, path, **header):
+        self.path = path
+        self._file = open_text(path, 'w')
+        self._encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+        self._write({'type': 'header', 'format': FORMAT, 'version': VERSION, **header})
+
+    def _write(self, record):
+        self._file.write(self._encode(record))
+        self._file.write('\n')
+
+    def item(self, section, field, value):
+        self._write({'type': 'item', 'section': section, 'field': field, 'value': value})
+
+    def spill(self, section, field=None):
+        """A SpilledList writing items of ``section`` (or of its ``field``) as they are appended."""
+        return SpilledList(self, section, field)
+
+    def _items(self, section, field, items):
+        if not isinstance(items, SpilledList):
+            for value in items:
+                self.item(section, field, value)
+        return len(items)
+
+    def write_section(self, key, value):
+        if isinstance(value, (list, SpilledList)):
+            self._write({'type': 'section', 'section': key, 'count': self._items(key, None, value)})
+            return
+        fields, counts = {}, {}
+        for name, field in value.items():
+            if isinstance(field, (list, SpilledList)):
+                counts[name] = self._items(key, name, field)
+            else:
+                fields[name] = field
+        self._write({'type': 'section', 'section': key, 'value': fields, 'counts': counts})
+
+    def write_report(self, report):
+        """Write the rest of ``report`` (an analyze_seo.Report), ending with its executive summary."""
+        if report.profile is None:
+            self._write_sections(report)
+        else:
+            with report.profile.stage('write_report'):
+                self._write_sections(report)
+            self._write({'type': 'profile', 'value': report.profile.to_dict()})
+        self._write({'type': 'executive_summary', 'value': report.executive_summary})
+
+    def _write_sections(self, report):
+        for key, value in report.sections.items():
+            if key != 'executive_summary':
+                self.write_section(key, value)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iter_records(path):
+    with open_text(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def read_report(path):
+    """Rebuild the report dict from an NDJSON report (raises ValueError if it was cut short)."""
+    report = {}
+    items = {}
+    header = footer = None
+    for record in iter_records(path):
+        kind = record['type']
+        if kind == 'header':
+            header = record
+        elif kind == 'item':
+            items.setdefault((record['section'], record['field']), []).append(record['value'])
+        elif kind == 'section':
+            key = record['section']
+            if 'count' in record:
+                report[key] = items.pop((key, None), [])
+            else:
+                report[key] = dict(record['value'])
+                for field in record['counts']:
+                    report[key][field] = items.pop((key, field), [])
+        elif kind == 'profile':
+            report['profile'] = record['value']
+        elif kind == 'executive_summary':
+            footer = record['value']
+    if header is None or header.get('format') != FORMAT:
+        raise ValueError(f"{path} is not an NDJSON audit report")
+    if footer is None:
+        raise ValueError(f"{path} has no executive_summary record; the audit did not finish writing it")
+    return {'executive_summary': footer, **report}
@@ -0,0 +1,262 @@
+"""
+Find <script> blocks in .astro/HTML source in one linear scan.
+
+The location rewrite scripts used to cut tracking scripts out with DOTALL
+regexes such as ``<script is:inline>.*?gtag('event', 'quote_request'.*?</script>``.
+On a page with many inline scripts each ``<script is:inline>`` that is not
+the target makes ``.*?`` run on to the end of the file (quadratic), and a
+match can start in one script and end in a later one, swallowing everything
+in between.  ``[^}]+\\}`` style patterns instead miss any handler with a nested
+brace.  Here the source is tokenised once: the scanner only ever moves
+forward, jumping between '<' characters, skipping comments and reading
+each script's attributes and body exactly once, so the work is O(n) whatever
+the page contains.  Blocks are then selected by the gtag event names found
+in their bodies.
+
+Usage:
+    python script_blocks.py src/pages/locations/ayr.astro     # list blocks and events
+    python script_blocks.py --benchmark --size-mb 0.5 4 16    # tokenizer vs regex timings
+"""
+
+import argparse
+import re
+import string
+import sys
+import time
+
+# gtag('event', 'name' ...) / gtag("event", "name" ...); no nested quantifiers
+_GTAG_EVENT = re.compile(r"""gtag\(\s*(['"])event\1\s*,\s*(['"])([^'"\\\n]+)\2""")
+# str.lower() can change the length ('İ' lowers to two characters) and so shift
+# offsets into the original text; folding ASCII only keeps them aligned
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+_ATTRIBUTE = re.compile(r"""([^\s=/>]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+)))?""")
+
+
+class ScriptBlock:
+    __slots__ = ('start', 'end', 'body', 'attributes', 'events')
+
+    def __init__(self, start, end, body, attributes, events):
+        self.start = start            # index of '<script'
+        self.end = end                # index just past '</script>'
+        self.body = body
+        self.attributes = attributes  # {name: value or None}
+        self.events = events          # gtag event names, in order
+
+    @property
+    def inline(self):
+        return 'is:inline' in self.attributes
+
+
+def _tag_end(text, i):
+    """Index just past the '>' closing the tag opened before ``i``, honouring quoted values."""
+    n = len(text)
+    while i < n:
+        c = text[i]
+        if c == '>':
+            return i + 1
+        if c == '"' or c == "'":
+            close = text.find(c, i + 1)
+            if close < 0:
+                return n
+            i = close
+        i += 1
+    return n
+
+
+def _attributes(source):
+    attributes = {}
+    for match in _ATTRIBUTE.finditer(source):
+        name, *values = match.groups()
+        value = next((v for v in values if v is not None), None)
+        attributes[name.lower()] = value
+    return attributes
+
+
+def _is_tag(lowered, i, name):
+    """``lowered[i:]`` opens tag ``name`` (followed by whitespace, '/' or '>')."""
+    end = i + 1 + len(name)
+    return lowered.startswith(name, i + 1) and (end >= len(lowered) or lowered[end] in ' \t\r\n/>')
+
+
+def script_blocks(text):
+    """Every <script>...</script> block in ``text``, in order, in one forward pass."""
+    lowered = text.translate(_ASCII_LOWER)
+    blocks = []
+    n = len(text)
+    i = lowered.find('<')
+    while 0 <= i < n:
+        if lowered.startswith('<!--', i):
+            close = lowered.find('-->', i + 4)
+            i = n if close < 0 else close + 3
+        elif _is_tag(lowered, i, 'script'):
+            body_start = _tag_end(text, i + 7)
+            attributes = _attributes(text[i + 7:body_start - 1].rstrip('/'))
+            body_end = lowered.find('</script', body_start)
+            if body_end < 0:
+                body_end = end = n
+            else:
+                end = _tag_end(text, body_end + 8)
+            body = text[body_start:body_end]
+            events = [match.group(3) for match in _GTAG_EVENT.finditer(body)]
+            blocks.append(ScriptBlock(i, end, body, attributes, events))
+            i = end
+        else:
+            i += 1
+        i = lowered.find('<', i)
+    return blocks
+
+
+def select(blocks, event=None, inline_only=True, contains=None):
+    """Blocks that fire gtag ``event`` (any block if None), optionally requiring ``contains`` in the body."""
+    return [
+        block for block in blocks
+        if (not inline_only or block.inline)
+        and (event is None or event in block.events)
+        and (contains is None or contains in block.body)
+    ]
+
+
+def replace_blocks(text, blocks, replacement=''):
+    """``text`` with each of ``blocks`` (in order, non-overlapping) replaced, in one join."""
+    parts = []
+    position = 0
+    for block in blocks:
+        parts.append(text[position:block.start])
+        parts.append(replacement)
+        position = block.end
+    parts.append(text[position:])
+    return ''.join(parts)
+
+
+def remove_event_scripts(text, event, replacement='', inline_only=True, contains=None):
+    """Replace the scripts in ``text`` that fire gtag ``event``; returns the new text."""
+    return replace_blocks(text, select(script_blocks(text), event, inline_only, contains), replacement)
+
+
+# --- benchmark ---------------------------------------------------------------
+
+_LEGACY_PATTERNS = {
+    'remove_quote_tracking': re.compile(
+        r"<script is:inline>.*?window\.gtag\('event', 'quote_request'.*?</script>", re.DOTALL),
+    'fix_location_tracking': re.compile(
+        r'<script is:inline>\s*document\.getElementById\([^)]+\)\?\.addEventListener\([^}]+\}\s*\);\s*</script>',
+        re.DOTALL),
+}
+
+_FILLER = """
+    <section class="py-16 bg-white">
+      <h2 class="text-3xl font-bold">Landscaping in {n}</h2>
+      <p>Garden design, driveways, fencing and groundworks across the area, İnchinnan to Ayr.</p>
+    </section>
+"""
+_OTHER_SCRIPT = """
+    <script is:inline>
+      document.getElementById('call-{n}')?.addEventListener('click', () => {{
+        if (typeof window !== 'undefined' && window.gtag) {{
+          window.gtag('event', 'phone_click', {{ source: 'location_{n}' }});
+        }}
+      }});
+    </script>
+"""
+_QUOTE_SCRIPT = """
+    <script is:inline>
+      document.getElementById('quote-{n}')?.addEventListener('click', () => {{
+        if (typeof window !== 'undefined' && window.gtag) {{
+          window.gtag('event', 'quote_request', {{
+            event_category: 'engagement',
+            source: 'location_{n}_cta'
+          }});
+        }}
+      }});
+    </script>
+"""
+
+
+def synthetic_page(size_bytes, quote_every=50):
+    """An .astro-like page of about ``size_bytes`` full of inline scripts.
+
+    Every ``quote_every``-th script fires quote_request; 0 means none do,
+    the worst case for the lazy DOTALL regex.
+    """
+    parts = ["---\nimport Layout from '../../layouts/Layout.astro';\n---\n<Layout>\n"]
+    total = 0
+    n = 0
+    while total < size_bytes:
+        chunk = _FILLER.format(n=n) + (_QUOTE_SCRIPT if quote_every and n % quote_every == 0 else _OTHER_SCRIPT).format(n=n)
+        parts.append(chunk)
+        total += len(chunk)
+        n += 1
+    parts.append("</Layout>\n")
+    return ''.join(parts)
+
+
+def benchmark(sizes_mb, regex_max_mb=1.0, shapes=(('mixed', 50), ('no target', 0))):
+    """Time the scanner and the legacy regexes; one row per (shape, size).
+
+    'intact' checks that removing the found blocks leaves the rest of the
+    page alone.  For the regexes 'swallowed' counts matches spanning more than one
+    <script> block, i.e. matches that would delete unrelated scripts.
+    """
+    rows = []
+    for shape, quote_every in shapes:
+        for size in sizes_mb:
+            text = synthetic_page(int(size * 1024 * 1024), quote_every)
+            started = time.perf_counter()
+            blocks = select(script_blocks(text), 'quote_request')
+            row = {'shape': shape, 'size_mb': size, 'blocks': len(blocks),
+                   'expected': text.count("'quote_request'"),
+                   'tokenizer_seconds': time.perf_counter() - started}
+            # Removing them must leave every other script and section (with its non-ASCII text) in place
+            remaining = replace_blocks(text, blocks)
+            row['intact'] = (remaining.count('<section') == text.count('<section')
+                             and remaining.count('<script') == text.count('<script') - len(blocks)
+                             and remaining.count('İnchinnan') == text.count('İnchinnan'))
+            for name, pattern in _LEGACY_PATTERNS.items():
+                if size > regex_max_mb:
+                    row[name] = None
+                    continue
+                started = time.perf_counter()
+                matches = pattern.findall(text)
+                swallowed = sum(1 for match in matches if match.count('<script') > 1)
+                row[name] = (time.perf_counter() - started, len(matches), swallowed)
+            rows.append(row)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="List <script> blocks and their gtag events, or benchmark the scanner.")
+    parser.add_argument('files', nargs='*', help=".astro/.html files to scan")
+    parser.add_argument('--benchmark', action='store_true',
+                        help="time the scanner against the old regexes on synthetic pages")
+    parser.add_argument('--size-mb', type=float, nargs='+', default=[0.25, 0.5, 4, 16],
+                        help="synthetic page sizes for --benchmark (default: %(default)s)")
+    parser.add_argument('--regex-max-mb', type=float, default=0.5,
+                        help="largest page to run the (quadratic) regexes on (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        print(f"{'page':<10} {'size MB':>8} {'tokenizer':>10} {'found':>6} {'expect':>6} {'intact':>6}"
+              "  legacy regexes (seconds/matches/swallowed)")
+        for row in benchmark(args.size_mb, args.regex_max_mb):
+            legacy = '  '.join(
+                f"{name}: " + ('skipped' if row[name] is None else "{:.3f}s/{}/{}".format(*row[name]))
+                for name in _LEGACY_PATTERNS)
+            print(f"{row['shape']:<10} {row['size_mb']:>8} {row['tokenizer_seconds']:>9.3f}s "
+                  f"{row['blocks']:>6} {row['expected']:>6} {'yes' if row['intact'] else 'NO':>6}  {legacy}")
+        return 0
+
+    if not args.files:
+        parser.error("give files to scan, or --benchmark")
+    for path in args.files:
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        print(path)
+        for block in script_blocks(text):
+            line = text.count('\n', 0, block.start) + 1
+            kind = 'inline' if block.inline else 'bundled'
+            print(f"  line {line:>5}  {kind:<7}  {', '.join(block.events) or '-'}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,361 +1,728 @@
-import pandas as pd
-import numpy as np
-from collections import Counter
+"""
+Print a full SEO audit of a Screaming Frog crawl export.
+
+The audit itself needs only the standard library: the export is read
+through lazy_csv (or crawl_cache), keeping just the columns the rules and
+report use, into a small column-oriented Table.  pandas is imported only
+when a DataFrame is passed in or asked for (Table.to_frame()), so a CI run
+on a deploy preview starts in a few tens of milliseconds.  NumPy, when
+installed, is imported to evaluate the rules as whole-column comparisons.
+
+Usage:
+    python seo_audit_analysis.py internal_all.csv
+    python seo_audit_analysis.py internal_all.csv --rules rules.json --issues-csv issues.csv
+"""
+
+import argparse
+import csv
+import heapq
 import json
+import math
+import operator
+import sys
+import time
+from array import array
+from itertools import compress
+
+import crawl_cache
+import lazy_csv
+
+# Cells pd.read_csv reads as NaN by default
+NA_VALUES = frozenset([
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+])
+
+
+def _parse_column(values):
+    """Type one column of CSV text as pd.read_csv would: numbers if every value parses, else text.
+
+    Blank cells become None either way.
+    """
+    values = [None if value in NA_VALUES else value for value in values]
+    try:
+        return [None if value is None else int(value) for value in values]
+    except ValueError:
+        pass
+    try:
+        return [None if value is None else float(value) for value in values]
+    except ValueError:
+        return values
+
+
+class Table:
+    """A column-oriented slice of a crawl: ``columns[name]`` holds one value per row.
+
+    Numeric columns hold int/float and text columns str, with None for
+    blank cells.  Just enough of a DataFrame for the audit: row selection,
+    nsmallest/nlargest and plain dict records.
+    """
+
+    def __init__(self, columns, length=None):
+        self.columns = columns
+        self.length = length if length is not None else len(next(iter(columns.values()), ()))
+
+    def __len__(self):
+        return self.length
+
+    def __contains__(self, name):
+        return name in self.columns
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __setitem__(self, name, values):
+        self.columns[name] = values
+
+    def take(self, indices):
+        """A new Table of the rows at ``indices``, in that order."""
+        return Table({name: [values[i] for i in indices] for name, values in self.columns.items()},
+                     len(indices))
+
+    def where(self, mask):
+        """The rows where ``mask`` (one truth value per row) is true."""
+        return self.take(list(compress(range(self.length), mask)))
+
+    def head(self, n=5):
+        return self.take(range(min(n, self.length)))
+
+    def nsmallest(self, n, column):
+        """The ``n`` rows with the smallest ``column``, ties in row order; blanks are skipped."""
+        values = self.columns[column]
+        rows = [i for i in range(self.length) if values[i] is not None]
+        return self.take(heapq.nsmallest(n, rows, key=values.__getitem__))
+
+    def nlargest(self, n, column):
+        values = self.columns[column]
+        rows = [i for i in range(self.length) if values[i] is not None]
+        return self.take(heapq.nlargest(n, rows, key=values.__getitem__))
+
+    def records(self):
+        """Rows as plain dicts."""
+        names = list(self.columns)
+        return [dict(zip(names, row)) for row in zip(*self.columns.values())]
+
+    def to_frame(self):
+        """The same rows as a pandas DataFrame (imports pandas)."""
+        import pandas as pd
+        return pd.DataFrame({name: [math.nan if value is None else value for value in values]
+                             for name, values in self.columns.items()})
+
+    @classmethod
+    def from_frame(cls, frame):
+        return cls({name: [None if value != value else value for value in frame[name].tolist()]
+                    for name in frame.columns}, len(frame))
+
+
+def load_crawl(source, cache_dir=None, columns=None):
+    """Return the crawl as a Table; ``source`` is a CSV path, a Table or a pandas DataFrame.
+
+    Only ``columns`` are kept (all of them if None).  With ``cache_dir``
+    the columns come from crawl_cache's memory-mapped files rather than
+    re-parsing the CSV.
+    """
+    if isinstance(source, Table):
+        return source
+    pandas = sys.modules.get('pandas')
+    if pandas is not None and isinstance(source, pandas.DataFrame):
+        return Table.from_frame(source)
+    if cache_dir is not None:
+        crawl = crawl_cache.load(source, cache_dir)
+        names = [name for name in (columns or crawl.header) if name in crawl.columns]
+        return Table({name: [None if value == '' else value for value in crawl.column_values(name)]
+                      for name in names}, len(crawl))
+    with lazy_csv.LazyCSV(source) as crawl:
+        names = [name for name in (columns or crawl.header) if name in crawl.index]
+        rows = [record.values for record in crawl.records(names)]
+        length = len(rows)
+        if len(names) == 1:
+            text = [[row[0] for row in rows]]
+        else:
+            text = list(zip(*rows)) or [()] * len(names)
+        return Table({name: _parse_column(values) for name, values in zip(names, text)}, length)
+
+
+def duplicate_groups(pages, column):
+    """Every value of ``column`` shared by several pages, mapped to all of their URLs.
+
+    Built in one pass over the column rather than re-filtering the pages
+    for each duplicated value, and ordered most-duplicated first like
+    value_counts().
+    """
+    groups = {}
+    for value, url in zip(pages[column], pages['Address']):
+        if value is not None and value != '':
+            groups.setdefault(value, []).append(url)
+    ranked = sorted((urls for urls in groups.items() if len(urls[1]) > 1),
+                    key=lambda item: len(item[1]), reverse=True)
+    return dict(ranked)
+
+
+# Every per-page check as data: a row is flagged when ``column op value`` holds
+# within ``scope`` ('ok' = HTML 200s, 'redirect' = 3xx, None = every HTML row).
+# Numeric blanks count as 0; 'missing' means the text is blank or its
+# '<column> Length' is 0.  Order fixes each rule's bit in 'Issue Bits'.
+RULES = [
+    # 1. Thin content detection
+    {'name': 'thin_content', 'column': 'Word Count', 'op': '<', 'value': 300, 'scope': 'ok'},
+    {'name': 'low_text_ratio', 'column': 'Text Ratio', 'op': '<', 'value': 5, 'scope': 'ok'},
+    {'name': 'missing_h1', 'column': 'H1-1', 'op': 'missing', 'scope': 'ok'},
+    {'name': 'missing_h2', 'column': 'H2-1', 'op': 'missing', 'scope': 'ok'},
+    {'name': 'short_meta', 'column': 'Meta Description 1 Length', 'op': 'between', 'value': [0, 120], 'scope': 'ok'},
+    {'name': 'short_titles', 'column': 'Title 1 Length', 'op': 'between', 'value': [0, 30], 'scope': 'ok'},
+    # 3. Internal link structure
+    {'name': 'excessive_outlinks', 'column': 'Outlinks', 'op': '>', 'value': 100, 'scope': 'ok'},
+    {'name': 'orphaned', 'column': 'Inlinks', 'op': '==', 'value': 0, 'scope': 'ok'},
+    {'name': 'few_inlinks', 'column': 'Inlinks', 'op': 'between', 'value': [0, 3], 'scope': 'ok'},
+    {'name': 'deep_pages', 'column': 'Crawl Depth', 'op': '>', 'value': 3, 'scope': 'ok'},
+    # 4. Redirects
+    {'name': 'redirects', 'column': 'Status Code', 'op': 'in', 'value': [301, 302, 307, 308], 'scope': None},
+    {'name': 'temp_redirects', 'column': 'Status Code', 'op': '==', 'value': 302, 'scope': 'redirect'},
+    {'name': 'slow_redirects', 'column': 'Response Time', 'op': '>', 'value': 0.5, 'scope': 'redirect'},
+    # 5. 404s
+    {'name': 'not_found', 'column': 'Status Code', 'op': '==', 'value': 404, 'scope': None},
+    {'name': 'potential_broken_links', 'column': 'Outlinks', 'op': '>', 'value': 0, 'scope': None},
+    # 6. Meta descriptions
+    {'name': 'no_meta', 'column': 'Meta Description 1', 'op': 'missing', 'scope': 'ok'},
+    {'name': 'long_meta_desc', 'column': 'Meta Description 1 Length', 'op': '>', 'value': 160, 'scope': 'ok'},
+]
+
+REDIRECT_CODES = [301, 302, 307, 308]
+
+
+def load_rules(path, rules=RULES):
+    """``rules`` overridden by a JSON list of rule dicts, matched on 'name'.
+
+    A partial entry such as {"name": "thin_content", "value": 500} only
+    changes that field; entries with a new name are appended.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        overrides = json.load(f)
+    merged = [dict(rule) for rule in rules]
+    by_name = {rule['name']: rule for rule in merged}
+    for override in overrides:
+        if override['name'] in by_name:
+            by_name[override['name']].update(override)
+        else:
+            merged.append(dict(override))
+    return merged
+
+
+_COMPARE = {
+    '<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge,
+    '==': operator.eq, '!=': operator.ne,
+}
+
 
-# Load the CSV file
-df = pd.read_csv('internal_all.csv')
-
-# Filter to only HTML pages (exclude images, CSS, etc.)
-html_pages = df[df['Content Type'].str.contains('text/html', na=False)].copy()
-
-print("=" * 80)
-print("COMPREHENSIVE SEO AUDIT REPORT - DIRTWORKS LANDSCAPING")
-print("=" * 80)
-print(f"\nTotal URLs Crawled: {len(df)}")
-print(f"HTML Pages Analyzed: {len(html_pages)}")
-print(f"Analysis Date: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-
-# ============================================================================
-# 1. THIN CONTENT DETECTION
-# ============================================================================
-print("\n" + "=" * 80)
-print("1. THIN CONTENT DETECTION")
-print("=" * 80)
-
-# Pages with word count under 300
-thin_content = html_pages[html_pages['Word Count'].fillna(0) < 300].copy()
-thin_content = thin_content[thin_content['Status Code'] == 200]  # Only 200 OK pages
-
-print(f"\n[STATS] Pages with Word Count < 300: {len(thin_content)}")
-if len(thin_content) > 0:
-    print("\nTop 10 Thin Content Pages:")
-    thin_sorted = thin_content.nsmallest(10, 'Word Count')[['Address', 'Word Count', 'Title 1']]
-    for idx, row in thin_sorted.iterrows():
-        print(f"  • {row['Address']}")
-        print(f"    Word Count: {int(row['Word Count'])}, Title: {row['Title 1'][:60] if pd.notna(row['Title 1']) else 'N/A'}")
-
-# Low text ratio (content-to-code ratio)
-low_text_ratio = html_pages[html_pages['Text Ratio'].fillna(0) < 5].copy()
-low_text_ratio = low_text_ratio[low_text_ratio['Status Code'] == 200]
-
-print(f"\n[STATS] Pages with Text Ratio < 5%: {len(low_text_ratio)}")
-if len(low_text_ratio) > 0:
-    print("\nTop 10 Low Text Ratio Pages:")
-    ratio_sorted = low_text_ratio.nsmallest(10, 'Text Ratio')[['Address', 'Text Ratio', 'Word Count']]
-    for idx, row in ratio_sorted.iterrows():
-        print(f"  • {row['Address']}")
-        print(f"    Text Ratio: {row['Text Ratio']:.2f}%, Word Count: {int(row['Word Count']) if pd.notna(row['Word Count']) else 0}")
-
-# Missing or sparse H1/H2 tags
-missing_h1 = html_pages[(html_pages['H1-1'].isna()) | (html_pages['H1-1 Length'].fillna(0) == 0)].copy()
-missing_h1 = missing_h1[missing_h1['Status Code'] == 200]
-
-print(f"\n[STATS] Pages Missing H1 Tags: {len(missing_h1)}")
-if len(missing_h1) > 0:
-    print("\nPages without H1:")
-    for idx, row in missing_h1.head(10).iterrows():
-        print(f"  • {row['Address']}")
-
-missing_h2 = html_pages[(html_pages['H2-1'].isna()) | (html_pages['H2-1 Length'].fillna(0) == 0)].copy()
-missing_h2 = missing_h2[missing_h2['Status Code'] == 200]
-
-print(f"\n[STATS] Pages Missing H2 Tags: {len(missing_h2)}")
-if len(missing_h2) > 0:
-    print("\nTop 10 Pages without H2:")
-    for idx, row in missing_h2.head(10).iterrows():
-        print(f"  • {row['Address']}")
-
-# Short meta descriptions
-short_meta = html_pages[(html_pages['Meta Description 1 Length'].fillna(0) < 120) & 
-                        (html_pages['Meta Description 1 Length'].fillna(0) > 0)].copy()
-short_meta = short_meta[short_meta['Status Code'] == 200]
-
-print(f"\n[STATS] Pages with Meta Descriptions < 120 characters: {len(short_meta)}")
-if len(short_meta) > 0:
-    print("\nTop 10 Short Meta Descriptions:")
-    short_sorted = short_meta.nsmallest(10, 'Meta Description 1 Length')[['Address', 'Meta Description 1 Length', 'Meta Description 1']]
-    for idx, row in short_sorted.iterrows():
-        desc = row['Meta Description 1'][:80] if pd.notna(row['Meta Description 1']) else 'N/A'
-        print(f"  • {row['Address']}")
-        print(f"    Length: {int(row['Meta Description 1 Length'])}, Description: {desc}...")
-
-# Short titles
-short_titles = html_pages[(html_pages['Title 1 Length'].fillna(0) < 30) & 
-                          (html_pages['Title 1 Length'].fillna(0) > 0)].copy()
-short_titles = short_titles[short_titles['Status Code'] == 200]
-
-print(f"\n[STATS] Pages with Titles < 30 characters: {len(short_titles)}")
-if len(short_titles) > 0:
-    print("\nPages with Short Titles:")
-    for idx, row in short_titles.head(10).iterrows():
-        title = row['Title 1'] if pd.notna(row['Title 1']) else 'N/A'
-        print(f"  • {row['Address']}")
-        print(f"    Title ({int(row['Title 1 Length'])} chars): {title}")
-
-# ============================================================================
-# 2. DUPLICATE CONTENT ISSUES
-# ============================================================================
-print("\n" + "=" * 80)
-print("2. DUPLICATE CONTENT ISSUES")
-print("=" * 80)
-
-# Duplicate titles
-title_counts = html_pages[html_pages['Status Code'] == 200]['Title 1'].value_counts()
-duplicate_titles = title_counts[title_counts > 1]
-
-print(f"\n[STATS] Duplicate Page Titles: {len(duplicate_titles)} unique titles appearing multiple times")
-if len(duplicate_titles) > 0:
-    print("\nTop 10 Most Duplicated Titles:")
-    for title, count in duplicate_titles.head(10).items():
-        if pd.notna(title) and title:
-            print(f"  • '{title[:70]}' appears {count} times")
+def _number(value):
+    # pd.to_numeric(errors='coerce').fillna(0)
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        try:
+            value = float(value)
+        except ValueError:
+            return 0
+    return 0 if value != value else value
+
+
+def rule_columns(rules=RULES):
+    """Every column ``rules`` read, including the '<column> Length' a 'missing' rule checks."""
+    columns = ['Status Code']
+    for rule in rules:
+        columns.append(rule['column'])
+        if rule['op'] == 'missing':
+            columns.append(f"{rule['column']} Length")
+    return columns
+
+
+def evaluate_rules(pages, rules=RULES):
+    """Evaluate every rule over ``pages`` (a Table); returns an array('Q') bitmask per row.
+
+    Bit n is set where rules[n] fires.  Each column is converted to numbers
+    once however many rules read it.  With NumPy installed each rule is one
+    whole-column comparison; without it, one pass over the column in Python.
+    """
+    if len(rules) > 64:
+        raise ValueError(f"at most 64 rules fit in the issue bitmask, got {len(rules)}")
+    try:
+        import numpy
+    except ImportError:
+        return _evaluate_rules_python(pages, rules)
+    return _evaluate_rules_numpy(numpy, pages, rules)
+
+
+def _evaluate_rules_numpy(np, pages, rules):
+    length = len(pages)
+    numeric = {}
+
+    def number(column):
+        if column not in numeric:
+            if column not in pages:
+                values = np.zeros(length)
+            else:
+                try:
+                    # None and numeric text convert in C; NaN counts as 0 like _number
+                    values = np.array(pages[column], dtype=float)
+                    values[np.isnan(values)] = 0
+                except (TypeError, ValueError):
+                    values = np.fromiter((_number(value) for value in pages[column]), float, length)
+            numeric[column] = values
+        return numeric[column]
+
+    def missing(column):
+        if column not in pages:
+            return np.ones(length, dtype=bool)
+        text = np.array(pages[column], dtype=object)
+        blank = np.equal(text, None).astype(bool) | (text == '')
+        length_column = f"{column} Length"
+        return blank | (number(length_column) == 0) if length_column in pages else blank
+
+    status = number('Status Code')
+    scopes = {
+        None: np.ones(length, dtype=bool),
+        'ok': status == 200,
+        'redirect': np.isin(status, REDIRECT_CODES),
+    }
+    bits = np.zeros(length, dtype=np.uint64)
+    for n, rule in enumerate(rules):
+        op, value = rule['op'], rule.get('value')
+        if op == 'missing':
+            mask = missing(rule['column'])
+        elif op == 'between':
+            values = number(rule['column'])
+            mask = (values > value[0]) & (values < value[1])
+        elif op == 'in':
+            mask = np.isin(number(rule['column']), value)
+        elif op in _COMPARE:
+            mask = _COMPARE[op](number(rule['column']), value)
+        else:
+            raise ValueError(f"unknown op {op!r} in rule {rule['name']!r}")
+        bits |= (mask & scopes[rule.get('scope')]).astype(np.uint64) << np.uint64(n)
+    result = array('Q')
+    result.frombytes(bits.tobytes())
+    return result
+
+
+def _evaluate_rules_python(pages, rules):
+    length = len(pages)
+    numeric = {}
+
+    def number(column):
+        if column not in numeric:
+            numeric[column] = [_number(value) for value in pages[column]] if column in pages else [0] * length
+        return numeric[column]
+
+    def missing(column):
+        text = pages[column] if column in pages else [None] * length
+        blank = [value is None or value == '' for value in text]
+        length_column = f"{column} Length"
+        if length_column in pages:
+            return [is_blank or size == 0 for is_blank, size in zip(blank, number(length_column))]
+        return blank
+
+    status = number('Status Code')
+    redirect_codes = set(REDIRECT_CODES)
+    scopes = {
+        None: None,
+        'ok': [code == 200 for code in status],
+        'redirect': [code in redirect_codes for code in status],
+    }
+    bits = [0] * length
+    for n, rule in enumerate(rules):
+        op, value = rule['op'], rule.get('value')
+        if op == 'missing':
+            mask = missing(rule['column'])
+        elif op == 'between':
+            low, high = value
+            mask = [low < number_ < high for number_ in number(rule['column'])]
+        elif op == 'in':
+            value = set(value)
+            mask = [number_ in value for number_ in number(rule['column'])]
+        elif op in _COMPARE:
+            compare = _COMPARE[op]
+            mask = [compare(number_, value) for number_ in number(rule['column'])]
+        else:
+            raise ValueError(f"unknown op {op!r} in rule {rule['name']!r}")
+        scope = scopes[rule.get('scope')]
+        if scope is not None:
+            mask = [fires and in_scope for fires, in_scope in zip(mask, scope)]
+        flag = 1 << n
+        for i in compress(range(length), mask):
+            bits[i] |= flag
+    return array('Q', bits)
+
+
+def issue_names(bits, rules=RULES):
+    """The rule names set in one 'Issue Bits' value."""
+    return [rule['name'] for n, rule in enumerate(rules) if int(bits) >> n & 1]
+
+
+# Columns the report prints or groups on, besides those the rules read
+REPORT_COLUMNS = [
+    'Address', 'Content Type', 'Status Code', 'Title 1', 'Title 1 Length', 'Word Count',
+    'Text Ratio', 'Meta Description 1', 'Meta Description 1 Length', 'Outlinks',
+    'Unique Outlinks', 'Inlinks', 'Crawl Depth', 'Redirect URL', 'Response Time', 'Hash',
+]
+
+
+def run_audit(source, cache_dir=None, rules=RULES):
+    """Run every audit section over a crawl and return the results.
+
+    The result maps each section name to a Table of offending rows (or,
+    for the duplicate sections, a dict of value -> URLs), plus 'html_pages'
+    and 'summary'.  Only the columns the rules and the report use are read.
+    Nothing is printed, so a warm process can audit many crawls in a row.
+    """
+    df = load_crawl(source, cache_dir, list(dict.fromkeys(REPORT_COLUMNS + rule_columns(rules))))
+
+    # Filter to only HTML pages (exclude images, CSS, etc.)
+    content_types = df['Content Type'] if 'Content Type' in df else [None] * len(df)
+    html_pages = df.where([isinstance(value, str) and 'text/html' in value for value in content_types])
+    ok = [code == 200 for code in html_pages['Status Code']]
+    results = {'df': df, 'html_pages': html_pages}
+
+    bits = evaluate_rules(html_pages, rules)
+    html_pages['Issue Bits'] = bits
+    for n, rule in enumerate(rules):
+        flag = 1 << n
+        results[rule['name']] = html_pages.where([value & flag for value in bits])
+    results['short_meta_desc'] = results['short_meta']
+    results['rules'] = rules
+
+    # Duplicate content issues
+    live_pages = html_pages.where(ok)
+    results['duplicate_titles'] = duplicate_groups(live_pages, 'Title 1')
+    results['duplicate_meta'] = duplicate_groups(live_pages, 'Meta Description 1')
+    # Near duplicate content (using hash)
+    results['duplicate_hashes'] = duplicate_groups(live_pages, 'Hash')
+
+    results['summary'] = {
+        'Total Pages': sum(ok),
+        'Thin Content (< 300 words)': len(results['thin_content']),
+        'Missing H1 Tags': len(results['missing_h1']),
+        'Missing H2 Tags': len(results['missing_h2']),
+        'Duplicate Titles': len(results['duplicate_titles']),
+        'Duplicate Meta Descriptions': len(results['duplicate_meta']),
+        'Orphaned Pages (0 inlinks)': len(results['orphaned']),
+        'Pages with < 3 Inlinks': len(results['few_inlinks']),
+        'Deep Pages (Depth > 3)': len(results['deep_pages']),
+        'Temporary Redirects (302)': len(results['temp_redirects']),
+        '404 Errors': len(results['not_found']),
+        'Missing Meta Descriptions': len(results['no_meta']),
+        'Short Meta Descriptions (< 120 chars)': len(results['short_meta_desc']),
+        'Long Meta Descriptions (> 160 chars)': len(results['long_meta_desc'])
+    }
+    return results
+
+
+def write_issues_csv(results, path):
+    """One line per HTML URL: its 'Issue Bits' and the names of the rules that fired."""
+    pages = results['html_pages']
+    names = {}
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(['Address', 'Issue Bits', 'Issues'])
+        for address, bits in zip(pages['Address'], pages['Issue Bits']):
+            if bits not in names:
+                names[bits] = ';'.join(issue_names(bits, results['rules']))
+            writer.writerow([address, bits, names[bits]])
+
+
+def _section(title):
+    print("\n" + "=" * 80)
+    print(title)
+    print("=" * 80)
+
+
+def print_report(results, all_groups=False):
+    df = results['df']
+    html_pages = results['html_pages']
+
+    print("=" * 80)
+    print("COMPREHENSIVE SEO AUDIT REPORT - DIRTWORKS LANDSCAPING")
+    print("=" * 80)
+    print(f"\nTotal URLs Crawled: {len(df)}")
+    print(f"HTML Pages Analyzed: {len(html_pages)}")
+    print(f"Analysis Date: {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+
+    # ========================================================================
+    # 1. THIN CONTENT DETECTION
+    # ========================================================================
+    _section("1. THIN CONTENT DETECTION")
+
+    thin_content = results['thin_content']
+    print(f"\n[STATS] Pages with Word Count < 300: {len(thin_content)}")
+    if len(thin_content) > 0:
+        print("\nTop 10 Thin Content Pages:")
+        thin_sorted = thin_content.nsmallest(10, 'Word Count')
+        for row in thin_sorted.records():
+            print(f"  • {row['Address']}")
+            print(f"    Word Count: {int(row['Word Count'])}, Title: {row['Title 1'][:60] if row['Title 1'] is not None else 'N/A'}")
+
+    low_text_ratio = results['low_text_ratio']
+    print(f"\n[STATS] Pages with Text Ratio < 5%: {len(low_text_ratio)}")
+    if len(low_text_ratio) > 0:
+        print("\nTop 10 Low Text Ratio Pages:")
+        ratio_sorted = low_text_ratio.nsmallest(10, 'Text Ratio')
+        for row in ratio_sorted.records():
+            print(f"  • {row['Address']}")
+            print(f"    Text Ratio: {row['Text Ratio']:.2f}%, Word Count: {int(row['Word Count']) if row['Word Count'] is not None else 0}")
+
+    missing_h1 = results['missing_h1']
+    print(f"\n[STATS] Pages Missing H1 Tags: {len(missing_h1)}")
+    if len(missing_h1) > 0:
+        print("\nPages without H1:")
+        for row in missing_h1.head(10).records():
+            print(f"  • {row['Address']}")
+
+    missing_h2 = results['missing_h2']
+    print(f"\n[STATS] Pages Missing H2 Tags: {len(missing_h2)}")
+    if len(missing_h2) > 0:
+        print("\nTop 10 Pages without H2:")
+        for row in missing_h2.head(10).records():
+            print(f"  • {row['Address']}")
+
+    short_meta = results['short_meta']
+    print(f"\n[STATS] Pages with Meta Descriptions < 120 characters: {len(short_meta)}")
+    if len(short_meta) > 0:
+        print("\nTop 10 Short Meta Descriptions:")
+        short_sorted = short_meta.nsmallest(10, 'Meta Description 1 Length')
+        for row in short_sorted.records():
+            desc = row['Meta Description 1'][:80] if row['Meta Description 1'] is not None else 'N/A'
+            print(f"  • {row['Address']}")
+            print(f"    Length: {int(row['Meta Description 1 Length'])}, Description: {desc}...")
+
+    short_titles = results['short_titles']
+    print(f"\n[STATS] Pages with Titles < 30 characters: {len(short_titles)}")
+    if len(short_titles) > 0:
+        print("\nPages with Short Titles:")
+        for row in short_titles.head(10).records():
+            title = row['Title 1'] if row['Title 1'] is not None else 'N/A'
+            print(f"  • {row['Address']}")
+            print(f"    Title ({int(row['Title 1 Length'])} chars): {title}")
+
+    # ========================================================================
+    # 2. DUPLICATE CONTENT ISSUES
+    # ========================================================================
+    _section("2. DUPLICATE CONTENT ISSUES")
+
+    def shown(items, limit):
+        # --all-groups lifts the top-N truncation on groups and their URLs
+        items = list(items)
+        return items if all_groups else items[:limit]
+
+    duplicate_titles = results['duplicate_titles']
+    print(f"\n[STATS] Duplicate Page Titles: {len(duplicate_titles)} unique titles appearing multiple times")
+    if len(duplicate_titles) > 0:
+        print("\nAll Duplicated Titles:" if all_groups else "\nTop 10 Most Duplicated Titles:")
+        for title, urls in shown(duplicate_titles.items(), 10):
+            print(f"  • '{title[:70]}' appears {len(urls)} times")
             # Show URLs with this title
-            urls = html_pages[html_pages['Title 1'] == title]['Address'].head(3).tolist()
-            for url in urls:
+            for url in shown(urls, 3):
                 print(f"    - {url}")
 
-# Duplicate meta descriptions
-meta_counts = html_pages[html_pages['Status Code'] == 200]['Meta Description 1'].value_counts()
-duplicate_meta = meta_counts[meta_counts > 1]
-
-print(f"\n[STATS] Duplicate Meta Descriptions: {len(duplicate_meta)} unique descriptions appearing multiple times")
-if len(duplicate_meta) > 0:
-    print("\nTop 10 Most Duplicated Meta Descriptions:")
-    for desc, count in duplicate_meta.head(10).items():
-        if pd.notna(desc) and desc:
-            print(f"  • '{desc[:60]}...' appears {count} times")
-            urls = html_pages[html_pages['Meta Description 1'] == desc]['Address'].head(2).tolist()
-            for url in urls:
+    duplicate_meta = results['duplicate_meta']
+    print(f"\n[STATS] Duplicate Meta Descriptions: {len(duplicate_meta)} unique descriptions appearing multiple times")
+    if len(duplicate_meta) > 0:
+        print("\nAll Duplicated Meta Descriptions:" if all_groups else "\nTop 10 Most Duplicated Meta Descriptions:")
+        for desc, urls in shown(duplicate_meta.items(), 10):
+            print(f"  • '{desc[:60]}...' appears {len(urls)} times")
+            for url in shown(urls, 2):
                 print(f"    - {url}")
 
-# Near duplicate content (using hash)
-hash_counts = html_pages[html_pages['Status Code'] == 200]['Hash'].value_counts()
-duplicate_hashes = hash_counts[hash_counts > 1]
-
-print(f"\n[STATS] Pages with Identical Content (Hash): {len(duplicate_hashes)} unique hashes appearing multiple times")
-if len(duplicate_hashes) > 0:
-    print("\nDuplicate Content Groups:")
-    for hash_val, count in duplicate_hashes.head(5).items():
-        if pd.notna(hash_val) and hash_val:
-            print(f"  • Hash appears {count} times:")
-            urls = html_pages[html_pages['Hash'] == hash_val]['Address'].head(3).tolist()
-            for url in urls:
+    duplicate_hashes = results['duplicate_hashes']
+    print(f"\n[STATS] Pages with Identical Content (Hash): {len(duplicate_hashes)} unique hashes appearing multiple times")
+    if len(duplicate_hashes) > 0:
+        print("\nDuplicate Content Groups:")
+        for hash_val, urls in shown(duplicate_hashes.items(), 5):
+            print(f"  • Hash appears {len(urls)} times:")
+            for url in shown(urls, 3):
                 print(f"    - {url}")
 
-# ============================================================================
-# 3. INTERNAL LINK STRUCTURE ANALYSIS
-# ============================================================================
-print("\n" + "=" * 80)
-print("3. INTERNAL LINK STRUCTURE ANALYSIS")
-print("=" * 80)
-
-# Pages with excessive outbound links
-excessive_outlinks = html_pages[html_pages['Outlinks'].fillna(0) > 100].copy()
-excessive_outlinks = excessive_outlinks[excessive_outlinks['Status Code'] == 200]
-
-print(f"\n[STATS] Pages with > 100 Outbound Links: {len(excessive_outlinks)}")
-if len(excessive_outlinks) > 0:
-    print("\nTop 10 Pages with Most Outbound Links:")
-    outlink_sorted = excessive_outlinks.nlargest(10, 'Outlinks')[['Address', 'Outlinks', 'Unique Outlinks']]
-    for idx, row in outlink_sorted.iterrows():
-        print(f"  • {row['Address']}")
-        print(f"    Total Outlinks: {int(row['Outlinks'])}, Unique: {int(row['Unique Outlinks'])}")
-
-# Orphaned pages (no inbound links)
-orphaned = html_pages[(html_pages['Inlinks'].fillna(0) == 0) & 
-                      (html_pages['Status Code'] == 200)].copy()
-
-print(f"\n[STATS] Orphaned Pages (0 Inbound Links): {len(orphaned)}")
-if len(orphaned) > 0:
-    print("\nOrphaned Pages:")
-    for idx, row in orphaned.head(15).iterrows():
-        title = row['Title 1'][:50] if pd.notna(row['Title 1']) else 'N/A'
-        print(f"  • {row['Address']} - {title}")
-
-# Pages with very few inbound links
-few_inlinks = html_pages[(html_pages['Inlinks'].fillna(0) < 3) & 
-                         (html_pages['Inlinks'].fillna(0) > 0) &
-                         (html_pages['Status Code'] == 200)].copy()
-
-print(f"\n[STATS] Pages with < 3 Inbound Links: {len(few_inlinks)}")
-if len(few_inlinks) > 0:
-    print("\nTop 15 Pages with Few Inbound Links:")
-    inlink_sorted = few_inlinks.nsmallest(15, 'Inlinks')[['Address', 'Inlinks', 'Title 1']]
-    for idx, row in inlink_sorted.iterrows():
-        title = row['Title 1'][:50] if pd.notna(row['Title 1']) else 'N/A'
-        print(f"  • {row['Address']} ({int(row['Inlinks'])} inlinks) - {title}")
-
-# Pages buried too deep (crawl depth > 3)
-deep_pages = html_pages[html_pages['Crawl Depth'].fillna(0) > 3].copy()
-deep_pages = deep_pages[deep_pages['Status Code'] == 200]
-
-print(f"\n[STATS] Pages with Crawl Depth > 3: {len(deep_pages)}")
-if len(deep_pages) > 0:
-    print("\nDeep Pages (Crawl Depth > 3):")
-    depth_sorted = deep_pages.nlargest(15, 'Crawl Depth')[['Address', 'Crawl Depth', 'Title 1']]
-    for idx, row in depth_sorted.iterrows():
-        title = row['Title 1'][:50] if pd.notna(row['Title 1']) else 'N/A'
-        print(f"  • {row['Address']} (Depth: {int(row['Crawl Depth'])}) - {title}")
-
-# ============================================================================
-# 4. REDIRECT CHAIN PROBLEMS
-# ============================================================================
-print("\n" + "=" * 80)
-print("4. REDIRECT CHAIN PROBLEMS")
-print("=" * 80)
-
-# Find redirects
-redirects = html_pages[html_pages['Status Code'].isin([301, 302, 307, 308])].copy()
-
-print(f"\n[STATS] Total Redirects Found: {len(redirects)}")
-print(f"  • 301 (Permanent): {len(redirects[redirects['Status Code'] == 301])}")
-print(f"  • 302 (Temporary): {len(redirects[redirects['Status Code'] == 302])}")
-print(f"  • 307/308 (Other): {len(redirects[redirects['Status Code'].isin([307, 308])])}")
-
-# Temporary redirects that should be permanent
-temp_redirects = redirects[redirects['Status Code'] == 302]
-
-print(f"\n[STATS] Temporary Redirects (302) - Should be 301: {len(temp_redirects)}")
-if len(temp_redirects) > 0:
-    print("\nTemporary Redirects:")
-    for idx, row in temp_redirects.head(10).iterrows():
-        redirect_url = row['Redirect URL'] if pd.notna(row['Redirect URL']) else 'N/A'
-        print(f"  • {row['Address']} → {redirect_url}")
-
-# Slow redirects (response time > 0.5s)
-slow_redirects = redirects[redirects['Response Time'].fillna(0) > 0.5]
-
-print(f"\n[STATS] Slow Redirects (> 0.5s): {len(slow_redirects)}")
-if len(slow_redirects) > 0:
-    print("\nSlow Redirects:")
-    slow_sorted = slow_redirects.nlargest(10, 'Response Time')[['Address', 'Redirect URL', 'Response Time']]
-    for idx, row in slow_sorted.iterrows():
-        redirect_url = row['Redirect URL'] if pd.notna(row['Redirect URL']) else 'N/A'
-        print(f"  • {row['Address']} → {redirect_url} ({row['Response Time']:.3f}s)")
-
-# ============================================================================
-# 5. 404 ERROR DETECTION
-# ============================================================================
-print("\n" + "=" * 80)
-print("5. 404 ERROR DETECTION")
-print("=" * 80)
-
-# Find 404 pages
-not_found = html_pages[html_pages['Status Code'] == 404].copy()
-
-print(f"\n[STATS] Pages Returning 404: {len(not_found)}")
-if len(not_found) > 0:
-    print("\n404 Pages:")
-    for idx, row in not_found.iterrows():
-        print(f"  • {row['Address']}")
-
-# Find pages linking to 404s (this would require analyzing outlinks, simplified here)
-# Pages with high outlinks that might link to 404s
-potential_broken_links = html_pages[html_pages['Outlinks'].fillna(0) > 0].copy()
-
-print(f"\n[STATS] Note: To find internal links pointing to 404s, analyze the outlinks data")
-print(f"   Pages with outbound links: {len(potential_broken_links)}")
-
-# ============================================================================
-# 6. MISSING META DESCRIPTION ISSUES
-# ============================================================================
-print("\n" + "=" * 80)
-print("6. MISSING META DESCRIPTION ISSUES")
-print("=" * 80)
-
-# Pages without meta descriptions
-no_meta = html_pages[(html_pages['Meta Description 1'].isna()) | 
-                     (html_pages['Meta Description 1 Length'].fillna(0) == 0)].copy()
-no_meta = no_meta[no_meta['Status Code'] == 200]
-
-print(f"\n[STATS] Pages Without Meta Descriptions: {len(no_meta)}")
-if len(no_meta) > 0:
-    print("\nPages Missing Meta Descriptions:")
-    for idx, row in no_meta.head(15).iterrows():
-        title = row['Title 1'][:50] if pd.notna(row['Title 1']) else 'N/A'
-        print(f"  • {row['Address']} - {title}")
-
-# Meta descriptions too short
-short_meta_desc = html_pages[(html_pages['Meta Description 1 Length'].fillna(0) < 120) & 
-                             (html_pages['Meta Description 1 Length'].fillna(0) > 0)].copy()
-short_meta_desc = short_meta_desc[short_meta_desc['Status Code'] == 200]
-
-print(f"\n[STATS] Meta Descriptions < 120 characters: {len(short_meta_desc)}")
-if len(short_meta_desc) > 0:
-    print("\nTop 10 Shortest Meta Descriptions:")
-    short_sorted = short_meta_desc.nsmallest(10, 'Meta Description 1 Length')[['Address', 'Meta Description 1 Length', 'Meta Description 1']]
-    for idx, row in short_sorted.iterrows():
-        desc = row['Meta Description 1'][:70] if pd.notna(row['Meta Description 1']) else 'N/A'
-        print(f"  • {row['Address']}")
-        print(f"    Length: {int(row['Meta Description 1 Length'])}, Description: {desc}...")
-
-# Meta descriptions too long
-long_meta_desc = html_pages[html_pages['Meta Description 1 Length'].fillna(0) > 160].copy()
-long_meta_desc = long_meta_desc[long_meta_desc['Status Code'] == 200]
-
-print(f"\n[STATS] Meta Descriptions > 160 characters: {len(long_meta_desc)}")
-if len(long_meta_desc) > 0:
-    print("\nTop 10 Longest Meta Descriptions:")
-    long_sorted = long_meta_desc.nlargest(10, 'Meta Description 1 Length')[['Address', 'Meta Description 1 Length', 'Meta Description 1']]
-    for idx, row in long_sorted.iterrows():
-        desc = row['Meta Description 1'][:70] if pd.notna(row['Meta Description 1']) else 'N/A'
-        print(f"  • {row['Address']}")
-        print(f"    Length: {int(row['Meta Description 1 Length'])}, Description: {desc}...")
-
-# ============================================================================
-# EXECUTIVE SUMMARY
-# ============================================================================
-print("\n" + "=" * 80)
-print("EXECUTIVE SUMMARY")
-print("=" * 80)
-
-summary = {
-    'Total Pages': len(html_pages[html_pages['Status Code'] == 200]),
-    'Thin Content (< 300 words)': len(thin_content),
-    'Missing H1 Tags': len(missing_h1),
-    'Missing H2 Tags': len(missing_h2),
-    'Duplicate Titles': len(duplicate_titles),
-    'Duplicate Meta Descriptions': len(duplicate_meta),
-    'Orphaned Pages (0 inlinks)': len(orphaned),
-    'Pages with < 3 Inlinks': len(few_inlinks),
-    'Deep Pages (Depth > 3)': len(deep_pages),
-    'Temporary Redirects (302)': len(temp_redirects),
-    '404 Errors': len(not_found),
-    'Missing Meta Descriptions': len(no_meta),
-    'Short Meta Descriptions (< 120 chars)': len(short_meta_desc),
-    'Long Meta Descriptions (> 160 chars)': len(long_meta_desc)
-}
-
-print("\n[STATS] Issue Summary:")
-for issue, count in summary.items():
-    print(f"  • {issue}: {count}")
-
-# Priority Matrix
-print("\n" + "=" * 80)
-print("PRIORITY MATRIX")
-print("=" * 80)
-
-print("\n[HIGH] HIGH PRIORITY (High SEO Impact, Easy to Fix):")
-print("  1. Missing Meta Descriptions - Add unique meta descriptions to all pages")
-print("  2. Short Meta Descriptions - Expand to 120-160 characters")
-print("  3. Duplicate Titles - Create unique, descriptive titles for each page")
-print("  4. Missing H1 Tags - Add H1 tags to pages missing them")
-print("  5. Temporary Redirects (302) - Convert to permanent 301 redirects")
-
-print("\n[MEDIUM] MEDIUM PRIORITY (Moderate SEO Impact):")
-print("  1. Thin Content Pages - Expand content to 300+ words")
-print("  2. Orphaned Pages - Add internal links to these pages")
-print("  3. Pages with Few Inlinks - Improve internal linking structure")
-print("  4. Duplicate Meta Descriptions - Create unique descriptions")
-
-print("\n[LOW] LOW PRIORITY (Lower Impact or Requires More Work):")
-print("  1. Deep Pages (Crawl Depth > 3) - Consider flattening site structure")
-print("  2. Pages with Excessive Outlinks - Review and reduce if necessary")
-print("  3. Missing H2 Tags - Add H2 tags for better content structure")
-print("  4. Long Meta Descriptions - Trim to optimal length (120-160 chars)")
-
-print("\n" + "=" * 80)
-print("ANALYSIS COMPLETE")
-print("=" * 80)
-
+    # ========================================================================
+    # 3. INTERNAL LINK STRUCTURE ANALYSIS
+    # ========================================================================
+    _section("3. INTERNAL LINK STRUCTURE ANALYSIS")
+
+    excessive_outlinks = results['excessive_outlinks']
+    print(f"\n[STATS] Pages with > 100 Outbound Links: {len(excessive_outlinks)}")
+    if len(excessive_outlinks) > 0:
+        print("\nTop 10 Pages with Most Outbound Links:")
+        outlink_sorted = excessive_outlinks.nlargest(10, 'Outlinks')
+        for row in outlink_sorted.records():
+            print(f"  • {row['Address']}")
+            print(f"    Total Outlinks: {int(row['Outlinks'])}, Unique: {int(row['Unique Outlinks'])}")
+
+    orphaned = results['orphaned']
+    print(f"\n[STATS] Orphaned Pages (0 Inbound Links): {len(orphaned)}")
+    if len(orphaned) > 0:
+        print("\nOrphaned Pages:")
+        for row in orphaned.head(15).records():
+            title = row['Title 1'][:50] if row['Title 1'] is not None else 'N/A'
+            print(f"  • {row['Address']} - {title}")
+
+    few_inlinks = results['few_inlinks']
+    print(f"\n[STATS] Pages with < 3 Inbound Links: {len(few_inlinks)}")
+    if len(few_inlinks) > 0:
+        print("\nTop 15 Pages with Few Inbound Links:")
+        inlink_sorted = few_inlinks.nsmallest(15, 'Inlinks')
+        for row in inlink_sorted.records():
+            title = row['Title 1'][:50] if row['Title 1'] is not None else 'N/A'
+            print(f"  • {row['Address']} ({int(row['Inlinks'])} inlinks) - {title}")
+
+    deep_pages = results['deep_pages']
+    print(f"\n[STATS] Pages with Crawl Depth > 3: {len(deep_pages)}")
+    if len(deep_pages) > 0:
+        print("\nDeep Pages (Crawl Depth > 3):")
+        depth_sorted = deep_pages.nlargest(15, 'Crawl Depth')
+        for row in depth_sorted.records():
+            title = row['Title 1'][:50] if row['Title 1'] is not None else 'N/A'
+            print(f"  • {row['Address']} (Depth: {int(row['Crawl Depth'])}) - {title}")
+
+    # ========================================================================
+    # 4. REDIRECT CHAIN PROBLEMS
+    # ========================================================================
+    _section("4. REDIRECT CHAIN PROBLEMS")
+
+    redirects = results['redirects']
+    print(f"\n[STATS] Total Redirects Found: {len(redirects)}")
+    codes = redirects['Status Code']
+    print(f"  • 301 (Permanent): {codes.count(301)}")
+    print(f"  • 302 (Temporary): {codes.count(302)}")
+    print(f"  • 307/308 (Other): {codes.count(307) + codes.count(308)}")
+
+    temp_redirects = results['temp_redirects']
+    print(f"\n[STATS] Temporary Redirects (302) - Should be 301: {len(temp_redirects)}")
+    if len(temp_redirects) > 0:
+        print("\nTemporary Redirects:")
+        for row in temp_redirects.head(10).records():
+            redirect_url = row['Redirect URL'] if row['Redirect URL'] is not None else 'N/A'
+            print(f"  • {row['Address']} → {redirect_url}")
+
+    slow_redirects = results['slow_redirects']
+    print(f"\n[STATS] Slow Redirects (> 0.5s): {len(slow_redirects)}")
+    if len(slow_redirects) > 0:
+        print("\nSlow Redirects:")
+        slow_sorted = slow_redirects.nlargest(10, 'Response Time')
+        for row in slow_sorted.records():
+            redirect_url = row['Redirect URL'] if row['Redirect URL'] is not None else 'N/A'
+            print(f"  • {row['Address']} → {redirect_url} ({row['Response Time']:.3f}s)")
+
+    # ========================================================================
+    # 5. 404 ERROR DETECTION
+    # ========================================================================
+    _section("5. 404 ERROR DETECTION")
+
+    not_found = results['not_found']
+    print(f"\n[STATS] Pages Returning 404: {len(not_found)}")
+    if len(not_found) > 0:
+        print("\n404 Pages:")
+        for row in not_found.records():
+            print(f"  • {row['Address']}")
+
+    print(f"\n[STATS] Note: To find internal links pointing to 404s, analyze the outlinks data")
+    print(f"   Pages with outbound links: {len(results['potential_broken_links'])}")
+
+    # ========================================================================
+    # 6. MISSING META DESCRIPTION ISSUES
+    # ========================================================================
+    _section("6. MISSING META DESCRIPTION ISSUES")
+
+    no_meta = results['no_meta']
+    print(f"\n[STATS] Pages Without Meta Descriptions: {len(no_meta)}")
+    if len(no_meta) > 0:
+        print("\nPages Missing Meta Descriptions:")
+        for row in no_meta.head(15).records():
+            title = row['Title 1'][:50] if row['Title 1'] is not None else 'N/A'
+            print(f"  • {row['Address']} - {title}")
+
+    short_meta_desc = results['short_meta_desc']
+    print(f"\n[STATS] Meta Descriptions < 120 characters: {len(short_meta_desc)}")
+    if len(short_meta_desc) > 0:
+        print("\nTop 10 Shortest Meta Descriptions:")
+        short_sorted = short_meta_desc.nsmallest(10, 'Meta Description 1 Length')
+        for row in short_sorted.records():
+            desc = row['Meta Description 1'][:70] if row['Meta Description 1'] is not None else 'N/A'
+            print(f"  • {row['Address']}")
+            print(f"    Length: {int(row['Meta Description 1 Length'])}, Description: {desc}...")
+
+    long_meta_desc = results['long_meta_desc']
+    print(f"\n[STATS] Meta Descriptions > 160 characters: {len(long_meta_desc)}")
+    if len(long_meta_desc) > 0:
+        print("\nTop 10 Longest Meta Descriptions:")
+        long_sorted = long_meta_desc.nlargest(10, 'Meta Description 1 Length')
+        for row in long_sorted.records():
+            desc = row['Meta Description 1'][:70] if row['Meta Description 1'] is not None else 'N/A'
+            print(f"  • {row['Address']}")
+            print(f"    Length: {int(row['Meta Description 1 Length'])}, Description: {desc}...")
+
+    # ========================================================================
+    # EXECUTIVE SUMMARY
+    # ========================================================================
+    _section("EXECUTIVE SUMMARY")
+
+    print("\n[STATS] Issue Summary:")
+    for issue, count in results['summary'].items():
+        print(f"  • {issue}: {count}")
+
+    # Priority Matrix
+    _section("PRIORITY MATRIX")
+
+    print("\n[HIGH] HIGH PRIORITY (High SEO Impact, Easy to Fix):")
+    print("  1. Missing Meta Descriptions - Add unique meta descriptions to all pages")
+    print("  2. Short Meta Descriptions - Expand to 120-160 characters")
+    print("  3. Duplicate Titles - Create unique, descriptive titles for each page")
+    print("  4. Missing H1 Tags - Add H1 tags to pages missing them")
+    print("  5. Temporary Redirects (302) - Convert to permanent 301 redirects")
+
+    print("\n[MEDIUM] MEDIUM PRIORITY (Moderate SEO Impact):")
+    print("  1. Thin Content Pages - Expand content to 300+ words")
+    print("  2. Orphaned Pages - Add internal links to these pages")
+    print("  3. Pages with Few Inlinks - Improve internal linking structure")
+    print("  4. Duplicate Meta Descriptions - Create unique descriptions")
+
+    print("\n[LOW] LOW PRIORITY (Lower Impact or Requires More Work):")
+    print("  1. Deep Pages (Crawl Depth > 3) - Consider flattening site structure")
+    print("  2. Pages with Excessive Outlinks - Review and reduce if necessary")
+    print("  3. Missing H2 Tags - Add H2 tags for better content structure")
+    print("  4. Long Meta Descriptions - Trim to optimal length (120-160 chars)")
+
+    print("\n" + "=" * 80)
+    print("ANALYSIS COMPLETE")
+    print("=" * 80)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print a full SEO audit of a Screaming Frog crawl export.")
+    parser.add_argument('csv_file', nargs='?', default='internal_all.csv',
+                        help="crawl export to audit (default: %(default)s)")
+    parser.add_argument('--cache-dir', default=crawl_cache.DEFAULT_CACHE_DIR,
+                        help="columnar cache of parsed exports (default: %(default)s)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="parse the CSV directly instead of using the cache")
+    parser.add_argument('--all-groups', action='store_true',
+                        help="list every duplicate group with all of its URLs, not just the top few")
+    parser.add_argument('--rules', help="JSON list of rule overrides/additions (matched on 'name')")
+    parser.add_argument('--issues-csv', help="also write every HTML URL's issue bitmask and rule names here")
+    parser.add_argument('--store', metavar='DIR',
+                        help="also append the crawl and the issue counts to the crawl_store.py store in DIR")
+    args = parser.parse_args(argv)
+
+    cache_dir = None if args.no_cache else args.cache_dir
+    rules = load_rules(args.rules) if args.rules else RULES
+    results = run_audit(args.csv_file, cache_dir, rules)
+    print_report(results, all_groups=args.all_groups)
+    if args.issues_csv:
+        write_issues_csv(results, args.issues_csv)
+    if args.store:
+        # Imported here: crawl_store needs NumPy, which a plain audit does not
+        import crawl_store
+        crawl = crawl_store.CrawlStore(args.store).append_csv(
+            args.csv_file, tool='seo_audit_analysis', summary=results['summary'])
+        print(f"Stored as crawl {crawl.id} of {crawl.site} in {args.store}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
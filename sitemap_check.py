@@ -0,0 +1,356 @@
+"""
+Cross-check the crawl against the sitemap and robots.txt public/ ships.
+
+Every URL from every source goes into one hashed index: a dict from a
+64-bit digest of the normalised URL to a bitmask of where it was seen
+(in the sitemap, crawled, crawled as an indexable page, canonicalised to
+another URL, the canonical target of another page, ...).  Each source is
+read once and each finding is a single scan of the index for a flag
+combination, so the whole cross-check is O(sitemap + crawl).
+
+Sitemaps are parsed as a stream, so a 50,000-URL sitemap (or a sitemap
+index of many) never sits in memory as a tree.  A <sitemapindex> is
+followed to its child sitemaps, looked up under the directory of the index
+by URL path (https://host/sitemap-1.xml -> public/sitemap-1.xml); .gz
+sitemaps are decompressed on the fly.
+
+robots.txt rules are applied the way Google does: the most specific group
+for the user agent, the longest matching Allow/Disallow (with * and $
+wildcards), Allow winning ties.
+
+Usage:
+    python sitemap_check.py internal_all.csv
+    python sitemap_check.py internal_all.csv --sitemap public/sitemap.xml --robots public/robots.txt
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import sys
+import xml.etree.ElementTree as ET
+from collections import Counter
+from urllib.parse import unquote, urlsplit, urlunsplit
+
+DEFAULT_SITEMAP = os.path.join('public', 'sitemap.xml')
+DEFAULT_ROBOTS = os.path.join('public', 'robots.txt')
+
+# Where a URL was seen
+SITEMAP = 1
+CRAWLED = 2
+PAGE = 4  # crawled HTML page answering 200
+INDEXABLE = 8
+CANONICALISED = 16  # its canonical points at another URL
+CANONICAL_TARGET = 32  # another page's canonical points here
+REDIRECT = 64
+ERROR = 128  # 4xx/5xx or no response
+
+_REDIRECT_CODES = ('301', '302', '303', '307', '308')
+
+
+def normalise(url):
+    """The URL without its fragment, with the scheme and host lower-cased and default ports dropped."""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if (parts.scheme.lower(), host.rpartition(':')[2]) in (('http', '80'), ('https', '443')):
+        host = host.rpartition(':')[0]
+    return urlunsplit((parts.scheme.lower(), host, parts.path or '/', parts.query, ''))
+
+
+def site_host(url):
+    """The host of ``url``, lower-cased, without a port or a leading www."""
+    host = urlsplit(url.strip()).hostname or ''
+    return host[4:] if host.startswith('www.') else host
+
+
+def _digest(url):
+    return int.from_bytes(hashlib.blake2b(url.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class URLIndex:
+    """Normalised URL digest -> bitmask of the sources that mention it."""
+
+    def __init__(self):
+        self.flags = {}
+        self.urls = {}
+        self.hosts = Counter()  # crawled URLs per site_host
+
+    def add(self, url, flags):
+        url = normalise(url)
+        key = _digest(url)
+        previous = self.flags.get(key)
+        if previous is None:
+            self.flags[key] = flags
+            self.urls[key] = url
+        else:
+            self.flags[key] = previous | flags
+
+    def find(self, required, excluded=0):
+        """URLs carrying every flag in ``required`` and none in ``excluded``, in the order first seen."""
+        return [self.urls[key] for key, flags in self.flags.items()
+                if flags & required == required and not flags & excluded]
+
+    def count(self, required):
+        return sum(1 for flags in self.flags.values() if flags & required == required)
+
+    def add_crawl_row(self, row):
+        """Index one crawl row (Address, Status Code, Content Type, Indexability, Canonical Link Element 1)."""
+        url = row.get('Address', '')
+        if not url:
+            return
+        status = str(row.get('Status Code', ''))
+        flags = CRAWLED
+        if status in _REDIRECT_CODES:
+            flags |= REDIRECT
+        elif status == '200':
+            if 'text/html' in row.get('Content Type', ''):
+                flags |= PAGE
+                if row.get('Indexability', '') == 'Indexable':
+                    flags |= INDEXABLE
+        else:
+            flags |= ERROR
+        canonical = row.get('Canonical Link Element 1', '').strip()
+        if canonical and flags & PAGE and normalise(canonical) != normalise(url):
+            flags |= CANONICALISED
+            self.add(canonical, CANONICAL_TARGET)
+        self.add(url, flags)
+        self.hosts[site_host(url)] += 1
+
+    def main_host(self):
+        """The host most crawled URLs are on, or None before any crawl row."""
+        return self.hosts.most_common(1)[0][0] if self.hosts else None
+
+
+def _open(path):
+    return gzip.open(path, 'rb') if path.endswith('.gz') else open(path, 'rb')
+
+
+def iter_sitemap(path, missing=None, _seen=None):
+    """Yield every <loc> of the sitemap at ``path``, following sitemap indexes.
+
+    Child sitemaps that cannot be found locally are appended to ``missing``.
+    """
+    seen = set() if _seen is None else _seen
+    seen.add(os.path.abspath(path))
+    root_dir = os.path.dirname(path)
+    children = []
+    with _open(path) as f:
+        context = ET.iterparse(f, events=('start', 'end'))
+        root = None
+        for event, element in context:
+            if root is None:
+                root = element
+                index = element.tag.rsplit('}', 1)[-1] == 'sitemapindex'
+                continue
+            if event != 'end':
+                continue
+            name = element.tag.rsplit('}', 1)[-1]
+            if name == 'loc' and element.text:
+                if index:
+                    children.append(element.text.strip())
+                else:
+                    yield element.text.strip()
+            elif name in ('url', 'sitemap'):
+                # Drop finished entries so memory stays flat however long the file is
+                root.clear()
+    for child in children:
+        local = os.path.join(root_dir, unquote(urlsplit(child).path).lstrip('/'))
+        if os.path.isfile(local) and os.path.abspath(local) not in seen:
+            yield from iter_sitemap(local, missing, seen)
+        elif missing is not None and os.path.abspath(local) not in seen:
+            missing.append(child)
+
+
+def sitemap_host(path):
+    """site_host of the first URL in the sitemap at ``path``, or None when it lists none."""
+    first = next(iter_sitemap(path), None)
+    return None if first is None else site_host(first)
+
+
+class Robots:
+    """The rules of one robots.txt for one user agent."""
+
+    def __init__(self, text, agent='*'):
+        groups = []
+        agents, rules = [], []
+        in_rules = False
+        for line in text.splitlines():
+            field, _, value = line.split('#', 1)[0].partition(':')
+            field, value = field.strip().lower(), value.strip()
+            if field == 'user-agent':
+                if in_rules:
+                    groups.append((agents, rules))
+                    agents, rules, in_rules = [], [], False
+                agents.append(value.lower())
+            elif field in ('allow', 'disallow'):
+                in_rules = True
+                if value:
+                    rules.append((field == 'allow', value))
+        if agents:
+            groups.append((agents, rules))
+
+        agent = agent.lower()
+        best = None
+        for names, group_rules in groups:
+            for name in names:
+                if name == '*' or name in agent:
+                    specificity = 0 if name == '*' else len(name)
+                    if best is None or specificity > best[0]:
+                        best = (specificity, [])
+                    if specificity == best[0]:
+                        best[1].extend(group_rules)
+        self.rules = [(allow, len(pattern), self._compile(pattern), pattern)
+                      for allow, pattern in (best[1] if best else [])]
+
+    @staticmethod
+    def _compile(pattern):
+        anchored = pattern.endswith('$')
+        body = re.escape(pattern.rstrip('$')).replace(r'\*', '.*')
+        return re.compile(body + ('$' if anchored else ''))
+
+    @classmethod
+    def load(cls, path, agent='*'):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(f.read(), agent)
+
+    def rule(self, url):
+        """The (allow, pattern) deciding ``url``, or None when no rule matches."""
+        parts = urlsplit(url)
+        path = (parts.path or '/') + (f"?{parts.query}" if parts.query else '')
+        best = None
+        for allow, length, pattern, source in self.rules:
+            if pattern.match(path) and (best is None or length > best[1] or (length == best[1] and allow)):
+                best = (allow, length, source)
+        return None if best is None else (best[0], best[2])
+
+    def allowed(self, url):
+        decided = self.rule(url)
+        return decided is None or decided[0]
+
+
+def cross_check(rows, sitemap=None, robots=None):
+    """The sitemap/crawl/robots diff for crawl ``rows``; returns a JSON-ready dict.
+
+    ``sitemap`` is a sitemap or sitemap index path, ``robots`` a Robots.
+    """
+    index = URLIndex()
+    for row in rows:
+        index.add_crawl_row(row)
+    return diff(index, sitemap, robots)
+
+
+def diff(index, sitemap=None, robots=None):
+    """Add ``sitemap`` to an index of crawl rows and diff the two.
+
+    Without a sitemap only the canonical findings have anything to report.
+    A sitemap (and robots.txt) for another host than most of the crawl --
+    public/ is this site's, but the crawl may be anyone's -- is left out
+    and the reason recorded under 'skipped'.
+    """
+    skipped = None
+    if sitemap is not None:
+        crawl_host, listed_host = index.main_host(), sitemap_host(sitemap)
+        if crawl_host is not None and listed_host is not None and crawl_host != listed_host:
+            skipped = f"{sitemap} lists {listed_host}, the crawl is of {crawl_host}"
+            sitemap = robots = None
+    missing = []
+    sitemap_entries = 0
+    if sitemap is not None:
+        for url in iter_sitemap(sitemap, missing):
+            sitemap_entries += 1
+            index.add(url, SITEMAP)
+
+    in_sitemap = index.find(SITEMAP)
+    result = {
+        'sitemap': sitemap,
+        'skipped': skipped,
+        'counts': {
+            'sitemap_entries': sitemap_entries,
+            'sitemap_urls': len(in_sitemap),
+            'crawled_urls': index.count(CRAWLED),
+            'indexable_pages': index.count(PAGE | INDEXABLE),
+        },
+        'missing_child_sitemaps': missing,
+        # In the sitemap, but the crawler never reached them (orphans or wrong URLs)
+        'sitemap_not_crawled': index.find(SITEMAP, CRAWLED),
+        # Crawled indexable pages search engines only find through links
+        'crawled_not_in_sitemap': index.find(PAGE | INDEXABLE, SITEMAP | CANONICALISED) if sitemap else [],
+        # The sitemap lists a URL whose canonical points elsewhere
+        'canonicalised_in_sitemap': index.find(SITEMAP | CANONICALISED),
+        'non_indexable_in_sitemap': index.find(SITEMAP | PAGE, INDEXABLE | CANONICALISED),
+        'redirects_in_sitemap': index.find(SITEMAP | REDIRECT),
+        'errors_in_sitemap': index.find(SITEMAP | ERROR),
+        'canonical_targets_not_in_sitemap': index.find(CANONICAL_TARGET, SITEMAP) if sitemap else [],
+        # Canonicals should name the final URL, not one that redirects
+        'redirecting_canonical_targets': index.find(CANONICAL_TARGET | REDIRECT),
+    }
+    result['counts']['sitemap_duplicates'] = sitemap_entries - len(in_sitemap)
+    if robots is not None:
+        result['disallowed_in_sitemap'] = [
+            {'url': url, 'rule': robots.rule(url)[1]} for url in in_sitemap if not robots.allowed(url)
+        ]
+        result['disallowed_crawled_pages'] = [
+            {'url': url, 'rule': robots.rule(url)[1]} for url in index.find(PAGE) if not robots.allowed(url)
+        ]
+    return result
+
+
+CROSS_CHECK_COLUMNS = ['Address', 'Status Code', 'Content Type', 'Indexability', 'Canonical Link Element 1']
+
+
+def crawl_rows(path):
+    import lazy_csv
+
+    with lazy_csv.LazyCSV(path) as crawl:
+        yield from crawl.records(CROSS_CHECK_COLUMNS)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Diff a crawl against the shipped sitemap and robots.txt.")
+    parser.add_argument('csv_file', nargs='?', default='internal_all.csv',
+                        help="crawl export (default: %(default)s)")
+    parser.add_argument('--sitemap', default=DEFAULT_SITEMAP,
+                        help="sitemap or sitemap index, optionally .gz (default: %(default)s)")
+    parser.add_argument('--robots', default=DEFAULT_ROBOTS, help="robots.txt (default: %(default)s)")
+    parser.add_argument('--user-agent', default='Googlebot',
+                        help="user agent whose robots.txt rules apply (default: %(default)s)")
+    parser.add_argument('-o', '--output', default='sitemap_check_report.json',
+                        help="where to write the JSON report (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    if not os.path.isfile(args.sitemap):
+        parser.error(f"{args.sitemap} not found")
+    robots = Robots.load(args.robots, args.user_agent) if os.path.isfile(args.robots) else None
+    result = cross_check(crawl_rows(args.csv_file), args.sitemap, robots)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+
+    counts = result['counts']
+    if result['skipped']:
+        print(f"Sitemap not compared: {result['skipped']}")
+    print(f"Sitemap URLs: {counts['sitemap_urls']} ({counts['sitemap_duplicates']} duplicate entries)")
+    print(f"Crawled URLs: {counts['crawled_urls']}, indexable pages: {counts['indexable_pages']}")
+    for key, label in (
+        ('sitemap_not_crawled', 'In sitemap, not crawled'),
+        ('crawled_not_in_sitemap', 'Crawled indexable pages missing from the sitemap'),
+        ('canonicalised_in_sitemap', 'Canonicalised away but in the sitemap'),
+        ('redirecting_canonical_targets', 'Canonical targets that redirect'),
+        ('non_indexable_in_sitemap', 'Non-indexable but in the sitemap'),
+        ('redirects_in_sitemap', 'Redirecting URLs in the sitemap'),
+        ('errors_in_sitemap', 'Error URLs in the sitemap'),
+        ('disallowed_in_sitemap', 'Blocked by robots.txt but in the sitemap'),
+        ('disallowed_crawled_pages', 'Crawled pages blocked by robots.txt'),
+        ('missing_child_sitemaps', 'Child sitemaps not found'),
+    ):
+        if key in result:
+            print(f"  - {label}: {len(result[key])}")
+            for item in result[key][:10]:
+                print(f"      {item['url'] if isinstance(item, dict) else item}")
+    print(f"\nReport saved to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
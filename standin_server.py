@@ -0,0 +1,316 @@
+"""
+Serve the built site in dist/ the way Netlify would, for checks that need real HTTP.
+
+Netlify serves dist/ with pretty URLs and applies the [[redirects]] in
+netlify.toml and the rules in dist/_redirects (copied there from public/).
+This asyncio server does the same for the parts the audits care about:
+
+  - rules marked force (or '!') apply before any file is served;
+  - /path/ serves dist/path/index.html, and /path 301s to /path/ when that
+    directory page exists;
+  - other rules apply only when no file matches (Netlify's shadowing);
+  - anything left serves dist/404.html with a 404.
+
+Rules may use :placeholders and a trailing * (:splat in the target).
+Rules with conditions (country, language, role, query) are skipped.
+
+Usage:
+    python standin_server.py dist/ --port 8000
+"""
+
+import argparse
+import asyncio
+import mimetypes
+import os
+import re
+import sys
+import tomllib
+from urllib.parse import unquote, urlparse
+
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+_REASONS = {200: 'OK', 301: 'Moved Permanently', 302: 'Found', 303: 'See Other',
+            307: 'Temporary Redirect', 308: 'Permanent Redirect', 400: 'Bad Request',
+            404: 'Not Found', 405: 'Method Not Allowed', 410: 'Gone'}
+
+
+def _source_path(source):
+    return urlparse(source).path if '://' in source else source
+
+
+def _key(path):
+    # Netlify ignores a trailing slash when matching
+    return path.rstrip('/') or '/'
+
+
+class Rule:
+    __slots__ = ('source', 'target', 'status', 'force', 'pattern')
+
+    def __init__(self, source, target, status=301, force=False):
+        self.source = source
+        self.target = target
+        self.status = status
+        self.force = force
+        self.pattern = _compile(source)
+
+    @property
+    def exact(self):
+        """True when the rule matches one path (no placeholders or splat)."""
+        return not self.pattern.groupindex
+
+    def apply(self, path):
+        """The rewritten target if ``path`` matches, else None."""
+        match = self.pattern.match(path)
+        if match is None:
+            return None
+        target = self.target
+        for name, value in match.groupdict().items():
+            target = target.replace(f":{name}", value or '')
+        return target
+
+    def __repr__(self):
+        return f"Rule({self.source!r}, {self.target!r}, {self.status}, force={self.force})"
+
+
+def _compile(source):
+    pattern = []
+    for part in re.split(r'(:\w+|\*$)', _key(_source_path(source))):
+        if part == '*':
+            pattern.append(r'(?P<splat>.*)')
+        elif part.startswith(':'):
+            pattern.append(rf'(?P<{part[1:]}>[^/]+)')
+        else:
+            pattern.append(re.escape(part))
+    return re.compile(''.join(pattern) + '/?$')
+
+
+class RuleSet:
+    """Rules in order, with exact paths looked up in a dict rather than matched one by one.
+
+    A site-wide redirect map can hold thousands of rules; only the few with
+    placeholders or a splat are tried against every path.
+    """
+
+    def __init__(self, rules):
+        self.exact = {}
+        self.patterns = []
+        for n, rule in enumerate(rules):
+            if rule.exact:
+                self.exact.setdefault(_key(_source_path(rule.source)), []).append((n, rule))
+            else:
+                self.patterns.append((n, rule))
+
+    def matches(self, path):
+        """(rule, target) for every rule matching ``path``, in rule order."""
+        hits = list(self.exact.get(_key(path), ()))
+        hits.extend((n, rule) for n, rule in self.patterns if rule.pattern.match(path))
+        hits.sort(key=lambda hit: hit[0])
+        for _, rule in hits:
+            yield rule, rule.apply(path)
+
+
+def parse_redirects_file(path):
+    """Rules from a _redirects file: 'from to [status][!]' per line."""
+    rules = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            fields = line.split('#', 1)[0].split()
+            if len(fields) < 2:
+                continue
+            source, target, extra = fields[0], fields[1], fields[2:]
+            if any('=' in field for field in extra):
+                continue  # query/country/language conditions
+            status, force = 301, False
+            if extra:
+                force = extra[0].endswith('!')
+                status = int(extra[0].rstrip('!'))
+            rules.append(Rule(source, target, status, force))
+    return rules
+
+
+def parse_netlify_toml(path):
+    """Rules from the [[redirects]] tables of a netlify.toml."""
+    with open(path, 'rb') as f:
+        config = tomllib.load(f)
+    rules = []
+    for entry in config.get('redirects', []):
+        if entry.get('conditions') or entry.get('query'):
+            continue
+        rules.append(Rule(entry['from'], entry['to'], int(entry.get('status', 301)),
+                          bool(entry.get('force', False))))
+    return rules
+
+
+def load_rules(dist, netlify_toml=None):
+    """dist/_redirects first, then netlify.toml, in the order Netlify applies them."""
+    rules = []
+    redirects_file = os.path.join(dist, '_redirects')
+    if os.path.exists(redirects_file):
+        rules.extend(parse_redirects_file(redirects_file))
+    if netlify_toml and os.path.exists(netlify_toml):
+        rules.extend(parse_netlify_toml(netlify_toml))
+    return rules
+
+
+class Site:
+    """Maps a request path to (status, headers, file) over ``dist`` and its rules."""
+
+    def __init__(self, dist, rules=()):
+        self.dist = os.path.abspath(dist)
+        self.forced = RuleSet([rule for rule in rules if rule.force])
+        self.fallback = RuleSet([rule for rule in rules if not rule.force])
+
+    def _file(self, path):
+        local = os.path.normpath(os.path.join(self.dist, unquote(path).lstrip('/')))
+        if local != self.dist and not local.startswith(self.dist + os.sep):
+            return None, None
+        if os.path.isdir(local):
+            index = os.path.join(local, 'index.html')
+            if os.path.isfile(index):
+                return (index, None) if path.endswith('/') else (None, path + '/')
+            return None, None
+        return (local, None) if os.path.isfile(local) else (None, None)
+
+    def _rule(self, rules, path, query):
+        for rule, target in rules.matches(path):
+            if rule.status in REDIRECT_STATUSES:
+                return rule.status, {'Location': target + (f"?{query}" if query and '?' not in target else '')}, None
+            local, _ = self._file(urlparse(target).path)
+            if local is not None:
+                return rule.status, {}, local
+        return None
+
+    def respond(self, target):
+        parsed = urlparse(target)
+        path = parsed.path or '/'
+        response = self._rule(self.forced, path, parsed.query)
+        if response is not None:
+            return response
+        local, redirect = self._file(path)
+        if redirect is not None:
+            return 301, {'Location': redirect + (f"?{parsed.query}" if parsed.query else '')}, None
+        if local is not None:
+            return 200, {}, local
+        response = self._rule(self.fallback, path, parsed.query)
+        if response is not None:
+            return response
+        not_found = os.path.join(self.dist, '404.html')
+        return 404, {}, not_found if os.path.isfile(not_found) else None
+
+
+async def _handle(site, reader, writer):
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+            try:
+                method, target, version = request_line.decode('latin-1').split()
+            except ValueError:
+                writer.write(b'HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\nConnection: close\r\n\r\n')
+                break
+            length = int(headers.get('content-length', 0) or 0)
+            if length:
+                await reader.readexactly(length)
+
+            if method not in ('GET', 'HEAD'):
+                status, extra, local = 405, {'Allow': 'GET, HEAD'}, None
+            else:
+                status, extra, local = site.respond(target)
+            body = b''
+            size = 0
+            if local is not None:
+                if method == 'HEAD':
+                    size = os.path.getsize(local)
+                else:
+                    with open(local, 'rb') as f:
+                        body = f.read()
+                    size = len(body)
+                extra.setdefault('Content-Type', mimetypes.guess_type(local)[0] or 'application/octet-stream')
+            close = headers.get('connection', '').lower() == 'close' or version == 'HTTP/1.0'
+            lines = [f"HTTP/1.1 {status} {_REASONS.get(status, 'Unknown')}", f"Content-Length: {size}"]
+            lines.extend(f"{name}: {value}" for name, value in extra.items())
+            if close:
+                lines.append('Connection: close')
+            writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+            writer.write(body)
+            await writer.drain()
+            if close:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+class Server:
+    """A running stand-in server; ``base_url`` is where it listens."""
+
+    def __init__(self, site):
+        self.site = site
+        self.server = None
+        self.base_url = None
+        self._connections = {}
+
+    async def start(self, host='127.0.0.1', port=0):
+        self.server = await asyncio.start_server(self._connection, host, port)
+        port = self.server.sockets[0].getsockname()[1]
+        self.base_url = f"http://{host}:{port}/"
+        return self
+
+    async def _connection(self, reader, writer):
+        self._connections[asyncio.current_task()] = writer
+        try:
+            await _handle(self.site, reader, writer)
+        finally:
+            del self._connections[asyncio.current_task()]
+
+    async def close(self):
+        """Stop listening and let open keep-alive connections finish."""
+        self.server.close()
+        for writer in self._connections.values():
+            writer.close()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        await self.server.wait_closed()
+
+
+async def start(dist, host='127.0.0.1', port=0, netlify_toml='netlify.toml'):
+    """Start serving ``dist``; returns the running Server."""
+    return await Server(Site(dist, load_rules(dist, netlify_toml))).start(host, port)
+
+
+async def _serve_forever(args):
+    server = await start(args.dist, args.host, args.port, args.netlify_toml)
+    print(f"Serving {args.dist} at {server.base_url} (Ctrl+C to stop)")
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve dist/ with Netlify's redirect and pretty-URL rules.")
+    parser.add_argument('dist', nargs='?', default='dist', help="Astro build output (default: %(default)s)")
+    parser.add_argument('--host', default='127.0.0.1', help="address to bind (default: %(default)s)")
+    parser.add_argument('--port', type=int, default=8000, help="port to bind (default: %(default)s)")
+    parser.add_argument('--netlify-toml', default='netlify.toml',
+                        help="netlify.toml whose [[redirects]] apply (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.dist):
+        parser.error(f"{args.dist} is not a directory; run the Astro build first")
+    try:
+        asyncio.run(_serve_forever(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
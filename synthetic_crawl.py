@@ -0,0 +1,301 @@
+"""
+Generate Screaming Frog "Internal: All" exports of any size for benchmarking.
+
+The only real exports in the repo have 90 and 31 rows, far too few to see
+how the audit scripts scale.  This writes CSVs with the same 72-column
+schema (UTF-8 with BOM, every cell quoted) and a deterministic, seeded mix
+of the things the audits look for:
+
+  * about 60% HTML pages, 20% images, 7% CSS/JS, 10% redirects, 3% 404s
+  * location pages stamped from one template (near duplicates), plus titles,
+    meta descriptions and content hashes shared across groups of pages
+  * lognormal word counts (roughly a third of pages under 300 words),
+    missing/short/long meta descriptions, orphans and deep pages
+  * redirect chains of 1-6 hops, some 302s, a few loops and slow hops
+
+Usage:
+    python synthetic_crawl.py --rows 10000 100000 1000000 -o synthetic_crawls/
+"""
+
+import argparse
+import csv
+import os
+import random
+import sys
+
+HEADER = [
+    'Address', 'Content Type', 'Status Code', 'Status', 'Indexability', 'Indexability Status',
+    'Title 1', 'Title 1 Length', 'Title 1 Pixel Width', 'Meta Description 1',
+    'Meta Description 1 Length', 'Meta Description 1 Pixel Width', 'Meta Keywords 1',
+    'Meta Keywords 1 Length', 'H1-1', 'H1-1 Length', 'H2-1', 'H2-1 Length', 'H2-2', 'H2-2 Length',
+    'Meta Robots 1', 'X-Robots-Tag 1', 'Meta Refresh 1', 'Canonical Link Element 1',
+    'rel="next" 1', 'rel="prev" 1', 'HTTP rel="next" 1', 'HTTP rel="prev" 1',
+    'amphtml Link Element', 'Size (bytes)', 'Transferred (bytes)', 'Total Transferred (bytes)',
+    'CO2 (mg)', 'Carbon Rating', 'Word Count', 'Sentence Count', 'Average Words Per Sentence',
+    'Flesch Reading Ease Score', 'Readability', 'Text Ratio', 'Crawl Depth', 'Folder Depth',
+    'Link Score', 'Inlinks', 'Unique Inlinks', 'Unique JS Inlinks', '% of Total', 'Outlinks',
+    'Unique Outlinks', 'Unique JS Outlinks', 'External Outlinks', 'Unique External Outlinks',
+    'Unique External JS Outlinks', 'Closest Near Duplicate Match', 'No. Near Duplicates',
+    'Spelling Errors', 'Grammar Errors', 'Hash', 'Response Time', 'Last Modified',
+    'Redirect URL', 'Redirect Type', 'Cookies', 'Language', 'HTTP Version',
+    'Mobile Alternate Link', 'Closest Semantically Similar Address',
+    'Semantic Similarity Score', 'No. Semantically Similar', 'Semantic Relevance Score',
+    'URL Encoded Address', 'Crawl Timestamp',
+]
+_COLUMN = {name: n for n, name in enumerate(HEADER)}
+
+DEFAULT_HOST = 'https://dirtworkslandscaping.co.uk'
+
+TOWNS = [
+    'Ardrossan', 'Ayr', 'Bearsden', 'Beith', 'Bishopbriggs', 'Cumnock', 'Dalry', 'Girvan',
+    'Irvine', 'Kilbirnie', 'Kilmarnock', 'Kilwinning', 'Largs', 'Milngavie', 'Newton Mearns',
+    'Paisley', 'Prestwick', 'Saltcoats', 'Stevenston', 'Troon', 'West Kilbride', 'Glasgow',
+]
+SERVICES = [
+    'Garden Maintenance', 'Landscaping', 'Groundworks', 'Patios', 'Fencing', 'Decking',
+    'Pressure Washing', 'Driveways', 'Building Services', 'Drainage',
+]
+WORDS = (
+    'garden patio fencing decking landscaping driveway lawn hedge planting drainage '
+    'groundworks paving slabs turf gravel border design quote free local professional '
+    'team service project outdoor space maintenance seasonal repair install clean'
+).split()
+SHARED_TITLES = [f"{service} | Dirtworks Landscaping" for service in SERVICES] + [
+    'Home', 'Contact Us', 'Gallery', 'Blog', 'Dirtworks Landscaping']
+SHARED_METAS = [
+    f"Professional {service.lower()} across Ayrshire and Glasgow. Free quotes from Dirtworks."
+    for service in SERVICES]
+_LOCATION_META = ("Professional landscaping & building services in {town}, Ayrshire. Garden maintenance, "
+                  "patios, fencing, decking & pressure washing. Free quotes available.")
+
+# Share of rows by kind
+MIX = (('html', 0.60), ('image', 0.20), ('css_js', 0.07), ('redirect', 0.10), ('404', 0.03))
+
+
+def _sentence(rng, low, high):
+    words = rng.choices(WORDS, k=rng.randint(low, high))
+    return ' '.join(words).capitalize()
+
+
+class _Generator:
+    def __init__(self, rows, seed, host):
+        self.rows = rows
+        self.rng = random.Random(seed)
+        self.host = host
+        self.pages = []       # live HTML URLs, targets for redirects
+        self.hashes = []      # a sample of page hashes, for exact duplicates
+        self.timestamp = '2025-11-11 12:45:31'
+
+    def _row(self, url, content_type, status_code, status):
+        row = [''] * len(HEADER)
+        row[_COLUMN['Address']] = url
+        row[_COLUMN['URL Encoded Address']] = url
+        row[_COLUMN['Content Type']] = content_type
+        row[_COLUMN['Status Code']] = str(status_code)
+        row[_COLUMN['Status']] = status
+        row[_COLUMN['Indexability']] = 'Indexable' if status_code == 200 else 'Non-Indexable'
+        row[_COLUMN['HTTP Version']] = '1.1'
+        row[_COLUMN['Crawl Timestamp']] = self.timestamp
+        row[_COLUMN['Folder Depth']] = str(url.count('/') - 3)
+        row[_COLUMN['Response Time']] = f"{self.rng.uniform(0.05, 0.4):.3f}"
+        for name in ('Title 1 Length', 'Title 1 Pixel Width', 'Meta Description 1 Length',
+                     'Meta Description 1 Pixel Width', 'Meta Keywords 1 Length', 'H1-1 Length',
+                     'H2-1 Length', 'H2-2 Length', 'Word Count', 'Inlinks', 'Unique Inlinks',
+                     'Unique JS Inlinks', 'Outlinks', 'Unique Outlinks', 'Unique JS Outlinks',
+                     'External Outlinks', 'Unique External Outlinks', 'Unique External JS Outlinks'):
+            row[_COLUMN[name]] = '0'
+        row[_COLUMN['Text Ratio']] = '0.000'
+        row[_COLUMN['% of Total']] = '0.000'
+        row[_COLUMN['Crawl Depth']] = str(min(int(self.rng.expovariate(0.6)) + 1, 12))
+        return row
+
+    def _set(self, row, name, value):
+        row[_COLUMN[name]] = value
+        if name in ('Title 1', 'Meta Description 1', 'Meta Keywords 1', 'H1-1', 'H2-1', 'H2-2'):
+            row[_COLUMN[f'{name} Length']] = str(len(value))
+
+    def html(self, n):
+        rng = self.rng
+        kind = rng.random()
+        if kind < 0.3:
+            town = rng.choice(TOWNS)
+            url = f"{self.host}/locations/{town.lower().replace(' ', '-')}-{n}/"
+            title = f"Landscaping in {town} | Dirtworks Landscaping"
+            h1, h2 = f"Landscaping Services in {town}", ('Our Services', f"Why Choose Us in {town}")
+            meta = _LOCATION_META.format(town=town)
+        else:
+            section = rng.choice(('services', 'blog', 'gallery', 'projects'))
+            slug = '-'.join(rng.choices(WORDS, k=3))
+            url = f"{self.host}/{section}/{slug}-{n}/"
+            title = _sentence(rng, 3, 9) + ' | Dirtworks'
+            h1, h2 = _sentence(rng, 3, 7), (_sentence(rng, 2, 5), _sentence(rng, 2, 5))
+            meta = _sentence(rng, 18, 21) + '.'
+        if n == 0:
+            url = self.host + '/'
+        if rng.random() < 0.08:
+            title = rng.choice(SHARED_TITLES)
+
+        roll = rng.random()
+        if roll < 0.12:
+            meta = ''
+        elif roll < 0.30:
+            meta = meta[:rng.randint(40, 110)]
+        elif roll < 0.38:
+            meta = (meta + ' ' + _sentence(rng, 10, 14))[:rng.randint(170, 250)]
+        elif roll < 0.48:
+            meta = rng.choice(SHARED_METAS)
+
+        row = self._row(url, 'text/html; charset=UTF-8', 200, 'OK')
+        if n == 0:
+            row[_COLUMN['Crawl Depth']] = '0'
+        self._set(row, 'Title 1', title)
+        row[_COLUMN['Title 1 Pixel Width']] = str(len(title) * 9)
+        self._set(row, 'Meta Description 1', meta)
+        row[_COLUMN['Meta Description 1 Pixel Width']] = str(len(meta) * 6)
+        if rng.random() < 0.1:
+            self._set(row, 'Meta Keywords 1', ', '.join(
+                f"{service.lower()} {town.lower()}" for service in SERVICES[:5] for town in TOWNS[:6]))
+        if rng.random() > 0.05:
+            self._set(row, 'H1-1', h1)
+        if rng.random() > 0.10:
+            self._set(row, 'H2-1', h2[0])
+            self._set(row, 'H2-2', h2[1])
+        row[_COLUMN['Meta Robots 1']] = 'index, follow'
+        row[_COLUMN['Canonical Link Element 1']] = (
+            rng.choice(self.pages) if self.pages and rng.random() < 0.03 else url)
+
+        words = int(rng.lognormvariate(6.0, 0.7))
+        sentences = max(1, words // rng.randint(8, 20))
+        size = int(words * rng.uniform(40, 160)) + 20000
+        transferred = size // rng.randint(4, 7)
+        text_ratio = min(words * 6 / size * 100, 60)
+        if rng.random() < 0.04 and self.hashes:
+            page_hash = rng.choice(self.hashes)
+        else:
+            page_hash = f"{rng.getrandbits(128):032x}"
+            if len(self.hashes) < 10000:
+                self.hashes.append(page_hash)
+        inlinks = 0 if rng.random() < 0.05 else int(rng.paretovariate(1.2))
+        outlinks = rng.randint(120, 400) if rng.random() < 0.02 else rng.randint(5, 60)
+        values = {
+            'Size (bytes)': size, 'Transferred (bytes)': transferred,
+            'Total Transferred (bytes)': transferred * rng.randint(3, 12),
+            'CO2 (mg)': f"{transferred * 0.0004:.3f}", 'Word Count': words,
+            'Sentence Count': sentences, 'Average Words Per Sentence': f"{words / sentences:.3f}",
+            'Flesch Reading Ease Score': f"{rng.uniform(20, 90):.3f}", 'Readability': 'Normal',
+            'Text Ratio': f"{text_ratio:.3f}", 'Inlinks': inlinks,
+            'Unique Inlinks': min(inlinks, rng.randint(0, inlinks + 1)),
+            'Outlinks': outlinks, 'Unique Outlinks': rng.randint(outlinks // 2, outlinks),
+            'External Outlinks': rng.randint(0, 10), 'Hash': page_hash, 'Language': 'en',
+        }
+        for name, value in values.items():
+            row[_COLUMN[name]] = str(value)
+        self.pages.append(url)
+        return row
+
+    def asset(self, n, kind):
+        rng = self.rng
+        if kind == 'image':
+            extension = rng.choices(('webp', 'jpg', 'png', 'svg'), (5, 3, 2, 1))[0]
+            content_type = {'svg': 'image/svg+xml', 'jpg': 'image/jpeg'}.get(extension, f'image/{extension}')
+            url = f"{self.host}/images/{rng.choice(WORDS)}-{n}.{extension}"
+            size = int(rng.lognormvariate(10.8, 1.0))
+        else:
+            extension = rng.choice(('css', 'js'))
+            content_type = 'text/css; charset=UTF-8' if extension == 'css' else 'application/javascript'
+            url = f"{self.host}/_astro/{rng.choice(WORDS)}.{rng.getrandbits(32):08x}.{extension}"
+            size = int(rng.lognormvariate(9.5, 1.2))
+        row = self._row(url, content_type, 200, 'OK')
+        for name in ('Size (bytes)', 'Transferred (bytes)', 'Total Transferred (bytes)'):
+            row[_COLUMN[name]] = str(size)
+        return row
+
+    def not_found(self, n):
+        row = self._row(f"{self.host}/old-page-{n}", 'text/html; charset=UTF-8', 404, 'Not Found')
+        row[_COLUMN['Indexability Status']] = 'Client Error'
+        row[_COLUMN['Inlinks']] = str(self.rng.randint(1, 5))
+        return row
+
+    def redirect_chain(self, n, budget):
+        """Rows for one chain of up to ``budget`` hops, ending at a live page (or looping)."""
+        rng = self.rng
+        hops = min(budget, 1 + min(int(rng.expovariate(0.9)), 5))
+        urls = [f"{self.host}/legacy/{n}-{hop}" for hop in range(hops)]
+        loop = rng.random() < 0.01
+        final = urls[0] if loop else (rng.choice(self.pages) if self.pages else f"{self.host}/")
+        rows = []
+        for hop, url in enumerate(urls):
+            target = urls[hop + 1] if hop + 1 < hops else final
+            status_code, status = (302, 'Found') if rng.random() < 0.2 else (301, 'Moved Permanently')
+            row = self._row(url, 'text/html', status_code, status)
+            row[_COLUMN['Indexability Status']] = 'Redirected'
+            row[_COLUMN['Redirect URL']] = target
+            row[_COLUMN['Redirect Type']] = 'HTTP Redirect'
+            row[_COLUMN['Size (bytes)']] = '98'
+            row[_COLUMN['Inlinks']] = str(rng.randint(1, 40))
+            if rng.random() < 0.1:
+                row[_COLUMN['Response Time']] = f"{rng.uniform(1.0, 3.0):.3f}"
+            rows.append(row)
+        return rows
+
+    def __iter__(self):
+        rng = self.rng
+        kinds, weights = zip(*MIX)
+        # The home page first, as in a real crawl
+        yield self.html(0)
+        n = 1
+        while n < self.rows:
+            kind = rng.choices(kinds, weights)[0]
+            if kind == 'redirect':
+                for row in self.redirect_chain(n, self.rows - n):
+                    yield row
+                    n += 1
+                continue
+            if kind == 'html':
+                yield self.html(n)
+            elif kind == '404':
+                yield self.not_found(n)
+            else:
+                yield self.asset(n, kind)
+            n += 1
+
+
+def synthetic_rows(rows, seed=1, host=DEFAULT_HOST):
+    """Yield ``rows`` export rows (lists in HEADER order); the same seed gives the same crawl."""
+    return iter(_Generator(rows, seed, host))
+
+
+def write_crawl(path, rows, seed=1, host=DEFAULT_HOST):
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f, quoting=csv.QUOTE_ALL)
+        writer.writerow(HEADER)
+        writer.writerows(synthetic_rows(rows, seed, host))
+    return path
+
+
+def crawl_name(rows):
+    for size, suffix in ((1000000, 'm'), (1000, 'k')):
+        if rows >= size and rows % size == 0:
+            return f"crawl_{rows // size}{suffix}.csv"
+    return f"crawl_{rows}.csv"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write synthetic Screaming Frog exports for benchmarking.")
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000],
+                        help="row counts to generate, one file each (default: %(default)s)")
+    parser.add_argument('-o', '--output-dir', default='synthetic_crawls',
+                        help="where the CSVs go (default: %(default)s)")
+    parser.add_argument('--seed', type=int, default=1, help="random seed (default: %(default)s)")
+    parser.add_argument('--host', default=DEFAULT_HOST, help="site the URLs live on (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    for rows in args.rows:
+        path = write_crawl(os.path.join(args.output_dir, crawl_name(rows)), rows, args.seed, args.host)
+        print(f"Wrote {rows} rows to {path} ({os.path.getsize(path) / 1e6:.1f} MB)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
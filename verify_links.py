@@ -0,0 +1,337 @@
+"""
+Re-check every crawled URL and redirect over HTTP without re-crawling.
+
+analyze_seo.py's 404 and redirect checks trust the 'Status Code' and
+'Redirect URL' frozen into the crawl export.  After a deploy (or a change
+to netlify.toml) this re-requests every Address and Redirect URL of the
+export with HEAD requests, over a pool of keep-alive connections and with
+a bounded number in flight, and reports what changed: status codes,
+redirect targets, URLs that now fail, and the redirect chains and loops
+the live responses form.  Links are not followed and pages are not
+parsed, so it runs at thousands of URLs per second against a local server.
+
+URLs on the crawled site are sent to --base-url instead, so the same
+export can be checked against a preview deploy, or against dist/ served
+locally with Netlify's rules (--serve, see standin_server.py).
+
+Usage:
+    python verify_links.py internal_all.csv --serve dist/
+    python verify_links.py internal_all.csv --base-url https://deploy-preview-42--site.netlify.app/
+    python verify_links.py internal_all.csv -c 200 --fail-on-change
+"""
+
+import argparse
+import asyncio
+import json
+import ssl
+import sys
+import time
+from collections import Counter
+from urllib.parse import urljoin, urlparse
+
+import lazy_csv
+import redirect_resolver
+
+USER_AGENT = 'seo-audit-verify/1.0'
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+
+
+class HTTPError(Exception):
+    pass
+
+
+class ConnectionPool:
+    """HTTP/1.1 keep-alive connections, reused per (scheme, host, port)."""
+
+    def __init__(self, timeout=10.0):
+        self.timeout = timeout
+        self._idle = {}
+        self._ssl = ssl.create_default_context()
+
+    async def _connect(self, scheme, host, port):
+        return await asyncio.wait_for(
+            asyncio.open_connection(host, port, ssl=self._ssl if scheme == 'https' else None), self.timeout)
+
+    async def request(self, method, url):
+        """Send one request; returns (status, headers) with header names lower-cased."""
+        parsed = urlparse(url)
+        scheme = parsed.scheme
+        port = parsed.port or (443 if scheme == 'https' else 80)
+        key = (scheme, parsed.hostname, port)
+        target = (parsed.path or '/') + (f"?{parsed.query}" if parsed.query else '')
+        head = (f"{method} {target} HTTP/1.1\r\nHost: {parsed.netloc}\r\n"
+                f"User-Agent: {USER_AGENT}\r\nAccept: */*\r\n\r\n").encode('latin-1')
+
+        idle = self._idle.setdefault(key, [])
+        # A pooled connection may have been closed by the server meanwhile; retry once on a fresh one
+        for reused in (True, False):
+            if reused and not idle:
+                continue
+            reader, writer = idle.pop() if reused else await self._connect(*key)
+            try:
+                writer.write(head)
+                status, headers, keep = await asyncio.wait_for(self._response(method, reader), self.timeout)
+            except (ConnectionError, asyncio.IncompleteReadError, HTTPError):
+                writer.close()
+                if reused:
+                    continue
+                raise
+            except BaseException:
+                writer.close()
+                raise
+            if keep:
+                idle.append((reader, writer))
+            else:
+                writer.close()
+            return status, headers
+
+    async def _response(self, method, reader):
+        status_line = await reader.readline()
+        if not status_line:
+            raise HTTPError("connection closed before the response")
+        parts = status_line.decode('latin-1').split(None, 2)
+        if len(parts) < 2 or not parts[1].isdigit():
+            raise HTTPError(f"bad status line {status_line[:80]!r}")
+        status = int(parts[1])
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        keep = headers.get('connection', '').lower() != 'close' and parts[0] != 'HTTP/1.0'
+        if method == 'HEAD' or status in (204, 304) or 100 <= status < 200:
+            pass
+        elif 'chunked' in headers.get('transfer-encoding', '').lower():
+            while True:
+                size = int((await reader.readline()).split(b';')[0], 16)
+                await reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        elif 'content-length' in headers:
+            await reader.readexactly(int(headers['content-length']))
+        else:
+            await reader.read()
+            keep = False
+        return status, headers, keep
+
+    def close(self):
+        for connections in self._idle.values():
+            for _, writer in connections:
+                writer.close()
+        self._idle.clear()
+
+
+class Rebase:
+    """Sends URLs on ``site`` to ``base`` instead, and maps Location headers back."""
+
+    def __init__(self, site, base=None):
+        self.site = urlparse(site)
+        self.base = urlparse(base) if base else None
+
+    def outgoing(self, url):
+        parsed = urlparse(url)
+        if self.base is None or parsed.netloc != self.site.netloc:
+            return url
+        path = self.base.path.rstrip('/') + (parsed.path or '/')
+        return parsed._replace(scheme=self.base.scheme, netloc=self.base.netloc, path=path).geturl()
+
+    def incoming(self, url):
+        parsed = urlparse(url)
+        if self.base is None or parsed.netloc != self.base.netloc:
+            return url
+        path = parsed.path[len(self.base.path.rstrip('/')):] or '/'
+        return parsed._replace(scheme=self.site.scheme, netloc=self.site.netloc, path=path).geturl()
+
+
+async def check(pool, rebase, url, method='HEAD'):
+    """One URL's live status and (site-relative) redirect target."""
+    started = time.perf_counter()
+    request_url = rebase.outgoing(url)
+    try:
+        status, headers = await pool.request(method, request_url)
+        if status in (405, 501) and method == 'HEAD':
+            status, headers = await pool.request('GET', request_url)
+    except (OSError, asyncio.TimeoutError, HTTPError) as e:
+        return {'url': url, 'status': None, 'error': f"{type(e).__name__}: {e}".rstrip(': '),
+                'seconds': round(time.perf_counter() - started, 4)}
+    location = headers.get('location')
+    result = {'url': url, 'status': status, 'seconds': round(time.perf_counter() - started, 4)}
+    if location and status in REDIRECT_CODES:
+        result['location'] = rebase.incoming(urljoin(request_url, location))
+    return result
+
+
+async def verify(urls, site, base_url=None, concurrency=64, timeout=10.0, follow=True):
+    """Check ``urls`` with at most ``concurrency`` requests in flight; returns {url: result}.
+
+    With ``follow``, redirect targets on the site that were not in ``urls``
+    are checked too (in further rounds), so every chain can be resolved.
+    """
+    pool = ConnectionPool(timeout)
+    rebase = Rebase(site, base_url)
+    limit = asyncio.Semaphore(concurrency)
+    results = {}
+
+    async def bounded(url):
+        async with limit:
+            results[url] = await check(pool, rebase, url)
+
+    pending = list(dict.fromkeys(urls))
+    try:
+        while pending:
+            await asyncio.gather(*(bounded(url) for url in pending))
+            if not follow:
+                break
+            targets = (result.get('location') for result in results.values())
+            pending = list(dict.fromkeys(
+                target for target in targets
+                if target and target not in results and urlparse(target).netloc == rebase.site.netloc))
+    finally:
+        pool.close()
+    return results
+
+
+def crawl_targets(path):
+    """(rows, site origin) from a crawl export; rows hold Address, Status Code and Redirect URL."""
+    with lazy_csv.LazyCSV(path) as crawl:
+        rows = [dict(record.items()) for record in crawl.records(['Address', 'Status Code', 'Redirect URL'])]
+    origins = Counter(f"{urlparse(row['Address']).scheme}://{urlparse(row['Address']).netloc}/"
+                      for row in rows if row['Address'])
+    return rows, origins.most_common(1)[0][0] if origins else None
+
+
+def compare(rows, results, site):
+    """The verification report: what the live responses say against what the crawl recorded."""
+    host = urlparse(site).netloc
+    changed, broken, fixed, errors = [], [], [], []
+    for row in rows:
+        url = row['Address']
+        live = results.get(url)
+        if live is None:
+            continue
+        if live['status'] is None:
+            errors.append({'url': url, 'error': live['error']})
+            continue
+        crawl_status = int(row['Status Code'] or 0)
+        crawl_redirect = row['Redirect URL'] or None
+        entry = {'url': url, 'crawl_status': crawl_status, 'status': live['status'],
+                 'crawl_redirect': crawl_redirect, 'redirect': live.get('location')}
+        if live['status'] >= 400 and crawl_status < 400:
+            broken.append(entry)
+        elif live['status'] < 400 <= crawl_status:
+            fixed.append(entry)
+        elif live['status'] != crawl_status or entry['redirect'] != crawl_redirect:
+            changed.append(entry)
+
+    redirect_targets = {row['Redirect URL'] for row in rows if row['Redirect URL']}
+    broken_targets = sorted(url for url in redirect_targets
+                            if url in results and (results[url]['status'] or 0) >= 400)
+
+    redirect_map = {url: result['location'] for url, result in results.items() if result.get('location')}
+    resolved = redirect_resolver.resolve(redirect_map)
+    chains = [
+        {'url': url, 'hops': resolution.hops, 'chain': redirect_resolver.chain(url, resolved),
+         'final': resolution.final,
+         'final_status': results[resolution.final]['status'] if resolution.final in results else None}
+        for url, resolution in resolved.items()
+        if urlparse(url).netloc == host and not resolution.loop and resolution.hops > 1
+    ]
+    loops = [{'url': cycle[0], 'chain': cycle} for cycle in redirect_resolver.cycles(resolved)]
+
+    statuses = Counter(str(result['status']) for result in results.values())
+    return {
+        'summary': {
+            'urls_checked': len(results),
+            'statuses': dict(sorted(statuses.items())),
+            'changed': len(changed),
+            'now_broken': len(broken),
+            'fixed': len(fixed),
+            'broken_redirect_targets': len(broken_targets),
+            'redirect_chains': len(chains),
+            'redirect_loops': len(loops),
+            'errors': len(errors),
+        },
+        'now_broken': broken,
+        'changed': changed,
+        'fixed': fixed,
+        'broken_redirect_targets': broken_targets,
+        'redirect_chains': chains,
+        'redirect_loops': loops,
+        'errors': errors,
+    }
+
+
+async def run(csv_path, base_url=None, serve=None, site=None, concurrency=64, timeout=10.0,
+              netlify_toml='netlify.toml'):
+    """Verify a crawl export end to end; returns the report dict."""
+    rows, crawl_site = crawl_targets(csv_path)
+    site = site or crawl_site
+    server = None
+    if serve is not None:
+        import standin_server
+        server = await standin_server.start(serve, netlify_toml=netlify_toml)
+        base_url = server.base_url
+    try:
+        urls = [row['Address'] for row in rows] + [row['Redirect URL'] for row in rows if row['Redirect URL']]
+        started = time.perf_counter()
+        results = await verify(urls, site, base_url, concurrency, timeout)
+        elapsed = time.perf_counter() - started
+    finally:
+        if server is not None:
+            await server.close()
+    report = compare(rows, results, site)
+    report['summary'].update({
+        'site': site,
+        'base_url': base_url or site,
+        'seconds': round(elapsed, 3),
+        'urls_per_second': round(len(results) / elapsed, 1) if elapsed else None,
+    })
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-check a crawl's URLs and redirects over HTTP.")
+    parser.add_argument('csv_file', nargs='?', default='internal_all.csv',
+                        help="crawl export whose URLs to check (default: %(default)s)")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument('--base-url', help="send the crawled site's URLs here instead (e.g. a deploy preview)")
+    target.add_argument('--serve', metavar='DIST',
+                        help="serve this build directory locally with Netlify's rules and check against it")
+    parser.add_argument('--site', help="origin the crawl was taken from (default: the most common one in it)")
+    parser.add_argument('--netlify-toml', default='netlify.toml',
+                        help="redirect rules for --serve (default: %(default)s)")
+    parser.add_argument('-c', '--concurrency', type=int, default=64,
+                        help="requests in flight at once (default: %(default)s)")
+    parser.add_argument('--timeout', type=float, default=10.0,
+                        help="seconds per request (default: %(default)s)")
+    parser.add_argument('-o', '--output', default='verify_links_report.json',
+                        help="where to write the JSON report (default: %(default)s)")
+    parser.add_argument('--fail-on-change', action='store_true',
+                        help="exit 1 if any URL broke, changed, or a redirect target fails")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(args.csv_file, args.base_url, args.serve, args.site,
+                             args.concurrency, args.timeout, args.netlify_toml))
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    summary = report['summary']
+    print(f"Checked {summary['urls_checked']} URLs against {summary['base_url']} in {summary['seconds']}s "
+          f"({summary['urls_per_second']} URLs/s)")
+    print(f"Statuses: {summary['statuses']}")
+    for key, label in (('now_broken', 'Now broken'), ('changed', 'Changed since the crawl'),
+                       ('fixed', 'Fixed since the crawl'), ('broken_redirect_targets', 'Broken redirect targets'),
+                       ('redirect_chains', 'Redirect chains (>1 hop)'), ('redirect_loops', 'Redirect loops'),
+                       ('errors', 'Request errors')):
+        print(f"  - {label}: {summary[key]}")
+    print(f"Report saved to {args.output}")
+
+    failed = summary['now_broken'] or summary['changed'] or summary['broken_redirect_targets']
+    return 1 if args.fail_on_change and failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())